@@ -1,63 +1,135 @@
 # Configuración del proyecto
+#
+# Importar este módulo no toca el disco ni imprime nada: las rutas se
+# resuelven la primera vez que se piden (PEP 562) y cada script crea sus
+# directorios de salida justo antes de escribir en ellos.
+#
+# Variables de entorno (p.ej. para apuntar los workers a un disco local rápido):
+#   POBLACION_BASE_DIR    raíz del proyecto
+#   POBLACION_DATA_DIR    datos de entrada (raw/, prepared/)
+#   POBLACION_OUTPUT_DIR  resultados (abstract/, models/, visualizations/)
+import os
 import sys
 from pathlib import Path
 
-# 1. Base del proyecto (calculada dinámicamente)
-if getattr(sys, 'frozen', False):
-    # Si estamos en un ejecutable (PyInstaller)
-    BASE_DIR = Path(sys.executable).parent.resolve()
-else:
-    # Si estamos ejecutando desde código fuente
-    BASE_DIR = Path(__file__).resolve().parent.parent.parent
+ENV_PREFIX = "POBLACION_"
 
-# 2. Nombres de los datasets
+# 1. Nombres de los datasets
 DATASETS = ["eige_2015", "ine_2020", "ine_2025"]
 
-# 3. Directorios de datos y salida (relativos a BASE_DIR)
-DATA_DIR = BASE_DIR / "data"
-OUTPUT_DIR = BASE_DIR / "output"
-
-# 4. Subdirectorios organizados por tipo
-RAW_DIR = DATA_DIR / "raw"
-PREPARED_DIR = DATA_DIR / "prepared"
-
-ABSTRACT_DIR = OUTPUT_DIR / "abstract"
-VISUALIZATIONS_DIR = OUTPUT_DIR / "visualizations"
-INTERACTIVE_DIR = VISUALIZATIONS_DIR / "interactive"
-STATIC_DIR = VISUALIZATIONS_DIR / "static"
-SCREENSHOTS_DIR = STATIC_DIR / "screenshots"
-
-# 5. Rutas automáticas por dataset
-PATHS = {
-    ds: {
-        "raw": RAW_DIR / f"{ds}.csv",
-        "prepared": PREPARED_DIR / f"{ds}_prepared.csv"
-    }
-    for ds in DATASETS
+
+def _env_path(name):
+    """Ruta de la variable de entorno POBLACION_<name>, si está definida"""
+    value = os.environ.get(ENV_PREFIX + name)
+    return Path(value).expanduser().resolve() if value else None
+
+
+def _base_dir():
+    """Base del proyecto (calculada dinámicamente)"""
+    if getattr(sys, 'frozen', False):
+        # Si estamos en un ejecutable (PyInstaller)
+        return Path(sys.executable).parent.resolve()
+    # Si estamos ejecutando desde código fuente
+    return Path(__file__).resolve().parent.parent.parent
+
+
+# 2. Rutas perezosas: nombre → función que la calcula a partir de otras
+_LAZY = {
+    # Directorios de datos y salida (relativos a BASE_DIR)
+    "BASE_DIR": lambda: _env_path("BASE_DIR") or _base_dir(),
+    "DATA_DIR": lambda: _env_path("DATA_DIR") or setting("BASE_DIR") / "data",
+    "OUTPUT_DIR": lambda: _env_path("OUTPUT_DIR") or setting("BASE_DIR") / "output",
+
+    # Subdirectorios organizados por tipo
+    "RAW_DIR": lambda: setting("DATA_DIR") / "raw",
+    "PREPARED_DIR": lambda: setting("DATA_DIR") / "prepared",
+    # Cortes periódicos del padrón (padron_AAAA-MM.csv)
+    "PADRON_CUTS_DIR": lambda: setting("RAW_DIR") / "padron_cortes",
+    # Almacén de cortes con deltas por sección (ver padron_snapshots.py)
+    "SNAPSHOTS_DIR": lambda: setting("DATA_DIR") / "padron_snapshots",
+    # Asignación sección → distrito de cada año (secciones_AAAA.csv, ver crosswalk.py)
+    "CROSSWALK_DIR": lambda: setting("DATA_DIR") / "crosswalk",
+
+    "ABSTRACT_DIR": lambda: setting("OUTPUT_DIR") / "abstract",
+    "VISUALIZATIONS_DIR": lambda: setting("OUTPUT_DIR") / "visualizations",
+    "INTERACTIVE_DIR": lambda: setting("VISUALIZATIONS_DIR") / "interactive",
+    "STATIC_DIR": lambda: setting("VISUALIZATIONS_DIR") / "static",
+    "SCREENSHOTS_DIR": lambda: setting("STATIC_DIR") / "screenshots",
+    "MODELS_DIR": lambda: setting("OUTPUT_DIR") / "models",
+    # Agregados jerárquicos del padrón por corte (ver hierarchy.py)
+    "ROLLUPS_DIR": lambda: setting("OUTPUT_DIR") / "rollups",
+    # Resultados de las reglas de calidad de los limpiadores (ver constraints.py)
+    "QUALITY_DIR": lambda: setting("OUTPUT_DIR") / "calidad",
+
+    # Rutas automáticas por dataset
+    "PATHS": lambda: {
+        ds: {
+            "raw": setting("RAW_DIR") / f"{ds}.csv",
+            "prepared": setting("PREPARED_DIR") / f"{ds}_prepared.csv"
+        }
+        for ds in DATASETS
+    },
+    # Base embebida opcional con las tablas preparadas (ver store.py)
+    "STORE_PATH": lambda: setting("PREPARED_DIR") / "poblacion.sqlite",
+
+    # Directorios necesarios del proyecto
+    "DIRECTORIES": lambda: [
+        # Directorios de datos
+        setting("RAW_DIR"), setting("PREPARED_DIR"),
+
+        # Directorios de salida
+        setting("ABSTRACT_DIR"),
+        setting("MODELS_DIR"),
+
+        # Directorios de visualización
+        setting("VISUALIZATIONS_DIR"),
+        setting("INTERACTIVE_DIR"),
+        setting("STATIC_DIR"),
+        setting("SCREENSHOTS_DIR")
+    ],
+
+    # Información del sistema (para depuración)
+    "SYSTEM_INFO": lambda: {
+        "platform": sys.platform,
+        "python_version": sys.version,
+        "base_dir": str(setting("BASE_DIR")),
+        "directories": [str(d) for d in setting("DIRECTORIES")]
+    },
 }
 
-# 6. Crear directorios necesarios
-DIRECTORIES = [
-    # Directorios de datos
-    RAW_DIR, PREPARED_DIR,
-    
-    # Directorios de salida
-    ABSTRACT_DIR,
-    
-    # Directorios de visualización
-    VISUALIZATIONS_DIR,
-    INTERACTIVE_DIR,
-    STATIC_DIR,
-    SCREENSHOTS_DIR
-]
+
+def setting(name):
+    """Valor de una configuración perezosa; se calcula una sola vez por proceso"""
+    if name not in globals():
+        globals()[name] = _LAZY[name]()
+    return globals()[name]
+
+
+def __getattr__(name):
+    # Permite `from src.config.settings import STATIC_DIR` sin calcular nada al importar
+    if name in _LAZY:
+        return setting(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def reset():
+    """Olvida las rutas ya resueltas (para releer las variables de entorno)"""
+    for name in _LAZY:
+        globals().pop(name, None)
+
 
 def create_directories():
     """Crea todos los directorios necesarios si no existen"""
-    for directory in DIRECTORIES:
+    for directory in setting("DIRECTORIES"):
         directory.mkdir(parents=True, exist_ok=True)
         print(f"📂 Directorio creado/verificado: {directory}")
 
-# 7. Configuración de regiones (para uso en otros módulos)
+
+# 3. Configuración de regiones (para uso en otros módulos)
 REGION_CONFIG = {
     "2015": {
         "Jalisco": {"entidad": 14},
@@ -76,26 +148,16 @@ REGION_CONFIG = {
     }
 }
 
-# 8. Ejecutar la creación de directorios al importar
-create_directories()
-
-# 9. Información del sistema (para depuración)
-SYSTEM_INFO = {
-    "platform": sys.platform,
-    "python_version": sys.version,
-    "base_dir": str(BASE_DIR),
-    "directories": [str(d) for d in DIRECTORIES]
-}
-
 if __name__ == "__main__":
-    # Mostrar información de configuración al ejecutar directamente
+    # Mostrar información de configuración y crear los directorios al ejecutar directamente
+    create_directories()
     print("="*80)
     print("CONFIGURACIÓN DEL PROYECTO".center(80))
     print("="*80)
-    print(f"📁 Directorio base: {BASE_DIR}")
+    print(f"📁 Directorio base: {setting('BASE_DIR')}")
     print(f"🐍 Versión de Python: {sys.version.split()[0]}")
     print(f"🖥️ Plataforma: {sys.platform}")
     print("\nDirectorios configurados:")
-    for i, dir_path in enumerate(DIRECTORIES, 1):
+    for i, dir_path in enumerate(setting("DIRECTORIES"), 1):
         print(f"{i}. {dir_path}")
-    print("="*80)
\ No newline at end of file
+    print("="*80)
@@ -0,0 +1,73 @@
+# Estilo visual compartido y carga diferida de backends de gráficos
+#
+# Importar este módulo no carga matplotlib, seaborn ni plotly: cada backend
+# se importa y configura la primera vez que se pide un render.
+
+# Paletas profesionales
+GENDER_PALETTE = {"Hombres": "#3498db", "Mujeres": "#e74c3c"}
+DISTRICT_PALETTE = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd",
+                    "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
+REGION_PALETTE = {
+    "Jalisco": "#1f77b4",
+    "ZMG": "#ff7f0e",
+    "GDL": "#2ca02c"
+}
+
+# Configuración global de matplotlib/seaborn
+MPL_RC_PARAMS = {
+    'font.family': 'DejaVu Sans',
+    'axes.unicode_minus': False,
+    'axes.titlepad': 10,
+    'axes.titleweight': 'bold',
+    'axes.titlesize': 16,
+    'axes.labelweight': 'bold',
+}
+SNS_THEME = {"style": "whitegrid", "context": "talk", "font_scale": 0.9}
+
+# Perfiles de render estático
+RENDER_PROFILES = {
+    # Iteración rápida: baja resolución, sin efectos de trazo ni recorte ajustado
+    "borrador": {"dpi": 72, "path_effects": False, "tight_layout": False, "bbox_inches": None},
+    "publicacion": {"dpi": 300, "path_effects": True, "tight_layout": True, "bbox_inches": "tight"},
+}
+
+# Configuración de Plotly
+PLOTLY_TEMPLATE = "plotly_white"
+
+_BACKENDS = {}
+
+
+def style_fingerprint():
+    """Configuración de estilo serializada (forma parte de la llave de la caché de render)"""
+    return {
+        "gender": GENDER_PALETTE,
+        "district": DISTRICT_PALETTE,
+        "region": REGION_PALETTE,
+        "rc": MPL_RC_PARAMS,
+        "sns": SNS_THEME,
+        "plotly": PLOTLY_TEMPLATE,
+    }
+
+
+def static_backend():
+    """Devuelve (plt, sns, patheffects) importándolos y configurándolos una sola vez"""
+    if "static" not in _BACKENDS:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        from matplotlib import patheffects
+
+        plt.rcParams.update(MPL_RC_PARAMS)
+        sns.set_theme(**SNS_THEME)
+        _BACKENDS["static"] = (plt, sns, patheffects)
+    return _BACKENDS["static"]
+
+
+def interactive_backend():
+    """Devuelve (px, pio) importándolos y configurándolos una sola vez"""
+    if "interactive" not in _BACKENDS:
+        import plotly.express as px
+        import plotly.io as pio
+
+        pio.templates.default = PLOTLY_TEMPLATE
+        _BACKENDS["interactive"] = (px, pio)
+    return _BACKENDS["interactive"]
@@ -1,5 +1,6 @@
 # Recopilador de datos de población 2015, 2020 y 2025
 
+import argparse
 import pandas as pd
 from pathlib import Path
 from src.config.settings import (
@@ -13,6 +14,11 @@ from src.config.settings import (
     PATHS,
     REGION_CONFIG
 )
+from src.scripts.backend import BACKENDS, announce_path, get_backend, incompatible_flags, set_backend
+from src.scripts.crosswalk import harmonize
+from src.scripts.out_of_core import memory_budget, set_memory_budget
+from src.scripts.profiling import add_rows, profiled
+from src.scripts.store import enable_store, table_ready
 
 # Configuración de regiones unificada
 REGION_CONFIG_2015 = {
@@ -70,10 +76,14 @@ def calcular_tasa_crecimiento(pob_final, pob_inicial):
         return 0.0  # Evitar división por cero
     return ((pob_final - pob_inicial) / pob_inicial) * 100
 
+@profiled()
 def generar_resumen_2015():
     """Genera resumen para datos del censo 2015"""
     # Cargar datos preparados usando ruta de settings
     df = pd.read_csv(PATHS["eige_2015"]["prepared"])
+    add_rows(len(df))
+    # Distritos 2015 re-agregados a la geografía 2025 si hay asignación de secciones
+    df = harmonize(df, 2015, ["hombres_18+", "mujeres_18+"])
 
     rows = []
     for region, filtros in REGION_CONFIG_2015.items():
@@ -99,11 +109,18 @@ def generar_resumen_2015():
 
     return pd.DataFrame(rows)
 
+@profiled()
 def generar_resumen_2020():
     """Genera resumen para datos del INE 2020"""
     # Cargar datos preparados usando ruta de settings
     df = pd.read_csv(PATHS["ine_2020"]["prepared"])
+    add_rows(len(df))
     
+    # Distritos 2020 re-agregados a la geografía 2025 si hay asignación de secciones
+    # p_18ymas se recalcula como hombres + mujeres ya redondeados (regla adultos_por_sexo)
+    df = harmonize(df, 2020, ["p_18ymas", "hombres_18+", "mujeres_18+"],
+                   sumas={"p_18ymas": ["hombres_18+", "mujeres_18+"]})
+
     # Filtrar solo Jalisco (entidad 14)
     df = df[df["entidad"] == 14]
     
@@ -132,19 +149,48 @@ def generar_resumen_2020():
     
     return pd.DataFrame(rows)
 
+def sumas_region_2025(df, be=None):
+    """Padrón de hombres y mujeres por región (enteros, se pueden sumar por partes)"""
+    be = be or get_backend("pandas")
+    sumas = {
+        region: be.sum(be.filter_in(df, filtros), ["padron_hombres", "padron_mujeres"])
+        for region, filtros in REGION_CONFIG_2025.items()
+    }
+    return pd.DataFrame(sumas).T
+
+@profiled()
 def generar_resumen_2025():
     """Genera resumen para datos del INE 2025"""
-    # Cargar datos preparados usando ruta de settings
-    df = pd.read_csv(PATHS["ine_2025"]["prepared"], encoding="latin1")
+    budget = memory_budget()
+    if table_ready("ine_2025"):
+        # Sumas resueltas en la base embebida (ver store.py)
+        from src.scripts.store import sumas_region_2025_store
+        announce_path("resumen_2025", "sqlite")
+        sumas = sumas_region_2025_store()
+    elif budget:
+        # Sumas por partición con derrame a disco (ver out_of_core.py)
+        from src.scripts.out_of_core import sumas_region_2025_partitioned
+        announce_path("resumen_2025", "particiones")
+        sumas = sumas_region_2025_partitioned(budget)
+    elif get_backend().nombre == "pandas":
+        # Sumas sobre los agregados por distrito, cacheados por corte (ver hierarchy.py)
+        from src.scripts.hierarchy import rollups
+        announce_path("resumen_2025", "pandas")
+        sumas = sumas_region_2025(rollups("2025")["distrito"])
+    else:
+        # Cargar datos preparados usando ruta de settings (Polars, ver backend.py)
+        be = get_backend()
+        announce_path("resumen_2025", be.nombre)
+        columnas = ["clave_entidad", "clave_distrito", "padron_hombres", "padron_mujeres"]
+        df = be.read_csv(PATHS["ine_2025"]["prepared"], columns=columnas, encoding="latin1")
+        add_rows(len(df))
+        sumas = sumas_region_2025(df, be)
     
     rows = []
-    for region, filtros in REGION_CONFIG_2025.items():
-        # Aplicar filtros de región
-        sub = aplicar_filtros(df, filtros)
-        
+    for region in REGION_CONFIG_2025:
         # Calcular poblaciones
-        hombres = sub["padron_hombres"].sum()
-        mujeres = sub["padron_mujeres"].sum()
+        hombres = sumas.loc[region, "padron_hombres"]
+        mujeres = sumas.loc[region, "padron_mujeres"]
         
         pop_total = hombres + mujeres
         porcentaje_hombres = (hombres / pop_total) * 100
@@ -162,6 +208,7 @@ def generar_resumen_2025():
 
     return pd.DataFrame(rows)
 
+@profiled()
 def calcular_indices_demograficos(df_resumen):
     """
     Calcula índices demográficos y tasas de crecimiento para cada región
@@ -204,8 +251,8 @@ def calcular_indices_demograficos(df_resumen):
     
     return df.drop(columns=["POB_ANTERIOR"])
 
-def main():
-    """Función principal para generar el resumen consolidado"""
+def generar_resumen_final():
+    """Genera el resumen consolidado y el informe analítico"""
     # Crear directorio si no existe
     ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -326,5 +373,33 @@ def generar_informe_analitico(df):
     print("PROCESO COMPLETADO EXITOSAMENTE".center(70))
     print("="*70)
 
+def main():
+    """Función principal para generar el resumen consolidado"""
+    parser = argparse.ArgumentParser(description="Resumen demográfico por región y año")
+    parser.add_argument(
+        "--memory-budget",
+        default=None,
+        help="Memoria máxima por partición, p.ej. 512MB (suma el padrón por partes)"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Suma el padrón en la base embebida (SQLite) si existe"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="Motor de tablas para el padrón 2025 (por defecto pandas)"
+    )
+    args = parser.parse_args()
+    error = incompatible_flags(args.backend, args.store, args.memory_budget)
+    if error:
+        parser.error(error)
+    set_memory_budget(args.memory_budget)
+    enable_store(args.store)
+    set_backend(args.backend)
+    generar_resumen_final()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 # Proyecto Minería de Datos — Proyección 2015–2035
 
+import argparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -9,7 +10,6 @@ import plotly.io as pio
 from pathlib import Path
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import r2_score, mean_squared_error
 from scipy import stats
 from matplotlib import patheffects
 from src.config.settings import (
@@ -23,9 +23,8 @@ from src.config.settings import (
     PATHS,
     REGION_CONFIG
 )
-# Asegurar carpetas de destino
-STATIC_DIR.mkdir(parents=True, exist_ok=True)
-INTERACTIVE_DIR.mkdir(parents=True, exist_ok=True)
+from src.config.style import REGION_PALETTE, GENDER_PALETTE
+from src.scripts.model_cache import load_or_fit, score, cache_summary
 
 # Configuración global mejorada
 plt.rcParams['font.family'] = 'DejaVu Sans'
@@ -39,17 +38,6 @@ sns.set_theme(style="whitegrid", context="talk", font_scale=0.9)
 # Configuración de Plotly
 pio.templates.default = "plotly_white"
 
-# Paletas profesionales
-REGION_PALETTE = {
-    "Jalisco": "#1f77b4",
-    "ZMG": "#ff7f0e",
-    "GDL": "#2ca02c"
-}
-GENDER_PALETTE = {
-    "Hombres": "#3498db",
-    "Mujeres": "#e74c3c"
-}
-
 # Efectos de texto
 TITLE_EFFECT = [patheffects.withStroke(linewidth=1, foreground='black')]
 LABEL_EFFECT = [patheffects.withStroke(linewidth=2, foreground='white')]
@@ -82,6 +70,18 @@ def apply_advanced_styling(ax, title):
             text.set_path_effects(LABEL_EFFECT)
             text.set_fontsize(11)
 
+# Métricas que se interpolan y proyectan
+HIST_METRICS = ["POB_TOT", "HOMBRES_18+", "MUJERES_18+"]
+
+# Cadencias soportadas por la serie histórica
+CADENCIAS = ("anual", "mensual")
+
+# Bootstrap de residuos para intervalos de predicción
+N_BOOTSTRAP = 1000       # Réplicas por serie
+BOOTSTRAP_SEED = 42      # Semilla del generador (reproducible)
+BOOTSTRAP_BLOCK = 256    # Series por bloque (acota la memoria)
+NIVEL_INTERVALO = 0.95
+
 # --- 1. Cargar y limpiar el maestro ---
 def load_and_clean_master(path: Path) -> pd.DataFrame:
     df = pd.read_csv(path)
@@ -95,42 +95,145 @@ def load_and_clean_master(path: Path) -> pd.DataFrame:
     return df.reset_index(drop=True)
 
 # --- 2. Construir serie histórica 2015–2025 ---
-def build_historical(master: pd.DataFrame) -> pd.DataFrame:
-    frames = []
-    for region, grp in master.groupby("REGIÓN"):
-        # Reindexar años 2015–2025
-        grp = grp.sort_values("AÑO").set_index("AÑO")
-        full = grp.reindex(range(2015, 2026))
-        # Interpolar columnas numéricas
-        num_cols = ["POB_TOT", "HOMBRES_18+", "MUJERES_18+"]
-        full[num_cols] = full[num_cols].interpolate(method="linear")
-        # Rellenar región y año
-        full["REGIÓN"] = region
-        full = full.reset_index()
-        # Redondear población a entero
-        full[num_cols] = full[num_cols].round().astype(int)
-        frames.append(full)
-    return pd.concat(frames, ignore_index=True)
+def build_historical(master: pd.DataFrame, id_cols="REGIÓN", metrics=HIST_METRICS,
+                     cadence="anual", start=2015, end=2025) -> pd.DataFrame:
+    """Interpola todas las series a la vez (pivot periodo × serie → melt)
+
+    `id_cols` identifica cada serie (región, municipio, sección...) y
+    `cadence` define la resolución de la serie: "anual" o "mensual". Sólo se
+    interpola entre observaciones: los periodos antes de la primera o después
+    de la última observación de una serie (p.ej. un municipio nuevo) quedan
+    como NA en columnas Int64.
+    """
+    if cadence not in CADENCIAS:
+        raise ValueError(f"Cadencia desconocida: {cadence}")
+    id_cols = [id_cols] if isinstance(id_cols, str) else list(id_cols)
+    time_cols = ["AÑO"] if cadence == "anual" else ["AÑO", "MES"]
+
+    # Periodo entero: año (anual) o número de mes absoluto (mensual)
+    df = master.copy()
+    if cadence == "mensual":
+        if "MES" not in df.columns:
+            df["MES"] = 1  # Observaciones anuales se fijan en enero
+        periodo = df["AÑO"] * 12 + df["MES"] - 1
+        grid = np.arange(start * 12, min(periodo.max(), end * 12 + 11) + 1)
+    else:
+        periodo = df["AÑO"]
+        grid = np.arange(start, end + 1)
+    df["_PERIODO"] = periodo
+
+    # Matriz periodo × (métrica, serie) e interpolación en una sola llamada
+    wide = df.pivot(index="_PERIODO", columns=id_cols, values=metrics)
+    series = wide[metrics[0]].columns
+    wide = wide.reindex(
+        index=grid,
+        columns=pd.MultiIndex.from_tuples(
+            [(m, *(s if isinstance(s, tuple) else (s,))) for m in metrics for s in series]
+        )
+    )
+    wide = wide.interpolate(method="linear", limit_area="inside")
+
+    # Volver a formato largo: una fila por serie y periodo
+    n_t, n_s = len(grid), len(series)
+    values = (
+        wide.to_numpy()
+        .reshape(n_t, len(metrics), n_s)
+        .transpose(2, 0, 1)
+        .reshape(n_s * n_t, len(metrics))
+    )
+    full = series.to_frame(index=False).iloc[np.repeat(np.arange(n_s), n_t)]
+    full = full.reset_index(drop=True)
+    full["_PERIODO"] = np.tile(grid, n_s)
+    # Redondear población a entero (Int64 conserva los huecos como NA)
+    full[metrics] = pd.DataFrame(np.round(values), columns=metrics).astype("Int64")
+
+    if cadence == "mensual":
+        full["AÑO"] = full["_PERIODO"] // 12
+        full["MES"] = full["_PERIODO"] % 12 + 1
+    else:
+        full["AÑO"] = full["_PERIODO"]
+
+    # Conservar columnas no interpoladas en los periodos observados
+    extra = [c for c in df.columns if c not in id_cols + metrics + time_cols + ["_PERIODO"]]
+    if extra:
+        full = full.merge(df[id_cols + ["_PERIODO"] + extra], on=id_cols + ["_PERIODO"], how="left")
+    order = time_cols + [c for c in master.columns if c not in time_cols]
+    return full[order]
 
 # --- 3. Proyección hasta 2035 ---
-def project_to_2035(hist_df: pd.DataFrame) -> pd.DataFrame:
-    projections = []
-    metrics = ["POB_TOT", "HOMBRES_18+", "MUJERES_18+"]
-    for region, grp in hist_df.groupby("REGIÓN"):
-        X = grp[["AÑO"]].values
-        future_years = np.arange(2026, 2036).reshape(-1, 1)
-        df_pred = pd.DataFrame({"AÑO": future_years.flatten()})
-        for m in metrics:
-            y = grp[m].values
-            model = LinearRegression().fit(X, y)
-            pred = model.predict(future_years).round().astype(int)
-            df_pred[m] = pred
-            r2 = r2_score(y, model.predict(X))
-            mse = mean_squared_error(y, model.predict(X))
+def project_to_2035(hist_df: pd.DataFrame, end_year=2035) -> pd.DataFrame:
+    """Proyecta cada serie con su recta; los coeficientes se memoizan en disco"""
+    artifact = load_or_fit(hist_df, HIST_METRICS)
+    for i, m in enumerate(artifact["metrics"]):
+        for j, region in enumerate(artifact["series"]):
+            r2 = artifact["r2"][i][j]
+            mse = artifact["mse"][i][j]
             print(f"{region} | {m}: R²={r2:.3f}, MSE={mse:.0f}")
-        df_pred["REGIÓN"] = region
-        projections.append(df_pred)
-    return pd.concat(projections, ignore_index=True)
+    future_years = np.arange(artifact["years"][1] + 1, end_year + 1)
+    return score(artifact, future_years)[["AÑO", *HIST_METRICS, "REGIÓN"]]
+
+# --- 3.1 Intervalos de predicción (bootstrap de residuos) ---
+def bootstrap_intervals(obs_df: pd.DataFrame, future_years, metrics=HIST_METRICS,
+                        id_col="REGIÓN", n_boot=N_BOOTSTRAP, seed=BOOTSTRAP_SEED,
+                        block_size=BOOTSTRAP_BLOCK, level=NIVEL_INTERVALO) -> pd.DataFrame:
+    """Intervalos de predicción por bootstrap de residuos para todas las series
+
+    `obs_df` debe traer sólo los años observados (el maestro, no la serie de
+    build_historical): los residuos en años interpolados son casi cero por
+    construcción y angostarían los intervalos. Los residuos se remuestrean en
+    un arreglo réplica × serie × año y todas las rectas se reajustan con un
+    solo producto matricial por bloque de series.
+    """
+    wide = obs_df.pivot(index="AÑO", columns=id_col, values=metrics)
+    series = wide[metrics[0]].columns
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([metrics, series]))
+    years = wide.index.to_numpy(dtype=float)
+    future_years = np.asarray(future_years, dtype=float)
+    Y = wide.to_numpy(dtype=float).T  # (series, años)
+    n_series, n_years = Y.shape
+
+    X = np.column_stack([np.ones_like(years), years])
+    X_future = np.column_stack([np.ones_like(future_years), future_years])
+    X_pinv_t = np.linalg.pinv(X).T  # (años, 2)
+    # Inflar residuos por los grados de libertad del ajuste
+    scale = np.sqrt(n_years / max(n_years - X.shape[1], 1))
+
+    rng = np.random.default_rng(seed)
+    alpha = (1 - level) / 2
+    lower = np.empty((n_series, len(future_years)))
+    upper = np.empty((n_series, len(future_years)))
+
+    for start in range(0, n_series, block_size):
+        Yb = Y[start:start + block_size]
+        k = Yb.shape[0]
+        fitted = (Yb @ X_pinv_t) @ X.T
+        resid = (Yb - fitted) * scale
+        rows = np.arange(k)[None, :, None]
+
+        # Series sintéticas (réplica × serie × año) y reajuste en lote
+        idx = rng.integers(0, n_years, size=(n_boot, k, n_years))
+        Y_star = fitted[None] + resid[rows, idx]
+        beta_star = Y_star @ X_pinv_t                  # (réplica, serie, 2)
+        pred_star = beta_star @ X_future.T             # (réplica, serie, futuro)
+
+        # Ruido de observación en los años proyectados
+        idx_future = rng.integers(0, n_years, size=(n_boot, k, len(future_years)))
+        pred_star += resid[rows, idx_future]
+
+        lower[start:start + k], upper[start:start + k] = np.quantile(
+            pred_star, [alpha, 1 - alpha], axis=0
+        )
+
+    # Volver a formato largo: una fila por serie y año proyectado
+    out = pd.DataFrame({
+        id_col: np.repeat(series.to_numpy(), len(future_years)),
+        "AÑO": np.tile(future_years.astype(int), len(series)),
+    })
+    for i, m in enumerate(metrics):
+        block = slice(i * len(series), (i + 1) * len(series))
+        out[f"{m}_LI"] = pd.Series(np.round(lower[block]).ravel()).astype("Int64")
+        out[f"{m}_LS"] = pd.Series(np.round(upper[block]).ravel()).astype("Int64")
+    return out
 
 # --- 4. Clasificación de mayoría de género ---
 def logistic_majority_gender(df: pd.DataFrame):
@@ -177,6 +280,12 @@ def plot_series(all_df: pd.DataFrame):
         plt.xlabel("Año", fontsize=14, labelpad=10)
         plt.ylabel("Población Adulta", fontsize=14, labelpad=10)
         
+        # Banda del intervalo de predicción
+        if "POB_TOT_LI" in all_df.columns:
+            for region, grp in all_df.dropna(subset=["POB_TOT_LI"]).groupby("REGIÓN"):
+                ax.fill_between(grp["AÑO"], grp["POB_TOT_LI"], grp["POB_TOT_LS"],
+                                color=REGION_PALETTE.get(region), alpha=0.15, linewidth=0)
+
         # Línea vertical para separar histórico y proyección
         plt.axvline(x=2025.5, color='gray', linestyle='--', alpha=0.7)
         plt.text(2025.7, all_df["POB_TOT"].max()*0.9, "Proyección", 
@@ -487,6 +596,39 @@ def plot_growth_rates(all_df: pd.DataFrame):
 
 # --- Main pipeline ---
 def main():
+    parser = argparse.ArgumentParser(
+        description="Serie histórica y proyección poblacional 2015-2035"
+    )
+    parser.add_argument(
+        "--hasta",
+        type=int,
+        default=2035,
+        help="Último año de la proyección (reutiliza el modelo en caché)"
+    )
+    parser.add_argument(
+        "--bootstrap",
+        type=int,
+        default=N_BOOTSTRAP,
+        help="Réplicas del bootstrap de residuos para los intervalos"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=BOOTSTRAP_SEED,
+        help="Semilla del generador aleatorio del bootstrap"
+    )
+    parser.add_argument(
+        "--nivel",
+        type=float,
+        default=NIVEL_INTERVALO,
+        help="Nivel de confianza de los intervalos (p.ej. 0.95)"
+    )
+    args = parser.parse_args()
+
+    # Asegurar carpetas de destino
+    for directory in (ABSTRACT_DIR, STATIC_DIR, INTERACTIVE_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
     print("="*70)
     print("INICIANDO PROYECCIÓN POBLACIONAL 2015-2035".center(70))
     print("="*70)
@@ -503,10 +645,21 @@ def main():
 
     # Proyectar hacia 2035
     print("📈 Proyectando población hasta 2035...")
-    future = project_to_2035(hist)
+    future = project_to_2035(hist, end_year=args.hasta)
+    print(cache_summary())
+
+    # Intervalos de predicción por bootstrap (sobre los años observados)
+    print(f"🎲 Calculando intervalos {args.nivel:.0%} ({args.bootstrap} réplicas)...")
+    intervals = bootstrap_intervals(
+        master, future["AÑO"].unique(),
+        n_boot=args.bootstrap, seed=args.seed, level=args.nivel
+    )
+    future = future.merge(intervals, on=["REGIÓN", "AÑO"], how="left")
 
     # Concatenar todo
     all_data = pd.concat([hist, future], ignore_index=True)
+    interval_cols = [c for c in all_data.columns if c.endswith(("_LI", "_LS"))]
+    all_data[interval_cols] = all_data[interval_cols].astype("Int64")
     print(f"📊 Datos consolidados: {len(all_data)} registros (2015-2035)")
 
     # Clasificación de mayoría de género
@@ -520,7 +673,7 @@ def main():
     plot_growth_rates(all_data)
     
     # Guardar datos proyectados
-    output_path = ABSTRACT_DIR / "proyeccion_2035.csv"
+    output_path = ABSTRACT_DIR / f"proyeccion_{args.hasta}.csv"
     all_data.to_csv(output_path, index=False)
     print(f"\n💾 Datos proyectados guardados en: {output_path}")
     
@@ -0,0 +1,165 @@
+# Secciones atípicas del padrón (estadística robusta por municipio)
+#
+# Para cada sección se calculan tres señales: razón de sexos del padrón
+# (hombres por cada 100 mujeres), cobertura de la lista nominal (lista /
+# padrón) y, si hay un corte previo, el cambio porcentual del padrón. Cada
+# señal se compara con la mediana de su municipio usando el puntaje z robusto
+# 0.6745·(x − mediana)/MAD; en municipios con menos de MIN_SECCIONES
+# secciones calificables se usa la entidad. Todo se calcula con transforms de
+# groupby sobre la tabla completa. Las secciones con |z| ≥ UMBRAL en alguna
+# señal se escriben ordenadas por su mayor |z|.
+#
+#   python -m src.scripts.anomalies                          # padrón preparado 2025
+#   python -m src.scripts.anomalies 2024-06                  # corte del almacén (contra el corte previo)
+#   python -m src.scripts.anomalies actual.csv --previo previo.csv
+
+import argparse
+import re
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config.settings import ABSTRACT_DIR, PATHS
+from src.scripts.padron_delta import load_cut
+from src.scripts.padron_snapshots import load_catalog, pack_keys
+from src.scripts.profiling import add_rows, profiled
+
+UMBRAL = 3.5
+MIN_SECCIONES = 5
+# Secciones con padrón menor no se califican: sus proporciones son puro ruido
+MIN_PADRON = 50
+LLAVE = ["clave_entidad", "clave_distrito", "clave_municipio", "seccion"]
+MUNICIPIO = ["clave_entidad", "clave_municipio"]
+
+
+def signals(actual, previo=None):
+    """Señales por sección (NaN donde no aplican)"""
+    calificable = (actual["seccion"] > 0) & (actual["padron_electoral"] >= MIN_PADRON)
+    padron = actual["padron_electoral"].where(calificable)
+    senales = pd.DataFrame({
+        "razon_sexo": actual["padron_hombres"] / actual["padron_mujeres"].where(actual["padron_mujeres"] > 0) * 100,
+        "cobertura_lista": actual["lista_nominal"] / padron * 100,
+    }, index=actual.index)
+    senales["razon_sexo"] = senales["razon_sexo"].where(calificable)
+
+    if previo is not None:
+        # Padrón previo por sección con la llave empacada (ver padron_snapshots.py)
+        llaves_previo = pack_keys(previo)
+        orden = np.argsort(llaves_previo, kind="stable")
+        llaves_previo = llaves_previo[orden]
+        llaves = pack_keys(actual)
+        pos = np.searchsorted(llaves_previo, llaves).clip(max=max(len(llaves_previo) - 1, 0))
+        existe = llaves_previo[pos] == llaves if len(llaves_previo) else np.zeros(len(llaves), bool)
+        anterior = previo["padron_electoral"].to_numpy(float)[orden][pos]
+        anterior = np.where(existe & (anterior >= MIN_PADRON), anterior, np.nan)
+        senales["cambio_padron_%"] = (padron.to_numpy(float) / anterior - 1) * 100
+    return senales
+
+
+def robust_z(x, grupos):
+    """Puntaje z robusto y mediana de x dentro de cada grupo
+
+    Si la MAD es 0 (más de la mitad de los valores iguales) se usa la
+    desviación absoluta media, como en el puntaje z modificado.
+    """
+    mediana = x.groupby(grupos).transform("median")
+    desvio = (x - mediana).abs()
+    mad = desvio.groupby(grupos).transform("median").to_numpy()
+    media = desvio.groupby(grupos).transform("mean").to_numpy()
+    diferencia = (x - mediana).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(mad > 0, 0.6745 * diferencia / mad, diferencia / (1.2533 * media))
+    z = np.where(media > 0, z, 0.0)
+    return pd.Series(np.where(x.isna(), np.nan, z), index=x.index), mediana
+
+
+@profiled()
+def detect(actual, previo=None):
+    """Tabla de secciones atípicas, ordenada de la más a la menos anómala"""
+    senales = signals(actual, previo)
+    # Códigos enteros de grupo una sola vez: los transforms agrupan más rápido
+    municipio = actual.groupby(MUNICIPIO, sort=False).ngroup().to_numpy()
+    entidad = actual["clave_entidad"].to_numpy()
+
+    columnas = [c for c in ("nombre_municipio", "padron_electoral") if c in actual.columns]
+    resultado = actual[LLAVE + columnas].copy()
+    zs = []
+    for senal in senales.columns:
+        x = senales[senal]
+        z, mediana = robust_z(x, municipio)
+        z_entidad, mediana_entidad = robust_z(x, entidad)
+        # Municipios con pocas secciones calificables: referencia de la entidad
+        pocas = (x.groupby(municipio).transform("count") < MIN_SECCIONES).to_numpy()
+        resultado[senal] = x.round(2)
+        resultado[f"mediana_{senal}"] = np.where(pocas, mediana_entidad, mediana).round(2)
+        resultado[f"z_{senal}"] = np.where(pocas, z_entidad, z).round(2)
+        zs.append(f"z_{senal}")
+
+    absolutos = resultado[zs].abs()
+    resultado["puntaje"] = absolutos.max(axis=1)
+    resultado["senal_principal"] = absolutos.fillna(-1).idxmax(axis=1).str.removeprefix("z_")
+    atipicas = resultado[resultado["puntaje"] >= UMBRAL].sort_values(
+        ["puntaje", *LLAVE], ascending=[False, True, True, True, True], kind="stable"
+    )
+    return atipicas.reset_index(drop=True).assign(lugar=lambda d: np.arange(1, len(d) + 1))
+
+
+def _previous_cut(corte):
+    """Corte anterior a `corte` en el almacén, o None"""
+    anteriores = [c["corte"] for c in load_catalog()["cortes"] if c["corte"] < corte]
+    return anteriores[-1] if anteriores else None
+
+
+def anomalies_report(origen=None, previo=None, destino=None):
+    """Detecta secciones atípicas de un corte y guarda la tabla ordenada"""
+    origen = origen or PATHS["ine_2025"]["prepared"]
+    es_corte = re.fullmatch(r"\d{4}-\d{2}", str(origen)) is not None
+    if previo is None and es_corte:
+        previo = _previous_cut(str(origen))
+    actual = load_cut(origen)
+    anterior = load_cut(previo) if previo is not None else None
+    add_rows(len(actual) + (len(anterior) if anterior is not None else 0))
+
+    atipicas = detect(actual, anterior)
+    if es_corte:
+        etiqueta = str(origen)
+    else:
+        etiqueta = "2025" if Path(origen) == PATHS["ine_2025"]["prepared"] else Path(origen).stem.replace("padron_", "")
+    destino = destino or ABSTRACT_DIR / f"anomalias_secciones_{etiqueta}.csv"
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    atipicas.to_csv(destino, index=False)
+
+    contra = f" contra {previo}" if previo is not None else " (sin corte previo: no se evalúa el cambio)"
+    print(f"🚨 {len(atipicas):,} de {len(actual):,} secciones atípicas (|z| ≥ {UMBRAL}){contra}")
+    if len(atipicas):
+        print(atipicas[["lugar", *LLAVE, "senal_principal", "puntaje"]].head(10).to_string(index=False))
+    print(f"✅ Tabla guardada en {destino}")
+    return atipicas
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Secciones atípicas por razón de sexos, cobertura de lista y cambio del padrón"
+    )
+    parser.add_argument(
+        "corte",
+        nargs="?",
+        default=None,
+        help="CSV de un corte o AAAA-MM del almacén (por defecto el padrón preparado 2025)"
+    )
+    parser.add_argument(
+        "--previo",
+        default=None,
+        help="Corte previo (CSV o AAAA-MM) para la señal de cambio"
+    )
+    parser.add_argument(
+        "--salida",
+        type=Path,
+        default=None,
+        help="Archivo CSV de salida"
+    )
+    args = parser.parse_args()
+    anomalies_report(args.corte, args.previo, args.salida)
+
+
+if __name__ == "__main__":
+    main()
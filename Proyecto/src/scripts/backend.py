@@ -0,0 +1,179 @@
+# Backend de tablas: pandas (por defecto) o Polars (multihilo)
+#
+# Reúne las operaciones que usan las etapas sobre las tablas grandes: leer,
+# filtrar por listas de llaves, sumar por grupo, rankear, contar valores,
+# histograma y escribir. Cada backend trabaja con su tipo de tabla nativo;
+# `to_pandas` entrega el resultado (pequeño) al resto del proyecto. El
+# backend se elige con `--backend` o POBLACION_BACKEND, que heredan los
+# procesos hijos. Polars es opcional: sólo se importa al pedirlo.
+
+import io
+import os
+import pandas as pd
+
+BACKEND_ENV = "POBLACION_BACKEND"
+BACKENDS = ("pandas", "polars")
+
+
+def set_backend(nombre):
+    """Elige el backend en este proceso y sus hijos (None no cambia nada)"""
+    if nombre:
+        if nombre not in BACKENDS:
+            raise ValueError(f"❌ Backend desconocido: {nombre} (opciones: {', '.join(BACKENDS)})")
+        os.environ[BACKEND_ENV] = nombre
+
+
+def incompatible_flags(backend, store=False, memory_budget=None):
+    """Mensaje de error si se pide Polars junto con un camino que no usa el backend, o None
+
+    Precedencia en explorer_2025 y el resumen 2025: base SQLite > presupuesto
+    de memoria > backend de tablas.
+    """
+    if backend == "polars":
+        otros = [flag for flag, activo in (("--store", store), ("--memory-budget", memory_budget)) if activo]
+        if otros:
+            camino = "esos caminos no usan" if len(otros) > 1 else "ese camino no usa"
+            return f"--backend polars no se combina con {' ni '.join(otros)}: {camino} el backend de tablas"
+    return None
+
+
+def announce_path(etapa, camino):
+    """Informa qué camino calculó la etapa y avisa si el backend pedido quedó sin usar"""
+    pedido = os.environ.get(BACKEND_ENV) or "pandas"
+    aviso = f" (⚠️ se ignora el backend {pedido})" if camino in ("sqlite", "particiones") and pedido != "pandas" else ""
+    print(f"🧭 {etapa}: camino {camino}{aviso}")
+
+
+def get_backend(nombre=None):
+    """Backend pedido, el de POBLACION_BACKEND o pandas"""
+    nombre = nombre or os.environ.get(BACKEND_ENV) or "pandas"
+    if nombre == "polars":
+        return PolarsBackend()
+    if nombre == "pandas":
+        return PandasBackend()
+    raise ValueError(f"❌ Backend desconocido: {nombre} (opciones: {', '.join(BACKENDS)})")
+
+
+class PandasBackend:
+    """Operaciones con pandas (un hilo)"""
+
+    nombre = "pandas"
+
+    def read_csv(self, path, columns=None, encoding="utf-8"):
+        return pd.read_csv(path, usecols=columns, encoding=encoding)
+
+    def filter_in(self, df, filtros):
+        """Filas cuyo valor está en la lista (o es igual al escalar) de cada columna; None no filtra"""
+        mask = pd.Series(True, index=df.index)
+        for col, val in filtros.items():
+            if val is None:
+                continue
+            mask &= df[col].isin(val) if isinstance(val, (list, tuple)) else df[col] == val
+        return df[mask]
+
+    def sum(self, df, columns):
+        """Suma de cada columna como Series de pandas"""
+        return df[columns].sum()
+
+    def groupby_sum(self, df, keys, columns):
+        """Suma por grupo, ordenada por llave"""
+        return df.groupby(keys, as_index=False)[columns].sum()
+
+    def rank(self, df, column, by=None, descending=True, nombre="rank"):
+        """Posición (método min: empates comparten el menor lugar), opcionalmente dentro de cada grupo"""
+        valores = df.groupby(by)[column] if by else df[column]
+        return df.assign(**{nombre: valores.rank(method="min", ascending=not descending).astype("int64")})
+
+    def value_counts(self, df, column):
+        """Conteo por valor, de mayor a menor y por valor en empates"""
+        conteos = df[column].value_counts()
+        return conteos.sort_index().sort_values(ascending=False, kind="stable").astype("int64")
+
+    def histogram(self, df, column, ancho):
+        """Conteo por intervalo [k·ancho, (k+1)·ancho), ordenado por intervalo"""
+        return (df[column] // ancho * ancho).value_counts().sort_index().astype("int64")
+
+    def write_csv(self, df, path):
+        df.to_csv(path, index=False)
+
+    def to_pandas(self, df):
+        return df
+
+
+class PolarsBackend:
+    """Operaciones con Polars (multihilo; POLARS_MAX_THREADS fija los hilos)"""
+
+    nombre = "polars"
+
+    def __init__(self):
+        try:
+            import polars as pl
+        except ImportError as exc:
+            raise ImportError("❌ El backend polars requiere `pip install polars`") from exc
+        self.pl = pl
+
+    def read_csv(self, path, columns=None, encoding="utf-8"):
+        pl = self.pl
+        if encoding.replace("-", "").lower() in ("utf8", "utf8sig"):
+            return pl.read_csv(path, columns=columns)
+        # Polars sólo lee UTF-8: se transcodifica en memoria (p.ej. latin1 del padrón)
+        with open(path, encoding=encoding) as f:
+            return pl.read_csv(io.BytesIO(f.read().encode("utf-8")), columns=columns)
+
+    def filter_in(self, df, filtros):
+        pl = self.pl
+        condiciones = [
+            pl.col(col).is_in(val) if isinstance(val, (list, tuple)) else pl.col(col) == val
+            for col, val in filtros.items() if val is not None
+        ]
+        return df.filter(condiciones) if condiciones else df
+
+    def sum(self, df, columns):
+        return self.to_pandas(df.select(self.pl.col(columns).sum())).iloc[0]
+
+    def groupby_sum(self, df, keys, columns):
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        # Como pandas: las llaves nulas no forman grupo
+        return (
+            df.drop_nulls(keys)
+            .group_by(keys)
+            .agg(self.pl.col(columns).sum())
+            .sort(keys)
+        )
+
+    def rank(self, df, column, by=None, descending=True, nombre="rank"):
+        expr = self.pl.col(column).rank("min", descending=descending).cast(self.pl.Int64)
+        return df.with_columns((expr.over(by) if by else expr).alias(nombre))
+
+    def value_counts(self, df, column):
+        pl = self.pl
+        conteos = (
+            df.select(pl.col(column).drop_nulls().value_counts(name="count"))
+            .unnest(column)
+            .sort(["count", column], descending=[True, False])
+        )
+        return pd.Series(
+            conteos["count"].cast(pl.Int64).to_numpy(),
+            index=pd.Index(conteos[column].to_numpy(), name=column),
+            name="count",
+        )
+
+    def histogram(self, df, column, ancho):
+        pl = self.pl
+        conteos = (
+            df.select((pl.col(column).drop_nulls() // ancho * ancho).alias(column))
+            .group_by(column).len()
+            .sort(column)
+        )
+        return pd.Series(
+            conteos["len"].cast(pl.Int64).to_numpy(),
+            index=pd.Index(conteos[column].to_numpy(), name=column),
+            name="count",
+        )
+
+    def write_csv(self, df, path):
+        df.write_csv(path)
+
+    def to_pandas(self, df):
+        # Columna por columna con numpy: no requiere pyarrow
+        return pd.DataFrame({c: df[c].to_numpy() for c in df.columns})
@@ -0,0 +1,204 @@
+# Backtesting de métodos de proyección con origen móvil
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from src.config.settings import (
+    ABSTRACT_DIR,
+    PADRON_CUTS_DIR,
+    REGION_CONFIG
+)
+from src.scripts.abstract import aplicar_filtros
+
+# Medida que se evalúa en cada serie
+MEDIDA = "POB_TOT"
+
+
+# ========================================================================
+# MÉTODOS DE PROYECCIÓN
+# Cada método recibe la matriz tiempo × serie de entrenamiento y devuelve
+# un estado; `predict` evalúa ese estado en los tiempos objetivo.
+# ========================================================================
+
+def _fit_lineal(train, step):
+    """Recta por mínimos cuadrados sobre la serie interpolada (como project_to_2035)"""
+    grid = np.arange(train.index.min(), train.index.max() + step / 2, step)
+    full = train.reindex(train.index.union(grid)).interpolate(method="index").loc[grid]
+    X = np.column_stack([np.ones_like(grid), grid])
+    return np.linalg.pinv(X) @ full.to_numpy(dtype=float)
+
+
+def _predict_lineal(beta, t):
+    return np.column_stack([np.ones_like(t), t]) @ beta
+
+
+def _fit_geometrico(train, step):
+    """Tasa de crecimiento constante entre las dos últimas observaciones"""
+    t0, t1 = train.index[-2], train.index[-1]
+    y0, y1 = train.iloc[-2].to_numpy(dtype=float), train.iloc[-1].to_numpy(dtype=float)
+    return t1, y1, np.log(y1 / y0) / (t1 - t0)
+
+
+def _predict_geometrico(state, t):
+    t1, y1, r = state
+    return y1[None, :] * np.exp(r[None, :] * (t[:, None] - t1))
+
+
+def _fit_ingenuo(train, step):
+    """Último valor observado"""
+    return train.iloc[-1].to_numpy(dtype=float)
+
+
+def _predict_ingenuo(last, t):
+    return np.repeat(last[None, :], len(t), axis=0)
+
+
+METODOS = {
+    "lineal": (_fit_lineal, _predict_lineal, 2),
+    "geometrico": (_fit_geometrico, _predict_geometrico, 2),
+    "ingenuo": (_fit_ingenuo, _predict_ingenuo, 1),
+}
+
+
+def _fit_cohortes(train, step):
+    """Calibra el modelo por cohortes desde 2015 (migración 2020 si el origen la incluye)"""
+    from src.scripts import cohort_projection as cp
+
+    distritos, base = cp.poblacion_base_2015()
+    migracion = cp.calibrar_migracion_2020(distritos, base) if train.index.max() >= 2020 else None
+    return distritos, base, cp.matrices_transicion(base, migracion=migracion), train.columns
+
+
+def _predict_cohortes(state, t):
+    """Proyecta las cohortes hasta el último tiempo objetivo y agrega a las regiones"""
+    from src.scripts import cohort_projection as cp
+
+    distritos, base, T, columnas = state
+    estados = cp.proyectar_cohortes(base, T, int(t.max()) - cp.ANIO_BASE)
+    regiones = cp.resumen_regiones(cp.tabla_proyeccion(distritos, estados))
+    wide = regiones.pivot(index="AÑO", columns="REGIÓN", values="POB_18YMAS")
+    return wide.reindex(index=t.astype(int), columns=columnas).to_numpy(dtype=float)
+
+
+# ========================================================================
+# SERIES DE EVALUACIÓN
+# ========================================================================
+
+def serie_anual():
+    """Serie observada por región desde resumen_final.csv (tiempo × región)"""
+    df = pd.read_csv(ABSTRACT_DIR / "resumen_final.csv")
+    return df.pivot(index="AÑO", columns="REGIÓN", values=MEDIDA).astype(float)
+
+
+def serie_mensual():
+    """Cortes mensuales del padrón por región, si existen en PADRON_CUTS_DIR
+
+    Los archivos se llaman `padron_AAAA-MM.csv` y tienen el formato de ine_2025.
+    """
+    archivos = sorted(PADRON_CUTS_DIR.glob("padron_*.csv")) if PADRON_CUTS_DIR.exists() else []
+    if len(archivos) < 3:
+        return None
+
+    rows = {}
+    for path in archivos:
+        fecha = pd.Period(path.stem.replace("padron_", ""), freq="M")
+        df = pd.read_csv(path, encoding="latin1")
+        rows[fecha.year + (fecha.month - 1) / 12] = {
+            region: aplicar_filtros(df, filtros)["padron_electoral"].sum()
+            for region, filtros in REGION_CONFIG["2025"].items()
+        }
+    return pd.DataFrame.from_dict(rows, orient="index").sort_index().astype(float)
+
+
+# ========================================================================
+# HARNESS
+# ========================================================================
+
+def _medir(func, *args):
+    """Ejecuta func devolviendo (resultado, ms, KB de memoria pico)"""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    result = func(*args)
+    ms = (time.perf_counter() - inicio) * 1000
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, ms, pico / 1024
+
+
+def backtest(serie, nombre, step, horizonte=None, cohortes=False):
+    """Origen móvil: ajusta con t <= origen y evalúa los siguientes puntos"""
+    metodos = dict(METODOS)
+    if cohortes:
+        metodos["cohortes"] = (_fit_cohortes, _predict_cohortes, 1)
+
+    rows = []
+    tiempos = serie.index.to_numpy(dtype=float)
+    for k in range(1, len(tiempos)):
+        train = serie.iloc[:k]
+        test = serie.iloc[k:] if horizonte is None else serie.iloc[k:k + horizonte]
+        t = test.index.to_numpy(dtype=float)
+        for metodo, (fit, predict, min_obs) in metodos.items():
+            if len(train) < min_obs:
+                continue
+            state, fit_ms, fit_kb = _medir(fit, train, step)
+            pred, pred_ms, pred_kb = _medir(predict, state, t)
+            error = pred - test.to_numpy(dtype=float)
+            for j, region in enumerate(serie.columns):
+                real = test.iloc[:, j].to_numpy(dtype=float)
+                rows.append({
+                    "serie": nombre,
+                    "metodo": metodo,
+                    "REGIÓN": region,
+                    "origen": round(tiempos[k - 1], 2),
+                    "n_pronosticos": len(t),
+                    "MAPE": float(np.mean(np.abs(error[:, j] / real)) * 100),
+                    "RMSE": float(np.sqrt(np.mean(error[:, j] ** 2))),
+                    "fit_ms": round(fit_ms, 3),
+                    "predict_ms": round(pred_ms, 3),
+                    "memoria_pico_kb": round(max(fit_kb, pred_kb), 1),
+                })
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backtesting de métodos de proyección (origen móvil)"
+    )
+    parser.add_argument(
+        "--horizonte-mensual",
+        type=int,
+        default=3,
+        help="Cortes a pronosticar desde cada origen en la serie mensual"
+    )
+    args = parser.parse_args()
+
+    print("🔍 Backtesting serie anual (resumen_final.csv)...")
+    resultados = [backtest(serie_anual(), "anual", step=1, cohortes=True)]
+
+    mensual = serie_mensual()
+    if mensual is not None:
+        print(f"🔍 Backtesting {len(mensual)} cortes mensuales del padrón...")
+        resultados.append(backtest(mensual, "mensual", step=1 / 12, horizonte=args.horizonte_mensual))
+    else:
+        print(f"⚠️ Sin cortes mensuales suficientes en {PADRON_CUTS_DIR}")
+
+    df = pd.concat(resultados, ignore_index=True)
+    ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    df.to_csv(ABSTRACT_DIR / "backtesting_proyecciones.csv", index=False)
+
+    resumen = (
+        df.groupby(["serie", "metodo"])
+          .agg(MAPE=("MAPE", "mean"), RMSE=("RMSE", "mean"),
+               fit_ms=("fit_ms", "median"), predict_ms=("predict_ms", "median"),
+               memoria_pico_kb=("memoria_pico_kb", "max"))
+          .round(2)
+          .sort_values(["serie", "MAPE"])
+    )
+    print(resumen.to_string())
+    print(f"✅ Backtesting guardado en {ABSTRACT_DIR / 'backtesting_proyecciones.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,864 @@
+# Benchmarks de rendimiento del pipeline
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+
+def _medir(func, *args, repeticiones=3, **kwargs):
+    """Devuelve la mediana (s) de varias ejecuciones de func"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        func(*args, **kwargs)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos))
+
+
+@contextlib.contextmanager
+def _synthetic_base(prefix, escala=1, seed=42, cortes=0, directorio=None):
+    """Genera datos sintéticos en un directorio temporal y lo borra al salir
+
+    Produce (base, resumen de archivos generados).
+    """
+    import shutil
+    import tempfile
+    from src.scripts.synthetic import generate
+
+    base = Path(tempfile.mkdtemp(prefix=f"{prefix}_{escala}x_", dir=directorio))
+    try:
+        yield base, generate(base, escala=escala, seed=seed, cortes=cortes)
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def _cortes_sinteticos(base):
+    """Rutas de los cortes sintéticos, del más antiguo al más reciente
+
+    Cada corte trae todas las entidades con el esquema preparado, así que los
+    benchmarks lo leen directo sin pasar por la limpieza.
+    """
+    return sorted((base / "raw" / "padron_cortes").glob("padron_*.csv"))
+
+
+def _maestro_sintetico(n_series, seed=42):
+    """Maestro con n_series observadas en 2015, 2020 y 2025"""
+    rng = np.random.default_rng(seed)
+    anios = np.array([2015, 2020, 2025])
+    base = rng.integers(1_000, 1_000_000, size=n_series)
+    crecimiento = rng.normal(1.08, 0.05, size=(n_series, len(anios))).cumprod(axis=1)
+    pob = (base[:, None] * crecimiento).round().astype("int64")
+    hombres = (pob * 0.48).round().astype("int64")
+    return pd.DataFrame({
+        "REGIÓN": np.repeat([f"S{i:06d}" for i in range(n_series)], len(anios)),
+        "AÑO": np.tile(anios, n_series),
+        "POB_TOT": pob.ravel(),
+        "HOMBRES_18+": hombres.ravel(),
+        "MUJERES_18+": (pob - hombres).ravel(),
+    })
+
+
+def _check_historical_gaps(build_historical, cadence):
+    """Una serie que empieza tarde conserva NA antes de su primera observación y se proyecta igual"""
+    import tempfile
+    from src.scripts import model_cache
+    from src.scripts.aggregate_analysis import project_to_2035
+
+    master = _maestro_sintetico(2)
+    master = master[~((master["REGIÓN"] == "S000001") & (master["AÑO"] == 2015))]
+    hist = build_historical(master, cadence=cadence)
+    tardia = hist[hist["REGIÓN"] == "S000001"]
+    antes = tardia["AÑO"] < 2020
+    if not tardia.loc[antes, "POB_TOT"].isna().all() or tardia.loc[~antes, "POB_TOT"].isna().any() \
+            or (hist["POB_TOT"].dropna() < 0).any():
+        raise AssertionError("❌ build_historical rellenó los periodos previos a la primera observación")
+
+    if cadence != "anual":
+        return
+    # La recta de la serie tardía sale sólo de sus años observados (artefactos en un directorio temporal)
+    modelos = model_cache.MODELS_DIR
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        model_cache.MODELS_DIR = Path(tmp)
+        try:
+            proyeccion = project_to_2035(hist)
+        finally:
+            model_cache.MODELS_DIR = modelos
+    observada = tardia.dropna(subset=["POB_TOT"])
+    pendiente, ordenada = np.polyfit(observada["AÑO"].astype(float), observada["POB_TOT"].astype(float), 1)
+    esperado = np.round(ordenada + pendiente * proyeccion.loc[proyeccion["REGIÓN"] == "S000001", "AÑO"].astype(float))
+    obtenido = proyeccion.loc[proyeccion["REGIÓN"] == "S000001", "POB_TOT"].astype(float)
+    if proyeccion[["POB_TOT"]].isna().any().any() or not np.allclose(obtenido, esperado, atol=1):
+        raise AssertionError("❌ project_to_2035 no ajustó la serie tardía sobre sus años observados")
+
+
+def bench_build_historical(series_counts=(10, 100, 1_000, 10_000), cadence="anual", repeticiones=3):
+    """Escalamiento de build_historical respecto al número de series"""
+    from src.scripts.aggregate_analysis import build_historical
+
+    _check_historical_gaps(build_historical, cadence)
+    rows = []
+    for n in series_counts:
+        master = _maestro_sintetico(n)
+        segundos = _medir(build_historical, master, cadence=cadence, repeticiones=repeticiones)
+        rows.append({
+            "series": n,
+            "cadencia": cadence,
+            "segundos": round(segundos, 4),
+            "us_por_serie": round(segundos / n * 1e6, 2),
+        })
+    result = pd.DataFrame(rows)
+
+    # Pendiente log-log: ~1 indica escalamiento lineal
+    pendiente = np.polyfit(np.log(result["series"]), np.log(result["segundos"]), 1)[0]
+    print(result.to_string(index=False))
+    print(f"📈 Pendiente log-log tiempo vs series: {pendiente:.2f}")
+    return result
+
+
+def _import_time_ms(codigo):
+    """Tiempo total de importación (ms) reportado por `python -X importtime`"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        # Sólo módulos de primer nivel (sin sangría) para no contar doble
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+# Importaciones que graph_analysis hacía al cargarse antes de los backends perezosos
+_IMPORT_ANSIOSO = (
+    "import seaborn, matplotlib.pyplot, plotly.express, plotly.io; "
+    "from matplotlib import patheffects; "
+)
+
+
+def bench_import_time(repeticiones=5):
+    """Costo de importar graph_analysis antes (backends ansiosos) y ahora (perezosos)"""
+    casos = {
+        "antes: import ansioso": _IMPORT_ANSIOSO + "import src.scripts.graph_analysis",
+        "import graph_analysis": "import src.scripts.graph_analysis",
+        "+ backend estático": "import src.scripts.graph_analysis as g; g.static_backend()",
+        "+ backend interactivo": "import src.scripts.graph_analysis as g; g.interactive_backend()",
+        "+ ambos backends": "import src.scripts.graph_analysis as g; g.static_backend(); g.interactive_backend()",
+    }
+    rows = []
+    for caso, codigo in casos.items():
+        tiempos = [_import_time_ms(codigo) for _ in range(repeticiones)]
+        rows.append({"caso": caso, "ms_mediana": round(float(np.median(tiempos)), 1)})
+    result = pd.DataFrame(rows)
+    antes = result["ms_mediana"].iloc[0]
+    result["ahorro_ms"] = (antes - result["ms_mediana"]).round(1)
+    result["ahorro_%"] = (result["ahorro_ms"] / antes * 100).round(1)
+    print(result.to_string(index=False))
+    ahorro = result.set_index("caso").loc["import graph_analysis"]
+    print(f"🚀 Importar graph_analysis: {antes:.0f} ms → {antes - ahorro['ahorro_ms']:.0f} ms "
+          f"({ahorro['ahorro_%']:.0f}% menos) hasta que se pide un backend")
+    return result
+
+
+# Mide en un proceso nuevo (como un worker) los efectos de importar la configuración
+_SONDA_CONFIG = """
+import contextlib, io, json, sys
+eventos = {{}}
+sys.addaudithook(lambda e, a: eventos.__setitem__(e, eventos.get(e, 0) + 1))
+def io_syscalls():
+    try:
+        with open("/proc/self/io") as f:
+            campos = dict(line.split(": ") for line in f.read().splitlines())
+        return int(campos["syscr"]) + int(campos["syscw"])
+    except OSError:
+        return 0
+antes = io_syscalls()
+salida = io.StringIO()
+with contextlib.redirect_stdout(salida):
+    {codigo}
+despues = io_syscalls()
+print(json.dumps({{
+    "mkdir": eventos.get("os.mkdir", 0),
+    "lineas_impresas": salida.getvalue().count("\\n"),
+    "syscalls_lectura_escritura": despues - antes,
+}}))
+"""
+
+
+def bench_settings_import(repeticiones=5):
+    """Costo por worker de importar settings, frente al comportamiento anterior (crear directorios al importar)"""
+    casos = {
+        "import settings (perezoso)": "import src.config.settings",
+        "+ resolver rutas": "from src.config.settings import PATHS, STATIC_DIR",
+        "+ create_directories() (antes, en cada import)":
+            "import src.config.settings as s; s.create_directories()",
+    }
+    rows = []
+    for caso, codigo in casos.items():
+        proc = subprocess.run(
+            [sys.executable, "-c", _SONDA_CONFIG.format(codigo=codigo)],
+            cwd=Path(__file__).resolve().parents[2],
+            capture_output=True, text=True, check=True
+        )
+        efectos = json.loads(proc.stdout.splitlines()[-1])
+        tiempos = [_import_time_ms(codigo) for _ in range(repeticiones)]
+        rows.append({"caso": caso, "ms_mediana": round(float(np.median(tiempos)), 2), **efectos})
+    result = pd.DataFrame(rows)
+    print(result.to_string(index=False))
+    return result
+
+
+def _rss_mb():
+    """Memoria residente actual del proceso (MB), leída de /proc en Linux"""
+    import resource
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_render_profiles(n_graficos=100, perfiles=("borrador", "publicacion")):
+    """Tiempo por gráfico y crecimiento de memoria al renderizar n gráficos por perfil"""
+    import tempfile
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    from src.scripts.graph_analysis import plot_gender_comparison
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        "distrito_nombre": [f"DISTRITO {i}" for i in range(13)],
+        "hombres_18+": rng.integers(50_000, 500_000, 13),
+        "mujeres_18+": rng.integers(50_000, 500_000, 13),
+    })
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for perfil in perfiles:
+            # Calentamiento: importa backends y crea la figura del pool
+            plot_gender_comparison(df, "distrito_nombre", "hombres_18+", "mujeres_18+",
+                                   "Calentamiento", f"{tmp}/warmup.png", modos=("estatico",), perfil=perfil)
+            rss_inicio = _rss_mb()
+            inicio = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for i in range(n_graficos):
+                    # Ruta absoluta: pathlib la respeta sobre STATIC_DIR
+                    plot_gender_comparison(df, "distrito_nombre", "hombres_18+", "mujeres_18+",
+                                           f"Gráfico {i}", f"{tmp}/chart_{i % 4}.png",
+                                           modos=("estatico",), perfil=perfil)
+            segundos = time.perf_counter() - inicio
+            rows.append({
+                "perfil": perfil,
+                "graficos": n_graficos,
+                "ms_por_grafico": round(segundos / n_graficos * 1000, 1),
+                "rss_final_mb": round(_rss_mb(), 1),
+                "crecimiento_rss_mb": round(_rss_mb() - rss_inicio, 1),
+            })
+    result = pd.DataFrame(rows)
+    print(result.to_string(index=False))
+    return result
+
+
+def profile_pipeline(base, objetivos=(), opciones=()):
+    """Corre el pipeline completo con --profile sobre los datos de `base` en un proceso aparte
+
+    Parte de una salida vacía (sin estado del DAG ni caché de render) para que
+    cada corrida mida lo mismo. Devuelve la tabla resumen del perfil.
+    """
+    import shutil
+    from src.scripts.profiling import load_events, summary_table
+
+    raiz = Path(__file__).resolve().parents[2]
+    base = Path(base)
+    shutil.rmtree(base / "output", ignore_errors=True)
+    env = {**os.environ, "POBLACION_DATA_DIR": str(base), "POBLACION_OUTPUT_DIR": str(base / "output"),
+           "MPLBACKEND": "Agg"}
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.scripts.pipeline", "--forzar", "--profile", "--workers", "1", *opciones, *objetivos],
+        cwd=raiz, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        print(proc.stdout[-2000:], proc.stderr[-2000:])
+        raise RuntimeError(f"❌ El pipeline falló sobre {base}")
+    return summary_table(load_events(base / "output" / "profiles"))
+
+
+def bench_suite(escalas=(1, 10, 100), seed=42, cortes=0, objetivos=(), directorio=None, salida=None):
+    """Tiempo de cada etapa del pipeline sobre datos sintéticos a varias escalas, guardado en JSON
+
+    Cada escala corre en un proceso aparte apuntando POBLACION_DATA_DIR y
+    POBLACION_OUTPUT_DIR a un directorio temporal, con el perfilado activo.
+    """
+    import platform
+    from datetime import datetime
+    from src.config.settings import OUTPUT_DIR
+
+    rows = []
+    for escala in escalas:
+        print(f"\n🧪 Escala {escala}×: generando datos sintéticos")
+        inicio = time.perf_counter()
+        with _synthetic_base("sintetico", escala, seed, cortes, directorio) as (base, archivos):
+            rows.append({
+                "escala": escala, "etapa": "generar_sintetico", "categoria": "synthetic", "llamadas": 1,
+                "wall_s": round(time.perf_counter() - inicio, 3), "cpu_s": None, "memoria_pico_mb": None,
+                "filas": int(archivos["filas"].sum()), "mb_crudos": float(archivos["mb"].sum()),
+            })
+
+            resumen = profile_pipeline(base, objetivos)
+            for row in resumen.to_dict("records"):
+                rows.append({"escala": escala, **row})
+            print(resumen[resumen["categoria"] == "pipeline"].to_string(index=False))
+
+    result = pd.DataFrame(rows)
+    etapas = result[result["categoria"].isin(["pipeline", "synthetic"])]
+    tabla = etapas.pivot_table(index="etapa", columns="escala", values="wall_s")
+    if len(escalas) > 1:
+        # Exponente de escalamiento entre la escala menor y la mayor (~1 lineal)
+        lo, hi = min(escalas), max(escalas)
+        tabla["exponente"] = (np.log(tabla[hi] / tabla[lo]) / np.log(hi / lo)).round(2)
+    print("\n📈 Tiempo de pared (s) por etapa y escala:")
+    print(tabla.round(3).to_string())
+
+    salida = Path(salida) if salida else OUTPUT_DIR / "benchmarks" / f"suite_{datetime.now():%Y%m%d_%H%M%S}.json"
+    salida.parent.mkdir(parents=True, exist_ok=True)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump({
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+            "cortes": cortes,
+            "escalas": list(escalas),
+            "resultados": result.replace({np.nan: None}).to_dict("records"),
+        }, f, indent=1, ensure_ascii=False)
+    print(f"✅ Resultados guardados en {salida}")
+    return result
+
+
+def compare_paths(base, etapas, modos):
+    """Corre `etapas` con cada juego de opciones de `modos` y compara output/abstract byte a byte
+
+    El primer modo es la referencia. Devuelve la tabla de tiempo y memoria
+    pico por etapa y modo, y los archivos distintos o faltantes de cada modo.
+    """
+    import filecmp
+    import shutil
+
+    resultados, diferencias = {}, {}
+    referencia = archivos = None
+    for modo, opciones in modos.items():
+        resumen = profile_pipeline(base, etapas, opciones)
+        resultados[modo] = resumen[resumen["categoria"] == "pipeline"].set_index("etapa")
+        copia = base / f"abstract_{modo}"
+        shutil.rmtree(copia, ignore_errors=True)
+        shutil.copytree(base / "output" / "abstract", copia)
+        if referencia is None:
+            referencia, archivos = copia, sorted(p.name for p in copia.iterdir())
+        else:
+            _, distintos, faltantes = filecmp.cmpfiles(referencia, copia, archivos, shallow=False)
+            diferencias[modo] = distintos + faltantes
+
+    tabla = pd.concat(
+        {modo: r[["wall_s", "memoria_pico_mb"]] for modo, r in resultados.items()}, axis=1
+    ).reindex(etapas)
+    return tabla, diferencias, len(archivos)
+
+
+def bench_memory_budget(escala=10, budget="64MB", seed=42):
+    """Limpieza → exploración → resumen en memoria vs por particiones
+
+    Compara tiempo y memoria pico por etapa y verifica que las salidas del
+    resumen sean idénticas byte a byte.
+    """
+    etapas = ["clean_2025", "explorer_2025", "abstract"]
+    with _synthetic_base("memoria", escala, seed) as (base, _):
+        tabla, diferencias, n_archivos = compare_paths(
+            base, etapas, {"memoria": (), "particiones": ("--memory-budget", budget)}
+        )
+
+    print(f"\n📊 Escala {escala}×, presupuesto {budget}:")
+    print(tabla.to_string())
+    if diferencias["particiones"]:
+        raise AssertionError(f"❌ Salidas distintas entre modos: {diferencias['particiones']}")
+    print(f"✅ {n_archivos} salidas idénticas byte a byte")
+    return tabla
+
+
+def bench_store(escala=10, consultas=20, seed=42):
+    """Consultas por municipio y groupbys: base SQLite indexada vs lectura completa del CSV"""
+    from src.scripts.cleaner import normalize_ine_2025
+    from src.scripts.store import groupby_sum, query, write_table
+
+    with _synthetic_base("store", escala, seed) as (base, _):
+        df = normalize_ine_2025(pd.read_csv(base / "raw" / "ine_2025.csv", encoding="latin1"))
+        csv_path, db_path = base / "ine_2025_prepared.csv", base / "poblacion.sqlite"
+        df.to_csv(csv_path, index=False, encoding="latin1")
+        inicio = time.perf_counter()
+        write_table(df, "ine_2025", fuente=csv_path, path=db_path)
+        print(f"🗄️ {len(df):,} filas escritas en SQLite en {time.perf_counter() - inicio:.2f} s")
+
+        rng = np.random.default_rng(seed)
+        municipios = rng.choice(df["clave_municipio"].unique(), size=consultas)
+        sql = ("SELECT seccion, padron_electoral FROM ine_2025 "
+               "WHERE clave_entidad = 14 AND clave_municipio = ? ORDER BY seccion")
+        plan = query("EXPLAIN QUERY PLAN " + sql, (int(municipios[0]),), path=db_path)
+        print(f"🧭 Plan: {' | '.join(plan['detail'])}")
+
+        def por_csv(m):
+            d = pd.read_csv(csv_path, encoding="latin1")
+            d = d[(d["clave_entidad"] == 14) & (d["clave_municipio"] == m)]
+            return d[["seccion", "padron_electoral"]].sort_values("seccion").reset_index(drop=True)
+
+        def por_sqlite(m):
+            return query(sql, (int(m),), path=db_path)
+
+        for m in municipios[:3]:
+            pd.testing.assert_frame_equal(por_csv(m), por_sqlite(m), check_dtype=False)
+
+        columnas = ["padron_hombres", "padron_mujeres", "padron_electoral"]
+        casos = {
+            "seccion_por_municipio": (
+                lambda: [por_csv(m) for m in municipios], lambda: [por_sqlite(m) for m in municipios], consultas
+            ),
+            "groupby_municipio": (
+                lambda: pd.read_csv(csv_path, encoding="latin1").groupby(["clave_municipio", "nombre_municipio"])[columnas].sum(),
+                lambda: groupby_sum("ine_2025", ["clave_municipio", "nombre_municipio"], columnas, path=db_path),
+                1
+            ),
+        }
+        rows = []
+        for caso, (csv_func, db_func, n) in casos.items():
+            ms_csv = _medir(csv_func) * 1000 / n
+            ms_db = _medir(db_func) * 1000 / n
+            rows.append({"caso": caso, "filas": len(df), "ms_csv": round(ms_csv, 2),
+                         "ms_sqlite": round(ms_db, 2), "aceleracion": round(ms_csv / ms_db, 1)})
+
+    result = pd.DataFrame(rows)
+    print(result.to_string(index=False))
+    return result
+
+
+def bench_backends(escala=10, seed=42, repeticiones=3):
+    """pandas vs Polars sobre la tabla nacional de secciones: resultados idénticos y tiempos"""
+    from src.scripts.backend import get_backend
+
+    with _synthetic_base("backend", escala, seed) as (base, _):
+        # Tabla nacional con encabezados normalizados (sin filtrar Jalisco)
+        path = base / "secciones.csv"
+        df = pd.read_csv(base / "raw" / "ine_2025.csv", encoding="latin1")
+        df.columns = df.columns.str.strip().str.replace(r"\s+", "_", regex=True).str.lower()
+        df.to_csv(path, index=False)
+        filas = len(df)
+        del df
+
+        llaves = ["clave_entidad", "clave_distrito", "clave_municipio"]
+        columnas = ["padron_hombres", "padron_mujeres", "padron_electoral", "lista_nominal"]
+        entidades = list(range(1, 33, 2))
+        operaciones = {
+            "read_csv": lambda be, d: be.read_csv(path),
+            "filter_in": lambda be, d: be.filter_in(d, {"clave_entidad": entidades, "clave_distrito": list(range(1, 11))}),
+            "groupby_sum": lambda be, d: be.groupby_sum(d, llaves, columnas),
+            "rank": lambda be, d: be.rank(d, "padron_electoral", by=["clave_entidad", "clave_municipio"]),
+            "value_counts": lambda be, d: be.value_counts(d, "padron_electoral"),
+            "histogram": lambda be, d: be.histogram(d, "padron_electoral", 100),
+            "write_csv": lambda be, d: be.write_csv(be.groupby_sum(d, llaves, columnas), base / f"salida_{be.nombre}.csv"),
+        }
+
+        backends = {nombre: get_backend(nombre) for nombre in ("pandas", "polars")}
+        tablas = {nombre: be.read_csv(path) for nombre, be in backends.items()}
+        rows = []
+        for op, func in operaciones.items():
+            resultados, tiempos = {}, {}
+            for nombre, be in backends.items():
+                tiempos[nombre] = _medir(func, be, tablas[nombre], repeticiones=repeticiones)
+                resultados[nombre] = func(be, tablas[nombre])
+            if op != "write_csv":
+                a, b = (
+                    r if isinstance(r, pd.Series) else backends[n].to_pandas(r).reset_index(drop=True)
+                    for n, r in resultados.items()
+                )
+                if isinstance(a, pd.Series):
+                    pd.testing.assert_series_equal(a, b, check_dtype=False, check_index_type=False)
+                else:
+                    pd.testing.assert_frame_equal(a, b, check_dtype=False)
+            rows.append({
+                "operacion": op, "filas": filas,
+                "ms_pandas": round(tiempos["pandas"] * 1000, 1),
+                "ms_polars": round(tiempos["polars"] * 1000, 1),
+                "aceleracion": round(tiempos["pandas"] / tiempos["polars"], 1),
+            })
+        hilos = backends["polars"].pl.thread_pool_size()
+
+    result = pd.DataFrame(rows)
+    print(f"\n🧵 Polars con {hilos} hilo(s); {os.cpu_count()} CPU(s)")
+    print(result.to_string(index=False))
+    print("✅ Resultados idénticos entre backends")
+    return result
+
+
+def bench_snapshots(escala=1, cortes=24, seed=42):
+    """Almacén de cortes: tamaño vs CSV, ingesta, reconstrucción exacta y series por sección"""
+    from src.scripts.padron_snapshots import LLAVE, ingest, reconstruct, series, storage_summary
+
+    with _synthetic_base("cortes", escala, seed, cortes) as (base, _):
+        archivos = _cortes_sinteticos(base)
+        almacen = base / "snapshots"
+
+        inicio = time.perf_counter()
+        ingest(archivos, almacen)
+        s_ingesta = time.perf_counter() - inicio
+        mb_csv = sum(p.stat().st_size for p in archivos) / 2**20
+        mb_almacen = storage_summary(almacen)["kb"].sum() / 1024 + (almacen / "secciones.csv").stat().st_size / 2**20
+
+        # Reconstrucción exacta del último corte y del más lejano a su base
+        for path in (archivos[-1], archivos[min(10, len(archivos) - 1)]):
+            corte = path.stem.replace("padron_", "")
+            original = pd.read_csv(path, encoding="latin1").sort_values(LLAVE).reset_index(drop=True)
+            pd.testing.assert_frame_equal(reconstruct(corte, almacen), original, check_dtype=False)
+        ms_reconstruir = _medir(reconstruct, archivos[-1].stem.replace("padron_", ""), almacen) * 1000
+
+        muestra = pd.read_csv(archivos[0], encoding="latin1", usecols=LLAVE).sample(100, random_state=seed)
+        ms_series = _medir(series, muestra, ["padron_electoral", "lista_nominal"], almacen) * 1000
+        serie = series(muestra, ["padron_electoral"], almacen)
+        esperado = pd.concat(
+            pd.read_csv(p, encoding="latin1").merge(muestra, on=LLAVE)[[*LLAVE, "padron_electoral"]]
+            for p in archivos
+        )
+        if serie["padron_electoral"].notna().sum() != len(esperado) or \
+                serie["padron_electoral"].sum() != esperado["padron_electoral"].sum():
+            raise AssertionError("❌ La serie por sección no coincide con los cortes")
+
+    result = pd.DataFrame([{
+        "cortes": cortes, "mb_csv": round(mb_csv, 2), "mb_almacen": round(mb_almacen, 2),
+        "compresion": round(mb_csv / mb_almacen, 1), "s_ingesta": round(s_ingesta, 2),
+        "ms_reconstruir": round(ms_reconstruir, 1), "ms_serie_100_secciones": round(ms_series, 1),
+    }])
+    print(result.to_string(index=False))
+    print("✅ Cortes y series reconstruidos exactamente")
+    return result
+
+
+def bench_delta(escala=1, seed=42, repeticiones=3):
+    """Comparación de dos cortes: sort-merge con numpy vs merge externo de pandas"""
+    from src.scripts.padron_delta import MEDIDA, compare_cuts, summarize, top_movers
+    from src.scripts.padron_snapshots import LLAVE
+
+    with _synthetic_base("delta", escala, seed, 2) as (base, _):
+        previo_path, actual_path = _cortes_sinteticos(base)
+        inicio = time.perf_counter()
+        previo = pd.read_csv(previo_path, encoding="latin1")
+        actual = pd.read_csv(actual_path, encoding="latin1")
+        s_lectura = time.perf_counter() - inicio
+
+        def completo():
+            cambios = compare_cuts(previo, actual)
+            top_movers(cambios)
+            summarize(cambios, previo, actual, "distrito")
+            summarize(cambios, previo, actual, "municipio")
+            return cambios
+
+        def ingenuo():
+            unido = previo.merge(actual, on=LLAVE, how="outer", suffixes=("_p", "_a"), indicator=True)
+            unido["delta"] = unido[f"{MEDIDA}_a"].fillna(0) - unido[f"{MEDIDA}_p"].fillna(0)
+            return unido
+
+        ms_delta = _medir(compare_cuts, previo, actual, repeticiones=repeticiones) * 1000
+        ms_completo = _medir(completo, repeticiones=repeticiones) * 1000
+        ms_merge = _medir(ingenuo, repeticiones=repeticiones) * 1000
+
+        cambios, unido = completo(), ingenuo()
+        estados = cambios["estado"].value_counts()
+        if estados.get("alta", 0) != (unido["_merge"] == "right_only").sum() or \
+                estados.get("baja", 0) != (unido["_merge"] == "left_only").sum() or \
+                cambios[f"delta_{MEDIDA}"].sum() != unido["delta"].sum():
+            raise AssertionError("❌ Los cambios no coinciden con el merge de pandas")
+
+    result = pd.DataFrame([{
+        "secciones": len(actual), "filas_cambio": len(cambios), "altas": int(estados.get("alta", 0)),
+        "bajas": int(estados.get("baja", 0)), "s_lectura": round(s_lectura, 2),
+        "ms_delta": round(ms_delta, 1), "ms_merge_pandas": round(ms_merge, 1),
+        "ms_con_resumenes": round(ms_completo, 1),
+    }])
+    print(result.to_string(index=False))
+    print("✅ Altas, bajas y deltas coinciden con el merge de pandas")
+    return result
+
+
+def bench_crosswalk(escala=1, seed=42, repeticiones=3, fraccion=0.1):
+    """Equivalencias entre años: reparto disperso vs merge/groupby por sección con pandas"""
+    from src.scripts.crosswalk import DISTRITO, SECCION, allocation_from_tables, harmonize
+
+    with _synthetic_base("crosswalk", escala, seed, 1) as (base, _):
+        corte = _cortes_sinteticos(base)[0]
+        secciones = pd.read_csv(corte, encoding="latin1")
+    destino = secciones[[*SECCION, "clave_distrito"]].assign(peso=1.0)
+    pesos = secciones.groupby(SECCION)["padron_electoral"].sum().astype("float64")
+
+    # Redistritación simulada: una fracción de secciones pasa al distrito vecino
+    rng = np.random.default_rng(seed)
+    origen = destino.copy()
+    mover = rng.random(len(origen)) < fraccion
+    maximo = origen.groupby("clave_entidad")["clave_distrito"].transform("max")
+    origen.loc[mover, "clave_distrito"] = origen.loc[mover, "clave_distrito"] % maximo[mover] + 1
+    medidas = (
+        origen.assign(padron=pesos.reindex(pd.MultiIndex.from_frame(origen[SECCION])).to_numpy())
+        .groupby(DISTRITO, as_index=False)["padron"].sum()
+        .rename(columns={"clave_entidad": "entidad", "clave_distrito": "distrito_cod"})
+    )
+    medidas["otra"] = rng.integers(1_000, 100_000, len(medidas))
+
+    def por_pandas():
+        # Fracción de cada distrito origen en cada destino, con merges y groupbys por sección
+        w = origen.merge(pesos.rename("w").reset_index(), on=SECCION, how="left")
+        traslape = w.merge(destino, on=SECCION, suffixes=("_o", "_d")).assign(
+            w=lambda d: d["w"] * d["peso_o"] * d["peso_d"]
+        ).groupby(["clave_entidad", "clave_distrito_o", "clave_distrito_d"], as_index=False)["w"].sum()
+        traslape["w"] /= traslape.groupby(["clave_entidad", "clave_distrito_o"])["w"].transform("sum")
+        unido = traslape.merge(medidas, left_on=["clave_entidad", "clave_distrito_o"], right_on=["entidad", "distrito_cod"])
+        for col in ("padron", "otra"):
+            unido[col] = unido[col] * unido["w"]
+        return unido.groupby(["clave_entidad", "clave_distrito_d"])[["padron", "otra"]].sum()
+
+    ms_construir = _medir(allocation_from_tables, origen, destino, pesos, repeticiones=repeticiones) * 1000
+    reparto = allocation_from_tables(origen, destino, pesos)
+    matriz = reparto[0]
+    valores = medidas[["padron", "otra"]].to_numpy(float)
+    ms_producto = _medir(lambda: matriz.T @ valores, repeticiones=repeticiones) * 1000
+    ms_pandas = _medir(por_pandas, repeticiones=repeticiones) * 1000
+
+    armonizado = harmonize(medidas, "sintetico", ["padron", "otra"], reparto=reparto)
+    esperado = por_pandas()
+    por_entidad = medidas.groupby("entidad")[["padron", "otra"]].sum()
+    if not armonizado.groupby("entidad")[["padron", "otra"]].sum().equals(por_entidad) or \
+            not np.allclose(armonizado.set_index(["entidad", "distrito_cod"]).to_numpy(float), esperado.to_numpy(), atol=1):
+        raise AssertionError("❌ El reparto disperso no conserva los totales o no coincide con el de pandas")
+
+    # Un total y sus componentes: el total sale de los componentes redondeados
+    partes = medidas.assign(a=medidas["otra"] // 3, b=medidas["otra"] - medidas["otra"] // 3)
+    conjunto = harmonize(partes, "sintetico", ["otra", "a", "b"], reparto=reparto, sumas={"otra": ["a", "b"]})
+    if not (conjunto["a"] + conjunto["b"]).equals(conjunto["otra"]) or \
+            not conjunto.groupby("entidad")["otra"].sum().equals(por_entidad["otra"]):
+        raise AssertionError("❌ El total armonizado no es la suma de sus componentes")
+
+    # Filas sin distrito en el reparto: se excluyen en vez de mezclarse con la geografía destino
+    huerfana = medidas.iloc[:1].assign(distrito_cod=999)
+    excluido = harmonize(pd.concat([medidas, huerfana]), "sintetico", ["padron", "otra"], reparto=reparto)
+    if not excluido.equals(armonizado):
+        raise AssertionError("❌ Una fila sin reparto quedó mezclada con los distritos destino")
+
+    result = pd.DataFrame([{
+        "secciones": len(destino), "distritos": len(medidas), "no_ceros": matriz.nnz,
+        "ms_construir": round(ms_construir, 1), "ms_reagregar": round(ms_producto, 3),
+        "ms_pandas": round(ms_pandas, 1),
+    }])
+    print(result.to_string(index=False))
+    print("✅ Totales por entidad exactos e iguales al reparto con pandas")
+    return result
+
+
+def bench_hierarchy(escala=1, seed=42, repeticiones=3):
+    """Agregados por municipio, distrito y entidad: producto por incidencia vs un groupby por nivel"""
+    import pickle
+    from src.scripts.hierarchy import MEDIDAS, NIVELES, build_hierarchy, rollup
+
+    with _synthetic_base("jerarquia", escala, seed, 1) as (base, _):
+        corte = _cortes_sinteticos(base)[0]
+        df = pd.read_csv(corte, encoding="latin1")
+
+        def por_groupby():
+            return {nivel: df.groupby(claves, as_index=False)[MEDIDAS].sum() for nivel, claves in NIVELES.items()}
+
+        jerarquia = build_hierarchy(df)
+        ms_groupby = _medir(por_groupby, repeticiones=repeticiones) * 1000
+        ms_construir = _medir(build_hierarchy, df, repeticiones=repeticiones) * 1000
+        ms_producto = _medir(rollup, df, jerarquia=jerarquia, repeticiones=repeticiones) * 1000
+
+        cache = base / "rollups.pkl"
+        with open(cache, "wb") as f:
+            pickle.dump(rollup(df, jerarquia=jerarquia), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def desde_cache():
+            with open(cache, "rb") as f:
+                return pickle.load(f)
+
+        ms_cache = _medir(desde_cache, repeticiones=repeticiones) * 1000
+
+        esperado, obtenido = por_groupby(), rollup(df, jerarquia=jerarquia)
+        for nivel, claves in NIVELES.items():
+            pd.testing.assert_frame_equal(obtenido[nivel][claves + MEDIDAS], esperado[nivel], check_dtype=False)
+
+    result = pd.DataFrame([{
+        "secciones": len(df), "grupos": jerarquia[0][1], "medidas": len(MEDIDAS),
+        "ms_groupbys": round(ms_groupby, 1), "ms_construir_H": round(ms_construir, 1),
+        "ms_producto": round(ms_producto, 1), "ms_cache": round(ms_cache, 2),
+    }])
+    print(result.to_string(index=False))
+    print("✅ Agregados idénticos a los groupbys por nivel")
+    return result
+
+
+def bench_constraints(escala=1, seed=42, repeticiones=3, fallas=25):
+    """Reglas de calidad sobre el padrón nacional: costo frente a la lectura y conteos exactos"""
+    from src.scripts.constraints import REGLAS, check, combine
+
+    with _synthetic_base("calidad", escala, seed, 1) as (base, _):
+        corte = _cortes_sinteticos(base)[0]
+        s_lectura = _medir(pd.read_csv, corte, encoding="latin1", repeticiones=1)
+        df = pd.read_csv(corte, encoding="latin1")
+
+    # Fallas conocidas: una sección con lista mayor al padrón y otra con suma por sexo rota
+    rng = np.random.default_rng(seed)
+    lista, suma = (rng.choice(len(df), size=(2, fallas), replace=False))
+    df.loc[lista, "lista_nominal"] = df.loc[lista, "padron_electoral"] + 1
+    df.loc[suma, "padron_electoral"] += 1
+    # Lista > padrón también rompe la suma de la lista; la suma rota del padrón cumple lista <= padrón
+    esperado = {"suma_padron": fallas, "lista_menor_padron": fallas, "suma_lista": fallas}
+
+    ms_reglas = _medir(check, df, "ine_2025", repeticiones=repeticiones) * 1000
+    resumen, muestras = check(df, "ine_2025")
+    violaciones = resumen.set_index("regla")["violaciones"]
+    for regla, n in esperado.items():
+        if violaciones[regla] != n:
+            raise AssertionError(f"❌ {regla}: {violaciones[regla]} violaciones, se esperaban {n}")
+
+    # Por particiones: mismo resultado
+    particiones = np.array_split(np.arange(len(df)), 8)
+    por_partes, _ = combine([check(df.iloc[p], "ine_2025", inicio=p[0]) for p in particiones])
+    if not por_partes["violaciones"].equals(resumen["violaciones"]):
+        raise AssertionError("❌ Las particiones no suman las mismas violaciones")
+
+    result = pd.DataFrame([{
+        "secciones": len(df), "reglas": len(REGLAS["ine_2025"]), "violaciones": int(violaciones.sum()),
+        "ms_reglas": round(ms_reglas, 1), "ms_lectura": round(s_lectura * 1000, 1),
+        "costo_vs_lectura_%": round(ms_reglas / (s_lectura * 1000) * 100, 1),
+    }])
+    print(result.to_string(index=False))
+    print("✅ Violaciones exactas, también por particiones")
+    return result
+
+
+def bench_anomalies(escala=1, seed=42, repeticiones=3, inyectadas=20):
+    """Secciones atípicas sobre el padrón nacional: tiempo y detección de anomalías inyectadas"""
+    from src.scripts.anomalies import LLAVE, MIN_PADRON, detect
+
+    with _synthetic_base("anomalias", escala, seed, 2) as (base, _):
+        previo_path, actual_path = _cortes_sinteticos(base)
+        previo = pd.read_csv(previo_path, encoding="latin1")
+        actual = pd.read_csv(actual_path, encoding="latin1")
+
+    # Anomalías conocidas en secciones calificables: razón de sexos, cobertura y salto del padrón
+    rng = np.random.default_rng(seed)
+    candidatas = np.flatnonzero((actual["seccion"] > 0) & (actual["padron_electoral"] >= 4 * MIN_PADRON))
+    sexo, lista, salto = rng.choice(candidatas, size=(3, inyectadas), replace=False)
+    actual.loc[sexo, "padron_hombres"] *= 3
+    actual.loc[lista, "lista_hombres"] = actual.loc[lista, "lista_hombres"] // 3
+    actual.loc[salto, ["padron_hombres", "padron_mujeres"]] *= 2
+    for parte in ("padron", "lista"):
+        total = "padron_electoral" if parte == "padron" else "lista_nominal"
+        actual[total] = actual[[f"{parte}_hombres", f"{parte}_mujeres", f"{parte}_nobinario"]].sum(axis=1)
+
+    ms_deteccion = _medir(detect, actual, previo, repeticiones=repeticiones) * 1000
+    atipicas = detect(actual, previo)
+    marcadas = set(map(tuple, atipicas[LLAVE].to_numpy()))
+    detectadas = {
+        senal: sum(tuple(fila) in marcadas for fila in actual.loc[idx, LLAVE].to_numpy())
+        for senal, idx in (("razon_sexo", sexo), ("cobertura_lista", lista), ("cambio_padron_%", salto))
+    }
+    if min(detectadas.values()) < inyectadas:
+        raise AssertionError(f"❌ Anomalías inyectadas sin detectar: {detectadas}")
+
+    result = pd.DataFrame([{
+        "secciones": len(actual), "atipicas": len(atipicas), "inyectadas": 3 * inyectadas,
+        "detectadas": sum(detectadas.values()), "ms_deteccion": round(ms_deteccion, 1),
+    }])
+    print(result.to_string(index=False))
+    print("✅ Todas las anomalías inyectadas quedaron marcadas")
+    return result
+
+
+# Caso de la línea de comandos → benchmark con sus argumentos
+CASOS = {
+    "historico": lambda args: bench_build_historical(cadence=args.cadencia),
+    "importacion": lambda args: bench_import_time(),
+    "perfiles": lambda args: bench_render_profiles(n_graficos=args.graficos),
+    "configuracion": lambda args: bench_settings_import(),
+    "suite": lambda args: bench_suite(escalas=args.escalas, cortes=args.cortes, objetivos=args.etapas, salida=args.salida),
+    "memoria": lambda args: bench_memory_budget(escala=args.escalas[0], budget=args.memory_budget),
+    "sqlite": lambda args: bench_store(escala=args.escalas[0]),
+    "backends": lambda args: bench_backends(escala=args.escalas[0]),
+    "cortes": lambda args: bench_snapshots(escala=args.escalas[0], cortes=args.cortes or 24),
+    "delta": lambda args: bench_delta(escala=args.escalas[0]),
+    "crosswalk": lambda args: bench_crosswalk(escala=args.escalas[0]),
+    "jerarquia": lambda args: bench_hierarchy(escala=args.escalas[0]),
+    "calidad": lambda args: bench_constraints(escala=args.escalas[0]),
+    "anomalias": lambda args: bench_anomalies(escala=args.escalas[0]),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento del pipeline")
+    parser.add_argument(
+        "--caso",
+        required=True,
+        choices=CASOS.keys(),
+        help="Benchmark a ejecutar"
+    )
+    parser.add_argument(
+        "--graficos",
+        type=int,
+        default=100,
+        help="Gráficos por perfil en el benchmark de perfiles de render"
+    )
+    parser.add_argument(
+        "--cadencia",
+        default="anual",
+        choices=["anual", "mensual"],
+        help="Cadencia de la serie histórica"
+    )
+    parser.add_argument(
+        "--escalas",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Escalas de datos sintéticos para la suite (1 = tamaño nacional)"
+    )
+    parser.add_argument(
+        "--cortes",
+        type=int,
+        default=0,
+        help="Cortes mensuales del padrón a generar en la suite"
+    )
+    parser.add_argument(
+        "--etapas",
+        nargs="*",
+        default=[],
+        help="Etapas del pipeline a medir en la suite (por defecto, todas)"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        default="64MB",
+        help="Presupuesto de memoria del caso memoria"
+    )
+    parser.add_argument(
+        "--salida",
+        default=None,
+        help="Archivo JSON de resultados de la suite"
+    )
+    args = parser.parse_args()
+
+    CASOS[args.caso](args)
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,12 @@ from src.config.settings import (
     PATHS,
     REGION_CONFIG
 )
+from src.scripts.constraints import MODOS, gate, set_quality_mode
+from src.scripts.out_of_core import memory_budget, set_memory_budget
+from src.scripts.profiling import add_rows, profiled
+from src.scripts.store import enable_store, store_prepared
+
+@profiled()
 def clean_eige_2015(raw_path, prepared_path):
     """Limpieza y preparación de datos Encuesta Intercensal Geoelectoral 2015"""
 
@@ -31,6 +37,7 @@ def clean_eige_2015(raw_path, prepared_path):
         usecols=lambda col: col.strip().lower() in desired,
         encoding="utf-8-sig"
     )
+    add_rows(len(df))
 
     # Normalizar nombres a minúsculas y sin espacios
     df.columns = df.columns.str.strip().str.lower()
@@ -58,10 +65,15 @@ def clean_eige_2015(raw_path, prepared_path):
     # Filtrar solo Jalisco (entidad = 14)
     df = df[df["entidad"] == 14]
 
+    # Reglas de calidad antes de guardar (ver constraints.py)
+    gate(df, "eige_2015")
+
     # Guardar dataset preparado
     df.to_csv(prepared_path, index=False)
+    store_prepared(df, "eige_2015", prepared_path)
     print(f"✅ eige_2015 preparado en {prepared_path}")
 
+@profiled()
 def clean_ine_2020(raw_path, prepared_path):
     cfg = {
         "usecols": [
@@ -81,6 +93,7 @@ def clean_ine_2020(raw_path, prepared_path):
         }
     }
     df = pd.read_csv(raw_path, usecols=cfg["usecols"], encoding="utf-8-sig")
+    add_rows(len(df))
     df = df.rename(columns=cfg["col_map"])
     df.columns = df.columns.str.lower()
     df = df[df["entidad"] == 14]
@@ -91,12 +104,14 @@ def clean_ine_2020(raw_path, prepared_path):
         "entidad", "distrito_cod", "tiene_ine",
         "p_0a17", "p_18ymas", "hombres_18+", "mujeres_18+"
     ]
+    gate(df[cols_finales], "ine_2020")
     df[cols_finales].to_csv(prepared_path, index=False)
+    store_prepared(df[cols_finales], "ine_2020", prepared_path)
     print(f"✅ ine_2020 preparado en {prepared_path}")
 
 
-def clean_ine_2025(raw_path, prepared_path):
-    df = pd.read_csv(raw_path, encoding="latin1")
+def normalize_ine_2025(df):
+    """Normaliza encabezados y textos del padrón 2025 y filtra Jalisco"""
     # normalizar nombres
     df.columns = (
         df.columns
@@ -111,7 +126,23 @@ def clean_ine_2025(raw_path, prepared_path):
     df = df.apply(lambda s: s.str.strip() if s.dtype == "object" else s)
     # cabecera distrital
     df['cabecera_distrital'] = df['cabecera_distrital'].str.replace(r'\s+', ' ', regex=True)
-    df.to_csv(prepared_path, index=False, encoding="latin1")
+    return df
+
+
+@profiled()
+def clean_ine_2025(raw_path, prepared_path):
+    budget = memory_budget()
+    if budget:
+        # Padrón nacional por particiones (ver out_of_core.py)
+        from src.scripts.out_of_core import clean_ine_2025_partitioned
+        clean_ine_2025_partitioned(raw_path, prepared_path, budget)
+    else:
+        df = pd.read_csv(raw_path, encoding="latin1")
+        add_rows(len(df))
+        df = normalize_ine_2025(df)
+        gate(df, "ine_2025")
+        df.to_csv(prepared_path, index=False, encoding="latin1")
+        store_prepared(df, "ine_2025", prepared_path)
     print(f"✅ ine_2025 preparado en {prepared_path}")
 
 
@@ -125,7 +156,26 @@ def main():
         choices=PATHS.keys(),
         help="Nombre del dataset a procesar (p.ej. eige_2015)"
     )
+    parser.add_argument(
+        "--memory-budget",
+        default=None,
+        help="Memoria máxima por partición, p.ej. 512MB (procesa el padrón por partes)"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Guarda también la tabla preparada en la base embebida (SQLite)"
+    )
+    parser.add_argument(
+        "--calidad",
+        choices=MODOS,
+        default=None,
+        help="Reglas de calidad: avisar (por defecto), estricto (detiene si fallan) u omitir"
+    )
     args = parser.parse_args()
+    set_memory_budget(args.memory_budget)
+    enable_store(args.store)
+    set_quality_mode(args.calidad)
 
     paths = PATHS[args.dataset]
     raw_path      = paths["raw"]
@@ -138,6 +188,7 @@ def main():
         "ine_2025": clean_ine_2025
     }
 
+    prepared_path.parent.mkdir(parents=True, exist_ok=True)
     try:
         dispatch_map[args.dataset](raw_path, prepared_path)
     except KeyError:
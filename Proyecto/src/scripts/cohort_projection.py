@@ -0,0 +1,156 @@
+# Proyección por componentes demográficos (cohortes) por distrito
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.config.settings import (
+    ABSTRACT_DIR,
+    PATHS,
+    REGION_CONFIG
+)
+from src.scripts.abstract import aplicar_filtros
+
+# Grupos de edad de la EIGE 2015 (el último es abierto)
+GRUPOS_EDAD = ["0a9", "10a19", "20a29", "30a39", "40a49", "50a59", "60ymas"]
+ANCHO_GRUPO = 10
+
+# Supervivencia anual supuesta por grupo de edad
+SUPERVIVENCIA_ANUAL = np.array([0.9985, 0.9993, 0.9988, 0.9983, 0.9970, 0.9940, 0.9600])
+
+# Peso de cada grupo como población en edad reproductiva
+PESO_REPRODUCTIVO = np.array([0.0, 0.0, 1.0, 1.0, 0.5, 0.0, 0.0])
+
+# Fracción de cada grupo con 18 años o más (edades uniformes dentro del grupo)
+FRACCION_ADULTA = np.array([0.0, 0.2, 1.0, 1.0, 1.0, 1.0, 1.0])
+
+ANIO_BASE = 2015
+
+
+def poblacion_base_2015():
+    """Matriz distrito × grupo de edad con población absoluta de 2015"""
+    df = pd.read_csv(PATHS["eige_2015"]["prepared"]).sort_values("distrito_cod")
+    porcentajes = df[[f"porc_{g}" for g in GRUPOS_EDAD]].to_numpy(dtype=float)
+    # Repartir la edad no especificada proporcionalmente
+    porcentajes = porcentajes / porcentajes.sum(axis=1, keepdims=True)
+    # pob_total (ind_806) cuenta sólo 18+; se recupera el total con porc_18ymas
+    total = df["pob_total"].to_numpy(dtype=float) / (df["porc_18ymas"].to_numpy(dtype=float) / 100)
+    base = porcentajes * total[:, None]
+    return df["distrito_cod"].to_numpy(), base
+
+
+def matrices_transicion(base, supervivencia=SUPERVIVENCIA_ANUAL, migracion=None):
+    """Matrices tipo Leslie (distrito × grupo × grupo) para un paso anual
+
+    Cada año una décima parte de cada grupo pasa al siguiente y el resto
+    permanece; la natalidad de cada distrito se calibra para sostener el
+    tamaño observado del grupo 0a9 en el año base.
+    """
+    n_dist, n_grp = base.shape
+    T = np.zeros((n_dist, n_grp, n_grp))
+    grupos = np.arange(n_grp - 1)
+    T[:, grupos, grupos] = supervivencia[:-1] * (1 - 1 / ANCHO_GRUPO)
+    T[:, grupos + 1, grupos] = supervivencia[:-1] / ANCHO_GRUPO
+    T[:, -1, -1] = supervivencia[-1]
+
+    # Nacimientos: reponen la fracción del grupo 0a9 que sale cada año
+    reproductiva = base @ PESO_REPRODUCTIVO
+    natalidad = np.divide(
+        base[:, 0] / ANCHO_GRUPO, reproductiva,
+        out=np.zeros(n_dist), where=reproductiva > 0
+    )
+    T[:, 0, :] += natalidad[:, None] * PESO_REPRODUCTIVO[None, :]
+
+    # Migración neta como factor anual uniforme por distrito
+    if migracion is not None:
+        T *= migracion[:, None, None]
+    return T
+
+
+def proyectar_cohortes(base, T, anios):
+    """Aplica las transiciones de todos los distritos a la vez (años × distrito × grupo)"""
+    estados = np.empty((anios + 1, *base.shape))
+    estados[0] = base
+    for t in range(anios):
+        estados[t + 1] = np.einsum("dij,dj->di", T, estados[t])
+    return estados
+
+
+def calibrar_migracion_2020(distritos, base, supervivencia=SUPERVIVENCIA_ANUAL):
+    """Factor anual de migración neta que reproduce la población 2020 del censo"""
+    df = pd.read_csv(PATHS["ine_2020"]["prepared"])
+    observado = (
+        df.assign(pob_total=df["p_0a17"] + df["p_18ymas"])
+          .groupby("distrito_cod")["pob_total"].sum()
+          .reindex(distritos)
+          .to_numpy(dtype=float)
+    )
+    proyectado = proyectar_cohortes(base, matrices_transicion(base, supervivencia), 5)[-1].sum(axis=1)
+    factor = np.where(np.isfinite(observado) & (proyectado > 0), observado / proyectado, 1.0)
+    return factor ** (1 / 5)
+
+
+def tabla_proyeccion(distritos, estados, anio_base=ANIO_BASE):
+    """Formato largo: una fila por distrito y año con grupos, total y 18+"""
+    n_anios, n_dist, _ = estados.shape
+    df = pd.DataFrame(
+        estados.reshape(n_anios * n_dist, -1).round().astype("int64"),
+        columns=[f"pob_{g}" for g in GRUPOS_EDAD]
+    )
+    df.insert(0, "distrito_cod", np.tile(distritos, n_anios))
+    df.insert(0, "AÑO", np.repeat(np.arange(anio_base, anio_base + n_anios), n_dist))
+    df["POB_TOT"] = np.round(estados.sum(axis=2)).astype("int64").ravel()
+    df["POB_18YMAS"] = np.round(estados @ FRACCION_ADULTA).astype("int64").ravel()
+    return df
+
+
+def resumen_regiones(df):
+    """Población 18+ proyectada para Jalisco, ZMG y GDL"""
+    frames = []
+    for region, filtros in REGION_CONFIG["2015"].items():
+        filtros = {k: v for k, v in filtros.items() if k == "distrito_cod"}
+        sub = aplicar_filtros(df, filtros)
+        agg = sub.groupby("AÑO", as_index=False)[["POB_TOT", "POB_18YMAS"]].sum()
+        agg.insert(0, "REGIÓN", region)
+        frames.append(agg)
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Proyección por cohortes de edad por distrito"
+    )
+    parser.add_argument(
+        "--hasta",
+        type=int,
+        default=2035,
+        help="Último año de la proyección"
+    )
+    parser.add_argument(
+        "--sin-migracion",
+        action="store_true",
+        help="No calibrar migración neta con el censo 2020"
+    )
+    args = parser.parse_args()
+
+    print("🔍 Cargando estructura por edad EIGE 2015...")
+    distritos, base = poblacion_base_2015()
+
+    inicio = time.perf_counter()
+    migracion = None if args.sin_migracion else calibrar_migracion_2020(distritos, base)
+    T = matrices_transicion(base, migracion=migracion)
+    estados = proyectar_cohortes(base, T, args.hasta - ANIO_BASE)
+    transcurrido = time.perf_counter() - inicio
+    print(f"⏱️ {len(distritos)} distritos proyectados {ANIO_BASE}-{args.hasta} en {transcurrido*1000:.1f} ms")
+
+    df = tabla_proyeccion(distritos, estados)
+    ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    df.to_csv(ABSTRACT_DIR / "proyeccion_cohortes_distrito.csv", index=False)
+    regiones = resumen_regiones(df)
+    regiones.to_csv(ABSTRACT_DIR / "proyeccion_cohortes_regiones.csv", index=False)
+    print(regiones[regiones["AÑO"].isin([2015, 2020, 2025, args.hasta])].to_string(index=False))
+    print(f"✅ Proyección por cohortes guardada en {ABSTRACT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
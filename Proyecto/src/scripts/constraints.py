@@ -0,0 +1,178 @@
+# Reglas de calidad de datos evaluadas sobre columnas completas
+#
+# Cada dataset declara sus reglas como expresiones de pandas (`DataFrame.eval`)
+# que deben cumplirse fila por fila. Cada regla se evalúa vectorizada sobre la
+# tabla completa (o partición por partición) y produce el número de filas que
+# la violan y una muestra de ellas. Los limpiadores llaman a `gate` antes de
+# escribir el dataset preparado; el modo se elige con `--calidad` o
+# POBLACION_CALIDAD (que heredan los procesos hijos):
+#
+#   avisar    informa las violaciones y continúa (por defecto)
+#   estricto  detiene la limpieza si alguna regla falla
+#   omitir    no evalúa las reglas
+#
+# El resumen y las muestras se guardan en output/calidad/.
+
+import argparse
+import os
+import re
+import pandas as pd
+from src.config.settings import PATHS, QUALITY_DIR
+
+CALIDAD_ENV = "POBLACION_CALIDAD"
+MODOS = ("avisar", "estricto", "omitir")
+MUESTRA = 5
+
+# Nombres con caracteres especiales van entre comillas invertidas (`hombres_18+`)
+REGLAS = {
+    "eige_2015": {
+        "distrito_valido": "distrito_cod > 0",
+        "poblacion_no_negativa": "pob_total >= 0 and `hombres_18+` >= 0 and `mujeres_18+` >= 0",
+        "adultos_menor_poblacion": "`hombres_18+` + `mujeres_18+` <= pob_total",
+        "porcentaje_adultos": "porc_18ymas >= 0 and porc_18ymas <= 100",
+        "grupos_edad_suman_100": (
+            "abs(porc_0a9 + porc_10a19 + porc_20a29 + porc_30a39 + porc_40a49"
+            " + porc_50a59 + porc_60ymas + porc_edadne - 100) <= 0.5"
+        ),
+    },
+    "ine_2020": {
+        "distrito_valido": "distrito_cod > 0",
+        "tiene_ine_no_negativo": "tiene_ine >= 0",
+        "adultos_por_sexo": "`hombres_18+` + `mujeres_18+` == p_18ymas",
+        "conteos_no_negativos": "p_0a17 >= 0 and p_18ymas >= 0",
+    },
+    "ine_2025": {
+        "suma_padron": "padron_hombres + padron_mujeres + padron_nobinario == padron_electoral",
+        "suma_lista": "lista_hombres + lista_mujeres + lista_nobinario == lista_nominal",
+        "lista_menor_padron": "lista_nominal <= padron_electoral",
+        "lista_por_sexo_menor_padron": (
+            "lista_hombres <= padron_hombres and lista_mujeres <= padron_mujeres"
+        ),
+        "conteos_no_negativos": (
+            "padron_hombres >= 0 and padron_mujeres >= 0 and padron_nobinario >= 0"
+            " and lista_hombres >= 0 and lista_mujeres >= 0 and lista_nobinario >= 0"
+        ),
+    },
+}
+
+# Columnas que identifican cada fila en las muestras
+LLAVES = {
+    "eige_2015": ["entidad", "distrito_cod"],
+    "ine_2020": ["entidad", "distrito_cod"],
+    "ine_2025": ["clave_entidad", "clave_distrito", "clave_municipio", "seccion"],
+}
+
+_NOMBRE = re.compile(r"`([^`]+)`|\b([A-Za-z_]\w*)\b")
+_PALABRAS = {"abs", "and", "or", "not"}
+
+
+def set_quality_mode(modo):
+    """Elige el modo de la compuerta en este proceso y sus hijos (None no cambia nada)"""
+    if modo:
+        if modo not in MODOS:
+            raise ValueError(f"❌ Modo de calidad desconocido: {modo} (opciones: {', '.join(MODOS)})")
+        os.environ[CALIDAD_ENV] = modo
+
+
+def quality_mode():
+    return os.environ.get(CALIDAD_ENV) or "avisar"
+
+
+def rule_columns(expresion):
+    """Nombres de columna que aparecen en una expresión"""
+    return [c for c in dict.fromkeys(a or b for a, b in _NOMBRE.findall(expresion)) if c not in _PALABRAS]
+
+
+def check(df, dataset, reglas=None, inicio=0):
+    """Evalúa las reglas sobre `df`: (resumen por regla, muestra de filas que fallan)
+
+    `inicio` desplaza el número de fila reportado (para particiones).
+    """
+    reglas = REGLAS[dataset] if reglas is None else reglas
+    llaves = [c for c in LLAVES.get(dataset, []) if c in df.columns]
+    resumen, muestras = [], []
+    for nombre, expresion in reglas.items():
+        columnas = rule_columns(expresion)
+        if set(columnas) - set(df.columns):
+            resumen.append({"regla": nombre, "expresion": expresion, "filas": len(df),
+                            "violaciones": 0, "estado": "omitida"})
+            continue
+        # Los nulos tampoco cumplen la regla
+        cumple = df.eval(expresion).fillna(False).to_numpy(bool)
+        violaciones = int((~cumple).sum())
+        resumen.append({"regla": nombre, "expresion": expresion, "filas": len(df),
+                        "violaciones": violaciones, "estado": "falla" if violaciones else "ok"})
+        if violaciones:
+            muestra = df.loc[~cumple, llaves + [c for c in columnas if c not in llaves]].head(MUESTRA)
+            posiciones = (~cumple).nonzero()[0][:MUESTRA] + inicio
+            muestras.append(muestra.assign(regla=nombre, fila=posiciones))
+    resumen = pd.DataFrame(resumen)
+    muestras = pd.concat(muestras, ignore_index=True) if muestras else pd.DataFrame(columns=["regla", "fila"])
+    return resumen, muestras
+
+
+def combine(resultados):
+    """Une los resultados de varias particiones (suma violaciones, conserva la primera muestra)"""
+    resumenes, muestras = zip(*resultados)
+    resumen = pd.concat(resumenes, ignore_index=True)
+    estado = resumen.groupby("regla", sort=False)["estado"].agg(
+        lambda e: "omitida" if (e == "omitida").all() else ("falla" if (e == "falla").any() else "ok")
+    )
+    resumen = resumen.groupby(["regla", "expresion"], sort=False, as_index=False)[["filas", "violaciones"]].sum()
+    resumen["estado"] = resumen["regla"].map(estado)
+    muestras = [m for m in muestras if len(m)]
+    muestras = pd.concat(muestras, ignore_index=True).groupby("regla", sort=False).head(MUESTRA) if muestras else muestras
+    return resumen, (muestras if len(muestras) else pd.DataFrame(columns=["regla", "fila"]))
+
+
+def enforce(resultado, dataset, modo=None):
+    """Informa y guarda el resultado; en modo estricto lanza ValueError si alguna regla falla"""
+    resumen, muestras = resultado
+    modo = modo or quality_mode()
+    QUALITY_DIR.mkdir(parents=True, exist_ok=True)
+    resumen.to_csv(QUALITY_DIR / f"calidad_{dataset}.csv", index=False)
+    muestras.to_csv(QUALITY_DIR / f"calidad_{dataset}_muestras.csv", index=False)
+
+    fallas = resumen[resumen["estado"] == "falla"]
+    for r in resumen.itertuples():
+        icono = {"ok": "✔️", "falla": "❌" if modo == "estricto" else "⚠️", "omitida": "➖"}[r.estado]
+        detalle = f"{r.violaciones:,} de {r.filas:,} filas" if r.estado != "omitida" else "columnas ausentes"
+        print(f"{icono} Calidad {dataset}/{r.regla}: {detalle}")
+    if len(fallas) and modo == "estricto":
+        raise ValueError(
+            f"❌ {dataset} no cumple {len(fallas)} regla(s) de calidad: {', '.join(fallas['regla'])} "
+            f"(muestras en {QUALITY_DIR / f'calidad_{dataset}_muestras.csv'})"
+        )
+    return resumen
+
+
+def gate(df, dataset):
+    """Compuerta para los limpiadores: evalúa, informa y detiene en modo estricto"""
+    if quality_mode() == "omitir":
+        return None
+    return enforce(check(df, dataset), dataset)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evalúa las reglas de calidad sobre un dataset preparado"
+    )
+    parser.add_argument("dataset", choices=list(REGLAS), help="Dataset a revisar")
+    parser.add_argument(
+        "--calidad",
+        choices=MODOS,
+        default="avisar",
+        help="estricto termina con código 1 si alguna regla falla"
+    )
+    args = parser.parse_args()
+    encoding = "latin1" if args.dataset == "ine_2025" else "utf-8"
+    df = pd.read_csv(PATHS[args.dataset]["prepared"], encoding=encoding)
+    try:
+        enforce(check(df, args.dataset), args.dataset, args.calidad)
+    except ValueError as exc:
+        print(exc)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
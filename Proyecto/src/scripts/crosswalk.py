@@ -0,0 +1,264 @@
+# Equivalencias de geografía entre años (redistritaciones)
+#
+# Los distritos de 2015, 2020 y 2025 comparten códigos pero no límites: cada
+# redistritación reasigna secciones. La sección es la unidad estable, así que
+# cada año se describe con una tabla data/crosswalk/secciones_AAAA.csv
+# (clave_entidad, seccion, clave_distrito[, peso]) donde `peso` es la fracción
+# de la sección asignada a ese distrito (1 si no se indica). Para 2025, si no
+# hay tabla, se toma la asignación del padrón preparado.
+#
+# Cada tabla se carga como matriz dispersa sección × distrito. La matriz de
+# reparto de un año a otro es A_origenᵀ · diag(w) · A_destino normalizada por
+# fila, con w el padrón 2025 de cada sección; re-agregar cualquier medida es un
+# producto matriz dispersa × vector, redondeado por mayor residuo para que los
+# totales por entidad no cambien. Un año sin tabla conserva sus códigos. El
+# padrón 2025 se lee como en las demás etapas 2025: desde la base SQLite si
+# está lista, por particiones con un presupuesto de memoria, o con pandas.
+#
+#   python -m src.scripts.crosswalk 2015                 # reparto 2015 → 2025
+#   python -m src.scripts.crosswalk 2020 --destino 2025
+
+import argparse
+import numpy as np
+import pandas as pd
+from src.config.settings import ABSTRACT_DIR, CROSSWALK_DIR, PATHS
+from src.scripts.out_of_core import memory_budget, read_partitions
+from src.scripts.store import groupby_sum, table_ready
+
+OBJETIVO = 2025
+SECCION = ["clave_entidad", "seccion"]
+DISTRITO = ["clave_entidad", "clave_distrito"]
+
+# Matrices ya construidas en este proceso: (origen, destino, firma) → reparto
+_CACHE = {}
+
+
+def allocation_path(año):
+    return CROSSWALK_DIR / f"secciones_{año}.csv"
+
+
+def _signature(*paths):
+    """Tamaño y mtime de los archivos que definen un reparto (None si no existen)"""
+    return tuple((str(p), p.stat().st_size, p.stat().st_mtime_ns) if p.exists() else None for p in paths)
+
+
+def available(año):
+    """True si hay asignación de secciones para el año (sin leerla)"""
+    return allocation_path(año).exists() or (año == OBJETIVO and PATHS["ine_2025"]["prepared"].exists())
+
+
+def sections_2025():
+    """Padrón 2025 por entidad, sección y distrito, o None si no hay padrón preparado"""
+    path = PATHS["ine_2025"]["prepared"]
+    if not path.exists():
+        return None
+    claves, medida = SECCION + ["clave_distrito"], ["padron_electoral"]
+    if table_ready("ine_2025"):
+        return groupby_sum("ine_2025", claves, medida)
+    budget = memory_budget()
+    if budget:
+        partes = [
+            parte[claves + medida].groupby(claves, as_index=False).sum()
+            for parte in read_partitions(path, budget, encoding="latin1")
+        ]
+        return pd.concat(partes).groupby(claves, as_index=False).sum()
+    return pd.read_csv(path, usecols=claves + medida, encoding="latin1").groupby(claves, as_index=False).sum()
+
+
+def load_allocation(año, secciones=None):
+    """Tabla sección → distrito de un año, o None si no está disponible
+
+    `secciones` es el resultado de sections_2025, si ya se leyó.
+    """
+    path = allocation_path(año)
+    if path.exists():
+        tabla = pd.read_csv(path)
+    elif año == OBJETIVO:
+        secciones = sections_2025() if secciones is None else secciones
+        if secciones is None:
+            return None
+        tabla = secciones[SECCION + ["clave_distrito"]].drop_duplicates(SECCION)
+    else:
+        return None
+    faltantes = set(SECCION + ["clave_distrito"]) - set(tabla.columns)
+    if faltantes:
+        raise ValueError(f"❌ Columnas faltantes en la asignación {año}: {faltantes}")
+    if "peso" not in tabla.columns:
+        tabla = tabla.assign(peso=1.0)
+    return tabla
+
+
+def section_weights(secciones=None):
+    """Padrón 2025 por sección, para repartir los distritos divididos (vacío si no hay padrón)"""
+    secciones = sections_2025() if secciones is None else secciones
+    if secciones is None:
+        return pd.Series(dtype="float64")
+    return secciones.groupby(SECCION)["padron_electoral"].sum().astype("float64")
+
+
+def _pack(tabla, columnas):
+    """Llave int64 (entidad, código) para indexar con numpy"""
+    return (tabla[columnas[0]].to_numpy(np.int64) << 32) | tabla[columnas[1]].to_numpy(np.int64)
+
+
+def incidence(tabla, filas, n_secciones):
+    """Matriz dispersa sección × distrito con los pesos de la tabla, y el índice de distritos
+
+    `filas` es la posición de la sección de cada fila de la tabla.
+    """
+    from scipy import sparse
+
+    columnas, distritos = pd.factorize(_pack(tabla, DISTRITO), sort=True)
+    matriz = sparse.csr_matrix(
+        (tabla["peso"].to_numpy(float), (filas, columnas)),
+        shape=(n_secciones, len(distritos))
+    )
+    indice = pd.MultiIndex.from_arrays([distritos >> 32, distritos & 0xFFFFFFFF], names=DISTRITO)
+    return matriz, indice
+
+
+def build_allocation(origen, destino, pesos=None):
+    """Reparto entre dos años con sus tablas de asignación (None si falta alguna)"""
+    if not (available(origen) and available(destino)):
+        return None
+    secciones = sections_2025()
+    tabla_o, tabla_d = load_allocation(origen, secciones), load_allocation(destino, secciones)
+    return allocation_from_tables(tabla_o, tabla_d, section_weights(secciones) if pesos is None else pesos)
+
+
+def allocation_from_tables(tabla_o, tabla_d, pesos):
+    """Matriz de reparto distrito_origen × distrito_destino (filas suman 1) y sus índices"""
+    from scipy import sparse
+
+    # Secciones de ambos años numeradas con una tabla hash (sin ordenar)
+    codigos, secciones = pd.factorize(np.concatenate([_pack(tabla_o, SECCION), _pack(tabla_d, SECCION)]))
+    a_o, distritos_o = incidence(tabla_o, codigos[:len(tabla_o)], len(secciones))
+    a_d, distritos_d = incidence(tabla_d, codigos[len(tabla_o):], len(secciones))
+
+    # Secciones sin padrón 2025 (p.ej. dadas de baja) pesan como la sección mediana
+    w = np.full(len(secciones), np.nan)
+    if len(pesos):
+        pos = pd.Index(secciones).get_indexer(_pack(pesos.index.to_frame(index=False), SECCION))
+        w[pos[pos >= 0]] = pesos.to_numpy(float)[pos >= 0]
+    conocidos = ~np.isnan(w)
+    w[~conocidos] = np.median(w[conocidos]) if conocidos.any() else 1.0
+
+    traslape = (a_o.T @ sparse.diags(w) @ a_d).tocsr()
+    totales = np.asarray(traslape.sum(axis=1)).ravel()
+    sin_destino = totales == 0
+    if sin_destino.any():
+        print(f"⚠️ {sin_destino.sum()} distritos de origen sin secciones en el destino; quedan sin reparto")
+    reparto = sparse.diags(np.where(sin_destino, 0, 1 / np.where(sin_destino, 1, totales))) @ traslape
+    return reparto.tocsr(), distritos_o, distritos_d
+
+
+def allocation_matrix(origen, destino=OBJETIVO):
+    """build_allocation con caché por proceso (se invalida si cambian las tablas o el padrón)"""
+    if origen == destino or not (available(origen) and available(destino)):
+        return None
+    firma = _signature(allocation_path(origen), allocation_path(destino), PATHS["ine_2025"]["prepared"])
+    clave = (origen, destino, firma)
+    if clave not in _CACHE:
+        _CACHE[clave] = build_allocation(origen, destino)
+    return _CACHE[clave]
+
+
+def _largest_remainder(valores, grupos):
+    """Redondea a enteros conservando la suma de cada grupo (método del mayor residuo)"""
+    piso = np.floor(valores)
+    residuo = pd.Series(valores - piso)
+    faltan = (pd.Series(valores).groupby(grupos).transform("sum").round()
+              - pd.Series(piso).groupby(grupos).transform("sum"))
+    orden = residuo.groupby(grupos).rank(method="first", ascending=False)
+    return (piso + (orden <= faltan).to_numpy()).astype("int64")
+
+
+def harmonize(df, origen, columnas, claves=("entidad", "distrito_cod"), destino=OBJETIVO, reparto=None, sumas=None):
+    """Re-agrega las medidas de un año sobre los distritos de `destino`
+
+    `claves` son las columnas (entidad, distrito) de `df`. Devuelve sólo las
+    claves y las medidas, sumadas por distrito destino; las medidas enteras se
+    redondean conservando el total de cada entidad. `sumas` mapea una columna
+    total a sus componentes (p.ej. p_18ymas → hombres y mujeres): el total se
+    recalcula como la suma de los componentes ya redondeados, así la
+    identidad se sigue cumpliendo. Las filas sin reparto se reportan y se
+    excluyen para no mezclar geografías. Sin tabla de asignación devuelve
+    `df` sin cambios. `reparto` permite pasar una matriz ya construida con
+    allocation_from_tables.
+    """
+    reparto = reparto or allocation_matrix(origen, destino)
+    if reparto is None:
+        return df
+    matriz, distritos_o, distritos_d = reparto
+    claves, columnas = list(claves), list(columnas)
+
+    idx = distritos_o.get_indexer(pd.MultiIndex.from_frame(df[claves], names=DISTRITO))
+    con_reparto = (idx >= 0) & (np.asarray(matriz.sum(axis=1)).ravel()[idx.clip(min=0)] > 0)
+    if not con_reparto.all():
+        excluidas = df.loc[~con_reparto, claves + columnas]
+        totales = ", ".join(f"{col} {excluidas[col].sum():,}" for col in columnas)
+        print(f"⚠️ {len(excluidas)} filas de {origen} sin reparto a {destino} se excluyen "
+              f"(distritos {excluidas[claves[1]].tolist()}; {totales})")
+
+    # Medidas por distrito origen (suma si hay filas repetidas) y un producto por todas las medidas
+    valores = np.zeros((len(distritos_o), len(columnas)))
+    np.add.at(valores, idx[con_reparto], df.loc[con_reparto, columnas].to_numpy(float))
+    repartido = matriz.T @ valores
+
+    resultado = pd.DataFrame({
+        clave: distritos_d.get_level_values(nivel) for clave, nivel in zip(claves, DISTRITO)
+    })
+    sumas = sumas or {}
+    for i, col in enumerate(columnas):
+        if col in sumas:
+            continue
+        if pd.api.types.is_integer_dtype(df[col]):
+            resultado[col] = _largest_remainder(repartido[:, i], resultado[claves[0]].to_numpy())
+        else:
+            resultado[col] = repartido[:, i]
+    for total, componentes in sumas.items():
+        resultado[total] = resultado[list(componentes)].sum(axis=1)
+    resultado = resultado[claves + columnas]
+    print(f"🗺️ {origen}: {len(distritos_o)} distritos re-agregados a {len(distritos_d)} distritos de {destino}")
+    return resultado
+
+
+def crosswalk_table(origen, destino=OBJETIVO):
+    """Reparto en formato largo: distrito origen, distrito destino y fracción"""
+    reparto = allocation_matrix(origen, destino)
+    if reparto is None:
+        raise ValueError(f"❌ Falta la asignación de secciones de {origen} o {destino} en {CROSSWALK_DIR}")
+    matriz, distritos_o, distritos_d = reparto
+    coo = matriz.tocoo()
+    return pd.DataFrame({
+        "clave_entidad": distritos_o.get_level_values(0)[coo.row],
+        f"distrito_{origen}": distritos_o.get_level_values(1)[coo.row],
+        f"distrito_{destino}": distritos_d.get_level_values(1)[coo.col],
+        "fraccion": coo.data.round(6),
+    }).sort_values(["clave_entidad", f"distrito_{origen}", f"distrito_{destino}"], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reparto de distritos entre años a partir de la asignación de secciones"
+    )
+    parser.add_argument("origen", type=int, help="Año de origen (p.ej. 2015)")
+    parser.add_argument(
+        "--destino",
+        type=int,
+        default=OBJETIVO,
+        help="Año de la geografía destino"
+    )
+    args = parser.parse_args()
+
+    tabla = crosswalk_table(args.origen, args.destino)
+    divididos = (tabla.groupby(["clave_entidad", f"distrito_{args.origen}"]).size() > 1).sum()
+    ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    salida = ABSTRACT_DIR / f"crosswalk_{args.origen}_{args.destino}.csv"
+    tabla.to_csv(salida, index=False)
+    print(f"🗺️ {divididos} distritos de {args.origen} se reparten entre varios distritos de {args.destino}")
+    print(f"✅ Reparto guardado en {salida}")
+
+
+if __name__ == "__main__":
+    main()
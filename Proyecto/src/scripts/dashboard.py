@@ -0,0 +1,172 @@
+# Dashboard interactivo consolidado (un solo HTML, funciona sin red)
+
+import argparse
+import hashlib
+import html
+import json
+import re
+from itertools import chain
+from src.config.settings import VISUALIZATIONS_DIR
+from src.scripts.graph_analysis import collect_jobs, graph_paged, interactive_figure
+
+DASHBOARD_PATH = VISUALIZATIONS_DIR / "dashboard.html"
+
+_PAGE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+<style>
+body {{ font-family: "DejaVu Sans", sans-serif; margin: 0; background: #f8f9fa; }}
+header {{ padding: 16px 24px; background: #1f3b57; color: white; }}
+nav {{ display: flex; flex-wrap: wrap; gap: 4px; padding: 8px 24px; background: #e9ecef; }}
+nav button {{ border: 1px solid #adb5bd; background: white; padding: 6px 14px; cursor: pointer; }}
+nav button.activo {{ background: #1f3b57; color: white; }}
+section {{ display: none; padding: 16px 24px; }}
+section.activo {{ display: block; }}
+.grafico {{ background: white; margin-bottom: 24px; min-height: 450px; }}
+</style>
+<script>{plotlyjs}</script>
+</head>
+<body>
+<header><h1>{titulo}</h1></header>
+<nav>{botones}</nav>
+{secciones}
+<script id="plantillas" type="application/json">{plantillas}</script>
+{especificaciones}
+<script>
+const PLANTILLAS = JSON.parse(document.getElementById("plantillas").textContent);
+const dibujadas = new Set();
+
+function dibujar(div) {{
+  const spec = JSON.parse(document.getElementById("spec-" + div.id).textContent);
+  spec.layout.template = PLANTILLAS[spec.plantilla];
+  Plotly.newPlot(div, spec.data, spec.layout, {{responsive: true}});
+}}
+
+// Cada gráfico se decodifica y dibuja al acercarse a la vista: las pestañas
+// con decenas de páginas no se dibujan completas al abrirse
+const observador = new IntersectionObserver(entradas => entradas.forEach(e => {{
+  if (!e.isIntersecting) return;
+  observador.unobserve(e.target);
+  dibujar(e.target);
+}}), {{rootMargin: "400px"}});
+
+function mostrar(tab) {{
+  document.querySelectorAll("nav button, section").forEach(e => e.classList.remove("activo"));
+  document.getElementById("btn-" + tab).classList.add("activo");
+  const seccion = document.getElementById("tab-" + tab);
+  seccion.classList.add("activo");
+  if (dibujadas.has(tab)) return;
+  dibujadas.add(tab);
+  seccion.querySelectorAll(".grafico").forEach(div => observador.observe(div));
+}}
+mostrar({primera});
+</script>
+</body>
+</html>
+"""
+
+
+def _tab_name(filename):
+    """Pestaña del gráfico: el año en su nombre de archivo; las páginas de graph_paged van aparte"""
+    match = re.search(r"(20\d{2})", filename)
+    anio = match.group(1) if match else "otros"
+    pagina = re.match(r"([a-z]+)_.*_p\d+\.png$", filename)
+    return f"{anio} · {pagina.group(1)}" if pagina else anio
+
+
+def _figure_spec(fig, plantillas):
+    """Especificación compacta: arreglos tipados y plantilla de layout compartida"""
+    spec = json.loads(fig.to_json())
+    plantilla = json.dumps(spec["layout"].pop("template", {}), sort_keys=True, separators=(",", ":"))
+    key = hashlib.sha1(plantilla.encode()).hexdigest()[:10]
+    plantillas.setdefault(key, json.loads(plantilla))
+    return {"data": spec["data"], "layout": spec["layout"], "plantilla": key}
+
+
+def _script_json(element_id, data):
+    """Bloque <script> JSON seguro para incrustar en HTML"""
+    text = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    return f'<script id="{element_id}" type="application/json">{text}</script>'
+
+
+def build_dashboard(jobs, output_path=DASHBOARD_PATH, titulo="Población Adulta de Jalisco"):
+    """Escribe un único HTML con plotly.js incrustado una vez y una pestaña por año
+
+    `jobs` puede ser un generador (como graph_paged): cada gráfico se
+    convierte a su especificación y sus datos se liberan antes del siguiente.
+    """
+    from plotly.offline import get_plotlyjs
+
+    tabs, especificaciones, plantillas = {}, [], {}
+    for i, job in enumerate(jobs):
+        if job["df"] is None or job["df"].empty:
+            continue
+        chart_id = f"g{i}"
+        especificaciones.append(_script_json(f"spec-{chart_id}", _figure_spec(interactive_figure(job), plantillas)))
+        tabs.setdefault(_tab_name(job["filename"]), []).append(chart_id)
+
+    nombres = sorted(tabs)
+    # Identificadores t0, t1... (los nombres de pestaña llevan espacios y acentos)
+    botones = "".join(
+        f'<button id="btn-t{i}" onclick="mostrar(\'t{i}\')">{html.escape(t)}</button>' for i, t in enumerate(nombres)
+    )
+    secciones = "\n".join(
+        f'<section id="tab-t{i}">' + "".join(f'<div class="grafico" id="{c}"></div>' for c in tabs[t]) + "</section>"
+        for i, t in enumerate(nombres)
+    )
+
+    page = _PAGE.format(
+        titulo=html.escape(titulo),
+        plotlyjs=get_plotlyjs(),
+        botones=botones,
+        secciones=secciones,
+        plantillas=json.dumps(plantillas, separators=(",", ":")).replace("</", "<\\/"),
+        especificaciones="\n".join(especificaciones),
+        primera=json.dumps("t0" if nombres else ""),
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(page, encoding="utf-8")
+    print(f"✅ Dashboard guardado: {output_path} ({len(especificaciones)} gráficos en {len(nombres)} pestañas, "
+          f"{output_path.stat().st_size / 2**20:.1f} MB)")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dashboard interactivo consolidado sin dependencias de red"
+    )
+    parser.add_argument(
+        "--salida",
+        default=str(DASHBOARD_PATH),
+        help="Ruta del HTML generado"
+    )
+    parser.add_argument(
+        "--sin-paginado",
+        action="store_true",
+        help="Omite las páginas de todos los municipios y sus secciones"
+    )
+    parser.add_argument(
+        "--por-pagina",
+        type=int,
+        default=12,
+        help="Municipios por página en las pestañas paginadas"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Secciones con mayor padrón a mostrar por municipio"
+    )
+    args = parser.parse_args()
+
+    from pathlib import Path
+    jobs = collect_jobs()
+    if not args.sin_paginado:
+        jobs = chain(jobs, graph_paged(args.por_pagina, args.top))
+    build_dashboard(jobs, Path(args.salida))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # Análisis exploratorio
+import argparse
 import pandas as pd
 import json
 from pathlib import Path
@@ -13,6 +14,11 @@ from src.config.settings import (
     PATHS,
     REGION_CONFIG
 )
+from src.scripts.backend import BACKENDS, announce_path, get_backend, incompatible_flags, set_backend
+from src.scripts.out_of_core import memory_budget, set_memory_budget
+from src.scripts.profiling import add_rows, profiled
+from src.scripts.store import enable_store, table_ready
+
 # Mapeo de códigos a nombres de distritos
 DISTRITO_MAP = {
     1: "TEQUILA",
@@ -54,9 +60,30 @@ DISTRITO_GROUP = {
     "ZAPOTLÁN": [19]
 }
 
-def save_metadata(df, nombre_archivo):
+# Columnas requeridas, agregados y distribuciones del padrón 2025
+REQUIRED_2025 = {
+    "clave_distrito", "clave_municipio", "nombre_municipio",
+    "padron_electoral", "lista_nominal",
+    "lista_hombres", "lista_mujeres",
+    "padron_hombres", "padron_mujeres"
+}
+ADULTOS_2025 = {
+    "padron_hombres": "hombres_18+",
+    "padron_mujeres": "mujeres_18+",
+    "padron_electoral": "total_adultos"
+}
+DISTRIBUCIONES_2025 = {
+    "padron_electoral": "conteo_general_ine_2025",
+    "lista_nominal": "lista_general_ine_2025",
+    "lista_hombres": "lista_hombres_ine_2025",
+    "lista_mujeres": "lista_mujeres_ine_2025",
+    "padron_hombres": "padron_hombres_ine_2025",
+    "padron_mujeres": "padron_mujeres_ine_2025"
+}
+
+def save_metadata(df, nombre_archivo, filas=None):
     metadata = {
-        "filas": int(df.shape[0]),
+        "filas": int(df.shape[0] if filas is None else filas),
         "columnas": int(df.shape[1]),
         "columnas_nombres": list(df.columns)
     }
@@ -71,9 +98,14 @@ def validate_columns(df, required_columns, dataset_name):
     print(f"✔️ Columnas válidas para {dataset_name}")
 
 def calculate_distribution(df, column, output_name):
+    write_distribution(df[column].value_counts(), column, output_name)
+
+def write_distribution(conteos, column, output_name):
+    """Guarda frecuencias relativas a partir de conteos por valor"""
+    # Orden determinista: frecuencia descendente y, en empates, por valor
+    conteos = conteos.sort_index().sort_values(ascending=False, kind="stable")
     counts = (
-        df[column]
-          .value_counts(normalize=True)
+        (conteos / conteos.sum())
           .rename_axis(column)
           .reset_index(name="frecuencia")
     )
@@ -97,10 +129,12 @@ def group_by_distrito_name(df, code_col="distrito_cod"):
     df["distrito_nombre"] = df[code_col].map(inverse_map)
     return df
 
+@profiled()
 def explorer_2015():
     """Análisis exploratorio para EIGE 2015 - ACTUALIZADO"""
     path_raw = PATHS["eige_2015"]["prepared"]
     df = pd.read_csv(path_raw)
+    add_rows(len(df))
     print(f"🔍 Cargando datos 2015 desde {path_raw.name} ({len(df)} filas)")
 
     # 1. Validar columnas
@@ -174,9 +208,11 @@ def explorer_2015():
     # 6. Metadata
     save_metadata(df, "eige2015")
 
+@profiled()
 def explorer_2020():
     """Análisis exploratorio para INE 2020 - ACTUALIZADO"""
     df = pd.read_csv(PATHS["ine_2020"]["prepared"])
+    add_rows(len(df))
     print(f"🔍 Cargando datos 2020 ({len(df)} filas)")
     validate_columns(df, {"entidad", "distrito_cod", "hombres_18+", "mujeres_18+", "p_0a17", "p_18ymas"}, "ine_2020")
 
@@ -216,65 +252,92 @@ def explorer_2020():
     # 3. Metadata
     save_metadata(df, "ine2020")
 
+def write_adultos_2025(distrito_data, municipio_data):
+    """Guarda padrón por nombre de distrito y por municipio"""
+    distrito_data.rename(columns=ADULTOS_2025).to_csv(
+        ABSTRACT_DIR / "poblacion_adulta_distrito_2025.csv", index=False
+    )
+    municipio_data.rename(columns=ADULTOS_2025).to_csv(
+        ABSTRACT_DIR / "poblacion_adulta_municipio_2025.csv", index=False
+    )
+    print("✔️ Datos adultos por distrito/municipio guardados")
+
+@profiled()
 def explorer_2025():
     """Análisis exploratorio para INE 2025 - ACTUALIZADO"""
-    df = pd.read_csv(PATHS["ine_2025"]["prepared"], encoding="latin1")
-    print(f"🔍 Cargando datos 2025 ({len(df)} filas)")
-    required = {
-        "clave_distrito", "clave_municipio", "nombre_municipio",
-        "padron_electoral", "lista_nominal",
-        "lista_hombres", "lista_mujeres",
-        "padron_hombres", "padron_mujeres"
-    }
-    validate_columns(df, required, "ine_2025")
-
-    # Añadir nombres de distrito usando clave_distrito
-    df = add_distrito_name(df.copy(), code_col="clave_distrito")
-    df = group_by_distrito_name(df.copy(), code_col="clave_distrito")
-
-    # 1. Agrupar por nombre de distrito
-    distrito_data = df.groupby("distrito_nombre", as_index=False).agg({
-        "padron_hombres": "sum",
-        "padron_mujeres": "sum",
-        "padron_electoral": "sum"
-    })
-    distrito_data.rename(columns={
-        "padron_hombres": "hombres_18+",
-        "padron_mujeres": "mujeres_18+",
-        "padron_electoral": "total_adultos"
-    }, inplace=True)
-    distrito_data.to_csv(ABSTRACT_DIR / "poblacion_adulta_distrito_2025.csv", index=False)
+    if table_ready("ine_2025"):
+        # Groupbys resueltos en la base embebida (ver store.py)
+        from src.scripts.store import explorer_2025_store
+        announce_path("explorer_2025", "sqlite")
+        explorer_2025_store()
+        return
+    budget = memory_budget()
+    if budget:
+        # Agregados por partición con derrame a disco (ver out_of_core.py)
+        from src.scripts.out_of_core import explorer_2025_partitioned
+        announce_path("explorer_2025", "particiones")
+        explorer_2025_partitioned(budget)
+        return
+
+    # Operaciones pesadas en el backend elegido (pandas o Polars, ver backend.py)
+    be = get_backend()
+    announce_path("explorer_2025", be.nombre)
+    df = be.read_csv(PATHS["ine_2025"]["prepared"], encoding="latin1")
+    add_rows(len(df))
+    print(f"🔍 Cargando datos 2025 ({len(df)} filas, backend {be.nombre})")
+    validate_columns(df, REQUIRED_2025, "ine_2025")
+    adultos = list(ADULTOS_2025)
+
+    if be.nombre == "pandas":
+        # Agregados por nivel de la jerarquía, compartidos con el resumen (ver hierarchy.py)
+        from src.scripts.hierarchy import rollups
+        niveles = rollups("2025", df=df)
+        por_clave = niveles["distrito"].groupby("clave_distrito", as_index=False)[adultos].sum()
+        municipio_data = niveles["municipio"].groupby(["clave_municipio", "nombre_municipio"], as_index=False)[adultos].sum()
+    else:
+        por_clave = be.to_pandas(be.groupby_sum(df, ["clave_distrito"], adultos))
+        municipio_data = be.to_pandas(be.groupby_sum(df, ["clave_municipio", "nombre_municipio"], adultos))
+
+    # 1. Agrupar por nombre de distrito (primero por clave, luego por nombre sobre ≤300 filas)
+    por_clave = group_by_distrito_name(por_clave, code_col="clave_distrito")
+    distrito_data = por_clave.groupby("distrito_nombre", as_index=False)[adultos].sum()
 
     # 2. Agrupar por municipio (para ZMG)
-    municipio_data = df.groupby(["clave_municipio", "nombre_municipio"], as_index=False).agg({
-        "padron_hombres": "sum",
-        "padron_mujeres": "sum",
-        "padron_electoral": "sum"
-    })
-    municipio_data.rename(columns={
-        "padron_hombres": "hombres_18+",
-        "padron_mujeres": "mujeres_18+",
-        "padron_electoral": "total_adultos"
-    }, inplace=True)
-    municipio_data.to_csv(ABSTRACT_DIR / "poblacion_adulta_municipio_2025.csv", index=False)
-    print("✔️ Datos adultos por distrito/municipio guardados")
-
-    # 1. Distribución general de padron vs lista
-    calculate_distribution(df, "padron_electoral", "conteo_general_ine_2025")
-    calculate_distribution(df, "lista_nominal", "lista_general_ine_2025")
+    write_adultos_2025(distrito_data, municipio_data)
 
-    # 2. Distribución por sexo en lista nominal
-    calculate_distribution(df, "lista_hombres", "lista_hombres_ine_2025")
-    calculate_distribution(df, "lista_mujeres", "lista_mujeres_ine_2025")
+    # 3. Distribuciones de padrón y lista nominal (general y por sexo)
+    for column, output_name in DISTRIBUCIONES_2025.items():
+        write_distribution(be.value_counts(df, column), column, output_name)
 
-    # 3. Distribución por sexo en padrón electoral
-    calculate_distribution(df, "padron_hombres", "padron_hombres_ine_2025")
-    calculate_distribution(df, "padron_mujeres", "padron_mujeres_ine_2025")
-
-    # 4. Metadata
-    save_metadata(df, "ine2025")
+    # 4. Metadata (con la columna de nombre de distrito que agrega el análisis)
+    save_metadata(pd.DataFrame(columns=[*df.columns, "distrito_nombre"]), "ine2025", filas=len(df))
 
 def main():
+    parser = argparse.ArgumentParser(description="Análisis exploratorio")
+    parser.add_argument(
+        "--memory-budget",
+        default=None,
+        help="Memoria máxima por partición, p.ej. 512MB (explora el padrón por partes)"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Calcula los agregados del padrón en la base embebida (SQLite) si existe"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="Motor de tablas para el padrón 2025 (por defecto pandas)"
+    )
+    args = parser.parse_args()
+    error = incompatible_flags(args.backend, args.store, args.memory_budget)
+    if error:
+        parser.error(error)
+    set_memory_budget(args.memory_budget)
+    enable_store(args.store)
+    set_backend(args.backend)
+
     # Asegurar directorios
     ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -1,53 +1,35 @@
 # Visualización de análisis exploratorio
 
-import pandas as pd
+import argparse
+import math
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.io as pio
-from matplotlib import patheffects
-from pathlib import Path
+import pandas as pd
 from src.config.settings import (
-    BASE_DIR,
-    RAW_DIR,
-    PREPARED_DIR,
     ABSTRACT_DIR,
     INTERACTIVE_DIR,
-    STATIC_DIR,
-    SCREENSHOTS_DIR,
     PATHS,
-    REGION_CONFIG
+    STATIC_DIR
+)
+from src.config.style import (
+    GENDER_PALETTE,
+    DISTRICT_PALETTE,
+    RENDER_PROFILES,
+    static_backend,
+    interactive_backend
 )
-# Asegurar carpetas de destino
-STATIC_DIR.mkdir(parents=True, exist_ok=True)
-INTERACTIVE_DIR.mkdir(parents=True, exist_ok=True)
-print(f"📂 Directorio de gráficos estáticos: {STATIC_DIR}")
-print(f"📂 Directorio de gráficos interactivos: {INTERACTIVE_DIR}")
-
-# Configuración global mejorada
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['axes.titlepad'] = 10
-plt.rcParams['axes.titleweight'] = 'bold'
-plt.rcParams['axes.titlesize'] = 16
-plt.rcParams['axes.labelweight'] = 'bold'
-sns.set_theme(style="whitegrid", context="talk", font_scale=0.9)
-
-# Configuración de Plotly
-pio.templates.default = "plotly_white"
-
-# Paletas profesionales
-GENDER_PALETTE = {"Hombres": "#3498db", "Mujeres": "#e74c3c"}
-DISTRICT_PALETTE = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", 
-                   "#8c564b", "#e377c2", "#7f7f7f", "#bcbd22", "#17becf"]
-
-# Efectos de texto
-TITLE_EFFECT = [patheffects.withStroke(linewidth=1, foreground='black')]
-LABEL_EFFECT = [patheffects.withStroke(linewidth=2, foreground='white')]
-
-def apply_advanced_styling(ax, title):
+from src.scripts.profiling import profiled
+from src.scripts.render import chart_job, pooled_figure, render_batches, render_jobs
+
+# Modos de render disponibles
+MODOS = ("estatico", "interactivo")
+
+def apply_advanced_styling(ax, title, path_effects=True):
     """Aplica estilos avanzados a los gráficos"""
+    _, _, patheffects = static_backend()
+    # Efectos de texto (se omiten en el perfil de borrador)
+    TITLE_EFFECT = [patheffects.withStroke(linewidth=1, foreground='black')] if path_effects else []
+    LABEL_EFFECT = [patheffects.withStroke(linewidth=2, foreground='white')] if path_effects else []
+
     # Fondo y cuadrícula
     ax.set_facecolor('#f8f9fa')
     ax.grid(True, linestyle='--', alpha=0.7)
@@ -89,15 +71,8 @@ def load_data(filename):
         print(f"❌ Error al cargar {filepath}: {str(e)}")
         return None
 
-def plot_gender_comparison(df, x_col, male_col, female_col, title, filename):
-    """Comparativa avanzada de población por sexo"""
-    if df is None or df.empty:
-        print(f"⛔ Datos vacíos para {filename}")
-        return
-    
-    print(f"📊 Generando gráfico de género: {title}")
-    
-    # Preparar datos
+def _melt_gender(df, x_col, male_col, female_col):
+    """Formato largo (x_col, sexo, poblacion) ordenado por población"""
     df_melted = df.melt(
         id_vars=[x_col], 
         value_vars=[male_col, female_col],
@@ -112,129 +87,226 @@ def plot_gender_comparison(df, x_col, male_col, female_col, title, filename):
     })
     
     # Ordenar por población total
-    df_melted = df_melted.sort_values(by='poblacion', ascending=False)
+    return df_melted.sort_values(by='poblacion', ascending=False)
+
+def _sort_age_groups(df):
+    """Ordena por grupo de edad si la columna existe"""
+    if 'grupo_edad' in df.columns:
+        age_order = [
+            '0a9', '10a19', '20a29', '30a39', 
+            '40a49', '50a59', '60ymas', 'edadne'
+        ]
+        df = df.sort_values(by='grupo_edad', key=lambda x: x.map({v: i for i, v in enumerate(age_order)}))
+    return df
+
+def top_k(df, col, k):
+    """Las k filas con mayor `col` en orden descendente (selección parcial, sin ordenar todo)"""
+    valores = df[col].to_numpy()
+    idx = np.argpartition(-valores, k - 1)[:k] if len(valores) > k else np.arange(len(valores))
+    return df.iloc[idx[np.argsort(-valores[idx], kind="stable")]]
+
+def paginate(df, key_col, por_pagina):
+    """Parte df en páginas de `por_pagina` geografías (valores distintos de key_col)"""
+    df = df.sort_values(key_col, kind="stable")
+    claves = df[key_col].to_numpy()
+    # Primer renglón de cada geografía y cortes cada `por_pagina` geografías
+    inicios = np.flatnonzero(np.r_[True, claves[1:] != claves[:-1]])
+    cortes = np.r_[inicios[::por_pagina], len(claves)]
+    return [df.iloc[a:b] for a, b in zip(cortes[:-1], cortes[1:])]
+
+def _panel_tops(df, panel_col, y_col, k):
+    """Top-k de cada panel, en el orden en que aparecen los paneles"""
+    return [(panel, top_k(sub, y_col, k)) for panel, sub in df.groupby(panel_col, sort=False)]
+
+def build_gender_figure(df, x_col, male_col, female_col, title):
+    """Figura Plotly de la comparativa por sexo"""
+    df_melted = _melt_gender(df, x_col, male_col, female_col)
+    px, _ = interactive_backend()
+
+    # Calcular totales para tooltips
+    totales = df_melted.groupby(x_col)['poblacion'].sum().reset_index()
+    totales.rename(columns={'poblacion': 'total'}, inplace=True)
+    df_melted = pd.merge(df_melted, totales, on=x_col)
+
+    fig = px.bar(
+        df_melted,
+        x=x_col,
+        y='poblacion',
+        color='sexo',
+        color_discrete_map=GENDER_PALETTE,
+        title=f"<b>{title}</b>",
+        text=[f"{x/1000:.1f}K" if x >= 1000 else str(int(x)) for x in df_melted['poblacion']],
+        labels={'poblacion': 'Población Adulta', x_col: x_col.replace('_', ' ').title()},
+        height=600,
+        hover_data={'total': ':.0f'},
+        hover_name=x_col
+    )
+
+    fig.update_traces(
+        textposition='outside',
+        textfont_size=12,
+        marker_line=dict(width=1, color='black'),
+        hovertemplate=(
+            f"<b>%{{x}}</b><br>" +
+            "Sexo: %{fullData.name}<br>" +
+            "Población: %{y:,.0f}<br>" +
+            "Total distrito: %{customdata[0]:,.0f}" +
+            "<extra></extra>"
+        )
+    )
+
+    fig.update_layout(
+        hovermode="x unified",
+        plot_bgcolor='rgba(248,249,250,1)',
+        paper_bgcolor='rgba(248,249,250,1)',
+        title_font_size=20,
+        legend_title_text='Sexo',
+        xaxis_tickangle=-45,
+        uniformtext_minsize=10,
+        uniformtext_mode='hide',
+        margin=dict(t=100, b=150),
+        font=dict(family="DejaVu Sans, sans-serif")
+    )
+    return fig
+
+@profiled()
+def plot_gender_comparison(df, x_col, male_col, female_col, title, filename, modos=MODOS, perfil="publicacion"):
+    """Comparativa avanzada de población por sexo"""
+    if df is None or df.empty:
+        print(f"⛔ Datos vacíos para {filename}")
+        return
+    
+    print(f"📊 Generando gráfico de género: {title}")
+    
+    # Preparar datos
+    df_melted = _melt_gender(df, x_col, male_col, female_col)
     
     # ====================================================================
     # VERSIÓN ESTÁTICA (Matplotlib/Seaborn)
     # ====================================================================
-    try:
-        plt.figure(figsize=(14, 8))
-        ax = sns.barplot(
-            data=df_melted,
-            x=x_col,
-            y='poblacion',
-            hue='sexo',
-            palette=GENDER_PALETTE,
-            estimator=sum,
-            errorbar=None,
-            edgecolor='black',
-            linewidth=1,
-            saturation=0.9
-        )
+    if "estatico" in modos:
+        try:
+            plt, sns, patheffects = static_backend()
+            cfg = RENDER_PROFILES[perfil]
+            bar_effects = [patheffects.withStroke(linewidth=2, foreground='black')] if cfg["path_effects"] else []
+            with pooled_figure((14, 8)) as (fig, ax):
+                ax = sns.barplot(
+                    ax=ax,
+                    data=df_melted,
+                    x=x_col,
+                    y='poblacion',
+                    hue='sexo',
+                    palette=GENDER_PALETTE,
+                    estimator=sum,
+                    errorbar=None,
+                    edgecolor='black',
+                    linewidth=1,
+                    saturation=0.9
+                )
         
-        # Configuración estética avanzada
-        plt.title(title, fontsize=18, pad=15, fontweight='bold')
-        plt.xlabel(x_col.replace('_', ' ').title(), fontsize=14, labelpad=10)
-        plt.ylabel('Población Adulta', fontsize=14, labelpad=10)
-        plt.xticks(rotation=45, ha='right', fontsize=12)
-        plt.yticks(fontsize=12)
+                # Configuración estética avanzada
+                ax.set_title(title, fontsize=18, pad=15, fontweight='bold')
+                ax.set_xlabel(x_col.replace('_', ' ').title(), fontsize=14, labelpad=10)
+                ax.set_ylabel('Población Adulta', fontsize=14, labelpad=10)
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right', fontsize=12)
+                ax.tick_params(axis='y', labelsize=12)
         
-        # Formatear números grandes
-        ax.get_yaxis().set_major_formatter(
-            plt.FuncFormatter(lambda x, loc: f"{int(x/1000)}K" if x >= 1000 else f"{int(x)}")
-        )
+                # Formatear números grandes
+                ax.get_yaxis().set_major_formatter(
+                    plt.FuncFormatter(lambda x, loc: f"{int(x/1000)}K" if x >= 1000 else f"{int(x)}")
+                )
         
-        # Añadir etiquetas
-        for container in ax.containers:
-            labels = [
-                f"{int(val/1000)}K" if val >= 10000 else f"{int(val)}" 
-                for val in container.datavalues
-            ]
-            ax.bar_label(
-                container, 
-                labels=labels,
-                label_type='edge',
-                padding=5,
-                fontsize=10,
-                fontweight='bold',
-                color='white',
-                path_effects=[patheffects.withStroke(linewidth=2, foreground='black')]
-            )
+                # Añadir etiquetas
+                for container in ax.containers:
+                    labels = [
+                        f"{int(val/1000)}K" if val >= 10000 else f"{int(val)}" 
+                        for val in container.datavalues
+                    ]
+                    ax.bar_label(
+                        container, 
+                        labels=labels,
+                        label_type='edge',
+                        padding=5,
+                        fontsize=10,
+                        fontweight='bold',
+                        color='white',
+                        path_effects=bar_effects
+                    )
         
-        # Aplicar estilos avanzados
-        apply_advanced_styling(ax, title)
+                # Aplicar estilos avanzados
+                apply_advanced_styling(ax, title, path_effects=cfg["path_effects"])
         
-        # Leyenda
-        plt.legend(title='Sexo', title_fontsize=12, fontsize=11, 
-                   frameon=True, shadow=True, loc='best')
+                # Leyenda
+                ax.legend(title='Sexo', title_fontsize=12, fontsize=11, 
+                          frameon=True, shadow=True, loc='best')
         
-        # Guardar estático
-        static_path = STATIC_DIR / filename
-        plt.tight_layout()
-        plt.savefig(static_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"✅ Gráfico estático guardado: {static_path}")
-    except Exception as e:
-        print(f"❌ Error en gráfico estático: {str(e)}")
+                # Guardar estático
+                static_path = STATIC_DIR / filename
+                if cfg["tight_layout"]:
+                    fig.tight_layout()
+                fig.savefig(static_path, dpi=cfg["dpi"], bbox_inches=cfg["bbox_inches"])
+                print(f"✅ Gráfico estático guardado: {static_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico estático: {str(e)}")
     
     # ====================================================================
     # VERSIÓN INTERACTIVA (Plotly)
     # ====================================================================
-    try:
-        # Calcular totales para tooltips
-        totales = df_melted.groupby(x_col)['poblacion'].sum().reset_index()
-        totales.rename(columns={'poblacion': 'total'}, inplace=True)
-        df_melted = pd.merge(df_melted, totales, on=x_col)
-        
-        fig = px.bar(
-            df_melted,
-            x=x_col,
-            y='poblacion',
-            color='sexo',
-            color_discrete_map=GENDER_PALETTE,
-            title=f"<b>{title}</b>",
-            text=[f"{x/1000:.1f}K" if x >= 1000 else str(int(x)) for x in df_melted['poblacion']],
-            labels={'poblacion': 'Población Adulta', x_col: x_col.replace('_', ' ').title()},
-            height=600,
-            hover_data={'total': ':.0f'},
-            hover_name=x_col
-        )
-        
-        fig.update_traces(
-            textposition='outside',
-            textfont_size=12,
-            marker_line=dict(width=1, color='black'),
-            hovertemplate=(
-                f"<b>%{{x}}</b><br>" +
-                "Sexo: %{fullData.name}<br>" +
-                "Población: %{y:,.0f}<br>" +
-                "Total distrito: %{customdata[0]:,.0f}" +
-                "<extra></extra>"
-            )
-        )
-        
-        fig.update_layout(
-            hovermode="x unified",
-            plot_bgcolor='rgba(248,249,250,1)',
-            paper_bgcolor='rgba(248,249,250,1)',
-            title_font_size=20,
-            legend_title_text='Sexo',
-            xaxis_tickangle=-45,
-            uniformtext_minsize=10,
-            uniformtext_mode='hide',
-            margin=dict(t=100, b=150),
-            font=dict(family="DejaVu Sans, sans-serif")
+    if "interactivo" in modos:
+        try:
+            fig = build_gender_figure(df, x_col, male_col, female_col, title)
+
+            # Guardar interactivo
+            interactive_filename = filename.replace('.png', '.html')
+            interactive_path = INTERACTIVE_DIR / interactive_filename
+            fig.write_html(interactive_path, include_plotlyjs='cdn')
+            print(f"✅ Gráfico interactivo guardado: {interactive_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico interactivo: {str(e)}")
+
+def build_age_figure(df, x_col, y_col, title):
+    """Figura Plotly de la distribución por edad"""
+    df = _sort_age_groups(df)
+    px, _ = interactive_backend()
+    fig = px.bar(
+        df,
+        x=x_col,
+        y=y_col,
+        color=x_col,
+        color_discrete_sequence=px.colors.sequential.Viridis,
+        title=f"<b>{title}</b>",
+        text=[f"{x/1000:.1f}K" if x >= 1000 else str(int(x)) for x in df[y_col]],
+        labels={y_col: 'Población' if 'poblacion' in y_col else 'Porcentaje', x_col: 'Grupo de Edad'},
+        height=500
+    )
+
+    fig.update_traces(
+        textposition='outside',
+        textfont_size=12,
+        marker_line=dict(width=1, color='black'),
+        hovertemplate=(
+            "<b>%{x}</b><br>" +
+            ("Población: %{y:,.0f}" if 'poblacion' in y_col else "Porcentaje: %{y:.2f}%") +
+            "<extra></extra>"
         )
-        
-        # Guardar interactivo
-        interactive_filename = filename.replace('.png', '.html')
-        interactive_path = INTERACTIVE_DIR / interactive_filename
-        fig.write_html(interactive_path, include_plotlyjs='cdn')
-        print(f"✅ Gráfico interactivo guardado: {interactive_path}")
-    except Exception as e:
-        print(f"❌ Error en gráfico interactivo: {str(e)}")
+    )
+
+    fig.update_layout(
+        hovermode="x unified",
+        plot_bgcolor='rgba(248,249,250,1)',
+        paper_bgcolor='rgba(248,249,250,1)',
+        title_font_size=20,
+        showlegend=False,
+        xaxis_tickangle=-45,
+        uniformtext_minsize=10,
+        uniformtext_mode='hide',
+        margin=dict(t=80, b=100),
+        font=dict(family="DejaVu Sans, sans-serif")
+    )
+    return fig
 
-def plot_age_distribution(df, x_col, y_col, title, filename):
+@profiled()
+def plot_age_distribution(df, x_col, y_col, title, filename, modos=MODOS, perfil="publicacion"):
     """Distribución avanzada por grupos de edad"""
     if df is None or df.empty:
         print(f"⛔ Datos vacíos para {filename}")
@@ -243,113 +315,122 @@ def plot_age_distribution(df, x_col, y_col, title, filename):
     print(f"📊 Generando distribución de edad: {title}")
     
     # Ordenar por grupo de edad
-    if 'grupo_edad' in df.columns:
-        age_order = [
-            '0a9', '10a19', '20a29', '30a39', 
-            '40a49', '50a59', '60ymas', 'edadne'
-        ]
-        df = df.sort_values(by='grupo_edad', key=lambda x: x.map({v: i for i, v in enumerate(age_order)}))
+    df = _sort_age_groups(df)
     
     # ====================================================================
     # VERSIÓN ESTÁTICA (Matplotlib/Seaborn)
     # ====================================================================
-    try:
-        plt.figure(figsize=(12, 7))
-        ax = sns.barplot(
-            data=df,
-            x=x_col,
-            y=y_col,
-            palette="viridis",  # Paleta secuencial
-            errorbar=None,
-            edgecolor='black',
-            linewidth=1
-        )
+    if "estatico" in modos:
+        try:
+            plt, sns, patheffects = static_backend()
+            cfg = RENDER_PROFILES[perfil]
+            bar_effects = [patheffects.withStroke(linewidth=2, foreground='black')] if cfg["path_effects"] else []
+            with pooled_figure((12, 7)) as (fig, ax):
+                ax = sns.barplot(
+                    ax=ax,
+                    data=df,
+                    x=x_col,
+                    y=y_col,
+                    palette="viridis",  # Paleta secuencial
+                    errorbar=None,
+                    edgecolor='black',
+                    linewidth=1
+                )
         
-        # Configuración estética
-        plt.title(title, fontsize=18, pad=15, fontweight='bold')
-        plt.xlabel('Grupo de Edad', fontsize=14, labelpad=10)
-        plt.ylabel('Población' if 'poblacion' in y_col else 'Porcentaje', fontsize=14, labelpad=10)
-        plt.xticks(rotation=45, ha='right', fontsize=12)
-        plt.yticks(fontsize=12)
+                # Configuración estética
+                ax.set_title(title, fontsize=18, pad=15, fontweight='bold')
+                ax.set_xlabel('Grupo de Edad', fontsize=14, labelpad=10)
+                ax.set_ylabel('Población' if 'poblacion' in y_col else 'Porcentaje', fontsize=14, labelpad=10)
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right', fontsize=12)
+                ax.tick_params(axis='y', labelsize=12)
         
-        # Añadir etiquetas
-        for container in ax.containers:
-            labels = [
-                f"{val/1000:.1f}K" if val >= 1000 else f"{int(val)}" 
-                for val in container.datavalues
-            ]
-            ax.bar_label(
-                container, 
-                labels=labels,
-                label_type='edge',
-                padding=5,
-                fontsize=10,
-                fontweight='bold',
-                color='white',
-                path_effects=[patheffects.withStroke(linewidth=2, foreground='black')]
-            )
+                # Añadir etiquetas
+                for container in ax.containers:
+                    labels = [
+                        f"{val/1000:.1f}K" if val >= 1000 else f"{int(val)}" 
+                        for val in container.datavalues
+                    ]
+                    ax.bar_label(
+                        container, 
+                        labels=labels,
+                        label_type='edge',
+                        padding=5,
+                        fontsize=10,
+                        fontweight='bold',
+                        color='white',
+                        path_effects=bar_effects
+                    )
         
-        # Aplicar estilos avanzados
-        apply_advanced_styling(ax, title)
+                # Aplicar estilos avanzados
+                apply_advanced_styling(ax, title, path_effects=cfg["path_effects"])
         
-        # Guardar estático
-        static_path = STATIC_DIR / filename
-        plt.tight_layout()
-        plt.savefig(static_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"✅ Gráfico estático guardado: {static_path}")
-    except Exception as e:
-        print(f"❌ Error en gráfico estático: {str(e)}")
+                # Guardar estático
+                static_path = STATIC_DIR / filename
+                if cfg["tight_layout"]:
+                    fig.tight_layout()
+                fig.savefig(static_path, dpi=cfg["dpi"], bbox_inches=cfg["bbox_inches"])
+                print(f"✅ Gráfico estático guardado: {static_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico estático: {str(e)}")
     
     # ====================================================================
     # VERSIÓN INTERACTIVA (Plotly)
     # ====================================================================
-    try:
-        fig = px.bar(
-            df,
-            x=x_col,
-            y=y_col,
-            color=x_col,
-            color_discrete_sequence=px.colors.sequential.Viridis,
-            title=f"<b>{title}</b>",
-            text=[f"{x/1000:.1f}K" if x >= 1000 else str(int(x)) for x in df[y_col]],
-            labels={y_col: 'Población' if 'poblacion' in y_col else 'Porcentaje', x_col: 'Grupo de Edad'},
-            height=500
-        )
-        
-        fig.update_traces(
-            textposition='outside',
-            textfont_size=12,
-            marker_line=dict(width=1, color='black'),
-            hovertemplate=(
-                "<b>%{x}</b><br>" +
-                ("Población: %{y:,.0f}" if 'poblacion' in y_col else "Porcentaje: %{y:.2f}%") +
-                "<extra></extra>"
-            )
-        )
-        
-        fig.update_layout(
-            hovermode="x unified",
-            plot_bgcolor='rgba(248,249,250,1)',
-            paper_bgcolor='rgba(248,249,250,1)',
-            title_font_size=20,
-            showlegend=False,
-            xaxis_tickangle=-45,
-            uniformtext_minsize=10,
-            uniformtext_mode='hide',
-            margin=dict(t=80, b=100),
-            font=dict(family="DejaVu Sans, sans-serif")
+    if "interactivo" in modos:
+        try:
+            fig = build_age_figure(df, x_col, y_col, title)
+
+            # Guardar interactivo
+            interactive_filename = filename.replace('.png', '.html')
+            interactive_path = INTERACTIVE_DIR / interactive_filename
+            fig.write_html(interactive_path, include_plotlyjs='cdn')
+            print(f"✅ Gráfico interactivo guardado: {interactive_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico interactivo: {str(e)}")
+
+def build_top_figure(df, x_col, y_col, title, n=10):
+    """Figura Plotly de las ubicaciones principales"""
+    df = top_k(df, y_col, n)
+    px, _ = interactive_backend()
+    fig = px.bar(
+        df,
+        x=x_col,
+        y=y_col,
+        color=x_col,
+        color_discrete_sequence=DISTRICT_PALETTE,
+        title=f"<b>{title}</b>",
+        text=[f"{x/1000:.1f}K" for x in df[y_col]],
+        labels={y_col: 'Población Adulta', x_col: 'Distrito'},
+        height=500
+    )
+
+    fig.update_traces(
+        textposition='outside',
+        textfont_size=12,
+        marker_line=dict(width=1, color='black'),
+        hovertemplate=(
+            "<b>%{x}</b><br>" +
+            "Población: %{y:,.0f}" +
+            "<extra></extra>"
         )
-        
-        # Guardar interactivo
-        interactive_filename = filename.replace('.png', '.html')
-        interactive_path = INTERACTIVE_DIR / interactive_filename
-        fig.write_html(interactive_path, include_plotlyjs='cdn')
-        print(f"✅ Gráfico interactivo guardado: {interactive_path}")
-    except Exception as e:
-        print(f"❌ Error en gráfico interactivo: {str(e)}")
+    )
 
-def plot_top_locations(df, x_col, y_col, title, filename, n=10):
+    fig.update_layout(
+        hovermode="x unified",
+        plot_bgcolor='rgba(248,249,250,1)',
+        paper_bgcolor='rgba(248,249,250,1)',
+        title_font_size=20,
+        showlegend=False,
+        xaxis_tickangle=-45,
+        uniformtext_minsize=10,
+        uniformtext_mode='hide',
+        margin=dict(t=80, b=150),
+        font=dict(family="DejaVu Sans, sans-serif")
+    )
+    return fig
+
+@profiled()
+def plot_top_locations(df, x_col, y_col, title, filename, n=10, modos=MODOS, perfil="publicacion"):
     """Top ubicaciones con diseño avanzado"""
     if df is None or df.empty:
         print(f"⛔ Datos vacíos para {filename}")
@@ -357,194 +438,294 @@ def plot_top_locations(df, x_col, y_col, title, filename, n=10):
     
     print(f"📊 Generando top ubicaciones: {title}")
     
-    # Ordenar y seleccionar top n
-    df = df.sort_values(y_col, ascending=False).head(n)
+    # Seleccionar top n
+    df = top_k(df, y_col, n)
     
     # ====================================================================
     # VERSIÓN ESTÁTICA (Matplotlib/Seaborn)
     # ====================================================================
-    try:
-        plt.figure(figsize=(12, 7))
-        ax = sns.barplot(
-            data=df,
-            x=x_col,
-            y=y_col,
-            palette=DISTRICT_PALETTE,  # Paleta categórica
-            errorbar=None,
-            edgecolor='black',
-            linewidth=1
-        )
+    if "estatico" in modos:
+        try:
+            plt, sns, patheffects = static_backend()
+            cfg = RENDER_PROFILES[perfil]
+            bar_effects = [patheffects.withStroke(linewidth=2, foreground='black')] if cfg["path_effects"] else []
+            with pooled_figure((12, 7)) as (fig, ax):
+                ax = sns.barplot(
+                    ax=ax,
+                    data=df,
+                    x=x_col,
+                    y=y_col,
+                    palette=DISTRICT_PALETTE,  # Paleta categórica
+                    errorbar=None,
+                    edgecolor='black',
+                    linewidth=1
+                )
         
-        # Configuración estética
-        plt.title(title, fontsize=18, pad=15, fontweight='bold')
-        plt.xlabel('')
-        plt.ylabel('Población Adulta', fontsize=14, labelpad=10)
-        plt.xticks(rotation=45, ha='right', fontsize=12)
-        plt.yticks(fontsize=12)
+                # Configuración estética
+                ax.set_title(title, fontsize=18, pad=15, fontweight='bold')
+                ax.set_xlabel('')
+                ax.set_ylabel('Población Adulta', fontsize=14, labelpad=10)
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right', fontsize=12)
+                ax.tick_params(axis='y', labelsize=12)
         
-        # Formatear eje Y
-        ax.get_yaxis().set_major_formatter(
-            plt.FuncFormatter(lambda x, loc: f"{int(x/1000)}K")
-        )
+                # Formatear eje Y
+                ax.get_yaxis().set_major_formatter(
+                    plt.FuncFormatter(lambda x, loc: f"{int(x/1000)}K")
+                )
         
-        # Añadir etiquetas
-        for container in ax.containers:
-            labels = [f"{int(val/1000)}K" for val in container.datavalues]
-            ax.bar_label(
-                container, 
-                labels=labels,
-                label_type='edge',
-                padding=5,
-                fontsize=10,
-                fontweight='bold',
-                color='white',
-                path_effects=[patheffects.withStroke(linewidth=2, foreground='black')]
-            )
+                # Añadir etiquetas
+                for container in ax.containers:
+                    labels = [f"{int(val/1000)}K" for val in container.datavalues]
+                    ax.bar_label(
+                        container, 
+                        labels=labels,
+                        label_type='edge',
+                        padding=5,
+                        fontsize=10,
+                        fontweight='bold',
+                        color='white',
+                        path_effects=bar_effects
+                    )
         
-        # Aplicar estilos avanzados
-        apply_advanced_styling(ax, title)
+                # Aplicar estilos avanzados
+                apply_advanced_styling(ax, title, path_effects=cfg["path_effects"])
         
-        # Guardar estático
-        static_path = STATIC_DIR / filename
-        plt.tight_layout()
-        plt.savefig(static_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        print(f"✅ Gráfico estático guardado: {static_path}")
-    except Exception as e:
-        print(f"❌ Error en gráfico estático: {str(e)}")
+                # Guardar estático
+                static_path = STATIC_DIR / filename
+                if cfg["tight_layout"]:
+                    fig.tight_layout()
+                fig.savefig(static_path, dpi=cfg["dpi"], bbox_inches=cfg["bbox_inches"])
+                print(f"✅ Gráfico estático guardado: {static_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico estático: {str(e)}")
     
     # ====================================================================
     # VERSIÓN INTERACTIVA (Plotly)
     # ====================================================================
-    try:
-        fig = px.bar(
-            df,
-            x=x_col,
-            y=y_col,
-            color=x_col,
-            color_discrete_sequence=DISTRICT_PALETTE,
-            title=f"<b>{title}</b>",
-            text=[f"{x/1000:.1f}K" for x in df[y_col]],
-            labels={y_col: 'Población Adulta', x_col: 'Distrito'},
-            height=500
-        )
-        
-        fig.update_traces(
-            textposition='outside',
-            textfont_size=12,
-            marker_line=dict(width=1, color='black'),
-            hovertemplate=(
-                "<b>%{x}</b><br>" +
-                "Población: %{y:,.0f}" +
-                "<extra></extra>"
-            )
-        )
-        
-        fig.update_layout(
-            hovermode="x unified",
-            plot_bgcolor='rgba(248,249,250,1)',
-            paper_bgcolor='rgba(248,249,250,1)',
-            title_font_size=20,
-            showlegend=False,
-            xaxis_tickangle=-45,
-            uniformtext_minsize=10,
-            uniformtext_mode='hide',
-            margin=dict(t=80, b=150),
-            font=dict(family="DejaVu Sans, sans-serif")
-        )
-        
-        # Guardar interactivo
-        interactive_filename = filename.replace('.png', '.html')
-        interactive_path = INTERACTIVE_DIR / interactive_filename
-        fig.write_html(interactive_path, include_plotlyjs='cdn')
-        print(f"✅ Gráfico interactivo guardado: {interactive_path}")
-    except Exception as e:
-        print(f"❌ Error en gráfico interactivo: {str(e)}")
+    if "interactivo" in modos:
+        try:
+            fig = build_top_figure(df, x_col, y_col, title, n)
+
+            # Guardar interactivo
+            interactive_filename = filename.replace('.png', '.html')
+            interactive_path = INTERACTIVE_DIR / interactive_filename
+            fig.write_html(interactive_path, include_plotlyjs='cdn')
+            print(f"✅ Gráfico interactivo guardado: {interactive_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico interactivo: {str(e)}")
+
+def build_small_multiples_figure(df, panel_col, x_col, y_col, title, k=10, ncols=4):
+    """Figura Plotly con un panel por geografía y su top-k"""
+    paneles = _panel_tops(df, panel_col, y_col, k)
+    df_top = pd.concat([sub for _, sub in paneles])
+    df_top = df_top.assign(**{x_col: df_top[x_col].astype(str)})
+    nrows = math.ceil(len(paneles) / ncols)
+    px, _ = interactive_backend()
+    fig = px.bar(
+        df_top,
+        x=x_col,
+        y=y_col,
+        facet_col=panel_col,
+        facet_col_wrap=ncols,
+        facet_row_spacing=min(0.08, 1 / max(nrows, 2)),
+        color_discrete_sequence=DISTRICT_PALETTE,
+        title=f"<b>{title}</b>",
+        labels={y_col: 'Padrón', x_col: x_col.replace('_', ' ').title()},
+        height=280 * nrows + 120
+    )
+
+    # Cada panel con sus propias categorías y escala
+    fig.update_xaxes(matches=None, showticklabels=True, type='category', tickangle=-90, tickfont_size=9)
+    fig.update_yaxes(matches=None, showticklabels=True)
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    fig.update_traces(
+        marker_line=dict(width=0.5, color='black'),
+        hovertemplate="<b>%{x}</b><br>Padrón: %{y:,.0f}<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor='rgba(248,249,250,1)',
+        paper_bgcolor='rgba(248,249,250,1)',
+        title_font_size=20,
+        showlegend=False,
+        margin=dict(t=100, b=60),
+        font=dict(family="DejaVu Sans, sans-serif")
+    )
+    return fig
+
+@profiled()
+def plot_small_multiples(df, panel_col, x_col, y_col, title, filename, k=10, ncols=4,
+                         modos=MODOS, perfil="publicacion"):
+    """Página de paneles pequeños: un panel por geografía con su top-k"""
+    if df is None or df.empty:
+        print(f"⛔ Datos vacíos para {filename}")
+        return
+
+    print(f"📊 Generando página de paneles: {title}")
+
+    # ====================================================================
+    # VERSIÓN ESTÁTICA (Matplotlib)
+    # ====================================================================
+    if "estatico" in modos:
+        try:
+            plt, _, _ = static_backend()
+            cfg = RENDER_PROFILES[perfil]
+            paneles = _panel_tops(df, panel_col, y_col, k)
+            nrows = math.ceil(len(paneles) / ncols)
+            formato = plt.FuncFormatter(lambda x, loc: f"{x/1000:g}K" if x >= 1000 else f"{int(x)}")
+            with pooled_figure((4 * ncols, 3.2 * nrows), nrows, ncols) as (fig, axes):
+                axes = np.atleast_1d(axes).ravel()
+                # Barras simples de matplotlib: con decenas de paneles por página,
+                # seaborn y los efectos de trazo dominarían el tiempo de render
+                for ax, (panel, sub) in zip(axes, paneles):
+                    ax.bar(sub[x_col].astype(str), sub[y_col], color=DISTRICT_PALETTE[0],
+                           edgecolor='black', linewidth=0.5)
+                    ax.set_title(str(panel), fontsize=11, pad=4)
+                    ax.set_facecolor('#f8f9fa')
+                    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
+                    ax.tick_params(axis='x', labelrotation=90, labelsize=7)
+                    ax.tick_params(axis='y', labelsize=8)
+                    ax.yaxis.set_major_formatter(formato)
+                    for spine in ax.spines.values():
+                        spine.set_visible(False)
+                for ax in axes[len(paneles):]:
+                    ax.set_visible(False)
+
+                fig.suptitle(title, fontsize=16, fontweight='bold')
+
+                # Guardar estático
+                static_path = STATIC_DIR / filename
+                if cfg["tight_layout"]:
+                    fig.tight_layout()
+                fig.savefig(static_path, dpi=cfg["dpi"], bbox_inches=cfg["bbox_inches"])
+                print(f"✅ Gráfico estático guardado: {static_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico estático: {str(e)}")
+
+    # ====================================================================
+    # VERSIÓN INTERACTIVA (Plotly)
+    # ====================================================================
+    if "interactivo" in modos:
+        try:
+            fig = build_small_multiples_figure(df, panel_col, x_col, y_col, title, k, ncols)
+
+            # Guardar interactivo
+            interactive_filename = filename.replace('.png', '.html')
+            interactive_path = INTERACTIVE_DIR / interactive_filename
+            fig.write_html(interactive_path, include_plotlyjs='cdn')
+            print(f"✅ Gráfico interactivo guardado: {interactive_path}")
+        except Exception as e:
+            print(f"❌ Error en gráfico interactivo: {str(e)}")
+
+# Constructores de la figura interactiva de cada función de graficado
+FIGURE_BUILDERS = {
+    "plot_gender_comparison": build_gender_figure,
+    "plot_age_distribution": build_age_figure,
+    "plot_top_locations": build_top_figure,
+    "plot_small_multiples": build_small_multiples_figure,
+}
+
+def interactive_figure(job):
+    """Figura Plotly de un gráfico pendiente, sin escribir archivos"""
+    return FIGURE_BUILDERS[job["func"].__name__](job["df"], **job["kwargs"])
 
 # ========================================================================
-# FUNCIONES ESPECÍFICAS POR AÑO (MANTENIDAS IGUAL)
+# FUNCIONES ESPECÍFICAS POR AÑO
+# Cada función devuelve la lista de gráficos a renderizar (ver render.py)
 # ========================================================================
 
 def graph_2015():
-    print("\n📊 Generando gráficas para EIGE 2015...")
+    print("\n📊 Preparando gráficas para EIGE 2015...")
+    jobs = []
     
     # 1. Comparativa hombres vs mujeres por distrito
     df_adultos = load_data("poblacion_adulta_2015")
     if df_adultos is not None:
-        plot_gender_comparison(
+        jobs.append(chart_job(
+            plot_gender_comparison,
             df_adultos,
             x_col="distrito_nombre",
             male_col="hombres_18+",
             female_col="mujeres_18+",
             title="Población Adulta por Distrito y Sexo - Jalisco 2015",
             filename="adultos_sexo_distrito_2015.png"
-        )
+        ))
     
     # 2. Distribución etaria absoluta en Jalisco
     df_edad = load_data("distribucion_edad_absoluta_jalisco_2015")
     if df_edad is not None:
-        plot_age_distribution(
+        jobs.append(chart_job(
+            plot_age_distribution,
             df_edad,
             x_col="grupo_edad",
             y_col="poblacion",
             title="Distribución Poblacional por Edad - Jalisco 2015",
             filename="distribucion_edad_jalisco_2015.png"
-        )
+        ))
     
     # 3. Top distritos con mayor población adulta
     if df_adultos is not None:
-        df_adultos["total_adultos"] = df_adultos["hombres_18+"] + df_adultos["mujeres_18+"]
-        plot_top_locations(
-            df_adultos,
+        df_top = df_adultos.assign(
+            total_adultos=df_adultos["hombres_18+"] + df_adultos["mujeres_18+"]
+        )
+        jobs.append(chart_job(
+            plot_top_locations,
+            df_top,
             x_col="distrito_nombre",
             y_col="total_adultos",
             title="Distritos con Mayor Población Adulta - 2015",
             filename="top_distritos_2015.png"
-        )
+        ))
+    return jobs
 
 def graph_2020():
-    print("\n📊 Generando gráficas para INE 2020...")
+    print("\n📊 Preparando gráficas para INE 2020...")
+    jobs = []
     
     # 1. Comparativa hombres vs mujeres por distrito
     df_adultos = load_data("poblacion_adulta_2020")
     if df_adultos is not None:
-        plot_gender_comparison(
+        jobs.append(chart_job(
+            plot_gender_comparison,
             df_adultos,
             x_col="distrito_nombre",
             male_col="hombres_18+",
             female_col="mujeres_18+",
             title="Población Adulta por Distrito y Sexo - Jalisco 2020",
             filename="adultos_sexo_distrito_2020.png"
-        )
+        ))
 
     # 2. Resumen Jalisco
     df_jalisco = load_data("resumen_jalisco_2020")
     if df_jalisco is not None:
         # Traducir etiquetas
         df_jalisco['entidad'] = df_jalisco['entidad'].replace({14: "Jalisco"})
-        plot_gender_comparison(
+        jobs.append(chart_job(
+            plot_gender_comparison,
             df_jalisco,
             x_col="entidad",
             male_col="hombres_18+",
             female_col="mujeres_18+",
             title="Población Adulta Total - Jalisco 2020",
             filename="adultos_sexo_jalisco_2020.png"
-        )
+        ))
+    return jobs
 
 def graph_2025():
-    print("\n📊 Generando gráficas para INE 2025...")
+    print("\n📊 Preparando gráficas para INE 2025...")
+    jobs = []
     
     # 1. Comparativa hombres vs mujeres por distrito
     df_distritos = load_data("poblacion_adulta_distrito_2025")
     if df_distritos is not None:
-        plot_gender_comparison(
+        jobs.append(chart_job(
+            plot_gender_comparison,
             df_distritos,
             x_col="distrito_nombre",
             male_col="hombres_18+",
             female_col="mujeres_18+",
             title="Población Adulta por Distrito - Jalisco 2025",
             filename="adultos_sexo_distrito_2025.png"
-        )
+        ))
     
     # 2. Top municipios ZMG
     df_municipios = load_data("poblacion_adulta_municipio_2025")
@@ -553,35 +734,147 @@ def graph_2025():
         zmg_codes = [41, 120, 98, 99, 102, 46, 53] 
         df_zmg = df_municipios[df_municipios["clave_municipio"].isin(zmg_codes)]
         
-        plot_gender_comparison(
+        jobs.append(chart_job(
+            plot_gender_comparison,
             df_zmg,
             x_col="nombre_municipio",
             male_col="hombres_18+",
             female_col="mujeres_18+",
             title="Población Adulta en ZMG - 2025",
             filename="adultos_sexo_zmg_2025.png"
-        )
+        ))
         
         # 3. Enfoque especial en Guadalajara
         df_gdl = df_municipios[df_municipios["nombre_municipio"].str.contains("Guadalajara")]
         if not df_gdl.empty:
-            plot_gender_comparison(
+            jobs.append(chart_job(
+                plot_gender_comparison,
                 df_gdl,
                 x_col="nombre_municipio",
                 male_col="hombres_18+",
                 female_col="mujeres_18+",
                 title="Población Adulta en Guadalajara - 2025",
                 filename="adultos_sexo_gdl_2025.png"
+            ))
+    return jobs
+
+def graph_paged(por_pagina=12, k=10):
+    """Páginas para todos los municipios y sus secciones (generador: se construyen al consumirse)"""
+    print("\n📊 Preparando páginas por municipio y sección (INE 2025)...")
+
+    # 1. Población adulta por sexo de todos los municipios
+    df_municipios = load_data("poblacion_adulta_municipio_2025")
+    if df_municipios is not None:
+        # Clave 0: residentes en el extranjero
+        df_municipios = df_municipios[df_municipios["clave_municipio"] > 0]
+        paginas = paginate(df_municipios, "clave_municipio", por_pagina)
+        for i, pagina in enumerate(paginas, start=1):
+            yield chart_job(
+                plot_gender_comparison,
+                pagina,
+                x_col="nombre_municipio",
+                male_col="hombres_18+",
+                female_col="mujeres_18+",
+                title=f"Población Adulta por Municipio ({i}/{len(paginas)}) - 2025",
+                filename=f"municipios_sexo_2025_p{i:02d}.png"
             )
 
+    # 2. Top-k secciones de cada municipio, un panel por municipio
+    path = PATHS["ine_2025"]["prepared"]
+    if not path.exists():
+        print(f"❌ Archivo no encontrado: {path}")
+        return
+    df_secciones = pd.read_csv(
+        path, encoding="latin1",
+        usecols=["clave_municipio", "nombre_municipio", "seccion", "padron_electoral"]
+    )
+    df_secciones = df_secciones[df_secciones["clave_municipio"] > 0]
+    paginas = paginate(df_secciones, "clave_municipio", por_pagina)
+    for i, pagina in enumerate(paginas, start=1):
+        yield chart_job(
+            plot_small_multiples,
+            pagina,
+            panel_col="nombre_municipio",
+            x_col="seccion",
+            y_col="padron_electoral",
+            title=f"Top {k} Secciones por Padrón Electoral ({i}/{len(paginas)}) - 2025",
+            filename=f"secciones_padron_2025_p{i:02d}.png",
+            k=k
+        )
+
+def collect_jobs():
+    """Todos los gráficos del pipeline, en orden determinista"""
+    return graph_2015() + graph_2020() + graph_2025()
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Generación de gráficos estáticos e interactivos"
+    )
+    parser.add_argument(
+        "--modo",
+        default="todo",
+        choices=["todo", *MODOS],
+        help="Genera sólo gráficos estáticos, sólo interactivos o ambos"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos de render en paralelo (1 = secuencial; por defecto, núcleos disponibles)"
+    )
+    parser.add_argument(
+        "--perfil",
+        default="publicacion",
+        choices=list(RENDER_PROFILES),
+        help="Perfil de render: borrador (rápido) o publicación (300 dpi)"
+    )
+    parser.add_argument(
+        "--sin-cache",
+        action="store_true",
+        help="Renderiza todos los gráficos aunque sus entradas no hayan cambiado"
+    )
+    parser.add_argument(
+        "--paginado",
+        action="store_true",
+        help="Genera además páginas para todos los municipios y sus secciones"
+    )
+    parser.add_argument(
+        "--por-pagina",
+        type=int,
+        default=12,
+        help="Municipios por página en el modo paginado"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Secciones con mayor padrón a mostrar por municipio"
+    )
+    parser.add_argument(
+        "--lote",
+        type=int,
+        default=48,
+        help="Páginas que se envían al planificador de render por lote"
+    )
+    args = parser.parse_args()
+    modos = MODOS if args.modo == "todo" else (args.modo,)
+
+    # Asegurar carpetas de destino
+    STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    INTERACTIVE_DIR.mkdir(parents=True, exist_ok=True)
+    print(f"📂 Directorio de gráficos estáticos: {STATIC_DIR}")
+    print(f"📂 Directorio de gráficos interactivos: {INTERACTIVE_DIR}")
+
     print("="*70)
     print("INICIANDO GENERACIÓN DE VISUALIZACIONES".center(70))
     print("="*70)
     
-    graph_2015()
-    graph_2020()
-    graph_2025()
+    render_jobs(collect_jobs(), modos, workers=args.workers,
+                usar_cache=not args.sin_cache, perfil=args.perfil)
+
+    if args.paginado:
+        render_batches(graph_paged(args.por_pagina, args.top), modos, lote=args.lote,
+                       workers=args.workers, usar_cache=not args.sin_cache, perfil=args.perfil)
     
     print("\n" + "="*70)
     print(f"✅ Gráficos estáticos guardados en: {STATIC_DIR}".center(70))
@@ -589,4 +882,4 @@ def main():
     print("="*70)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,155 @@
+# Agregados jerárquicos del padrón: sección → municipio → distrito → entidad
+#
+# La jerarquía geográfica de un corte se representa como una matriz dispersa
+# de incidencia H (grupo × sección) que apila los tres niveles, guardada como
+# el renglón de grupo de cada sección en cada nivel (un 1 por sección y
+# nivel). Todos los niveles de una medida salen de un solo producto H · x,
+# resuelto con np.bincount sin cargar scipy, que en un proceso nuevo cuesta
+# más que el cálculo (sumas de enteros muy por debajo de 2⁵³: exactas). Un
+# municipio puede cruzar distritos, por eso cada nivel se construye desde la
+# sección y no encadenando niveles.
+#
+# Los agregados se guardan por corte en output/rollups/ junto con el tamaño y
+# mtime de su fuente: la exploración y el resumen 2025 comparten el cálculo y
+# el segundo en llegar ni siquiera lee el CSV.
+#
+#   python -m src.scripts.hierarchy                 # padrón preparado 2025
+#   python -m src.scripts.hierarchy --corte 2024-06 # corte del almacén de cortes
+
+import argparse
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from src.config.settings import ABSTRACT_DIR, PATHS, ROLLUPS_DIR, SNAPSHOTS_DIR
+from src.scripts.profiling import add_rows
+
+# Versión del formato de la caché (forma parte de la firma)
+ROLLUP_VERSION = 1
+
+NIVELES = {
+    "municipio": ["clave_entidad", "clave_municipio"],
+    "distrito": ["clave_entidad", "clave_distrito"],
+    "entidad": ["clave_entidad"],
+}
+MEDIDAS = [
+    "padron_hombres", "padron_mujeres", "padron_nobinario", "padron_electoral",
+    "lista_hombres", "lista_mujeres", "lista_nobinario", "lista_nominal",
+]
+NOMBRES = {"municipio": "nombre_municipio"}
+
+# Agregados ya cargados en este proceso: corte → (firma, niveles)
+_CACHE = {}
+
+
+def _pack(df, columnas):
+    """Llave int64 de un nivel (entidad en los bits altos)"""
+    llave = np.zeros(len(df), dtype=np.int64)
+    for col in columnas:
+        llave = (llave << 24) | df[col].to_numpy(np.int64)
+    return llave
+
+
+def build_hierarchy(df):
+    """Incidencia apilada ((niveles × secciones) renglones de grupo, número de grupos) y la tabla de llaves de cada nivel"""
+    renglones, grupos = [], {}
+    inicio = 0
+    secciones = np.arange(len(df))
+    for nivel, columnas in NIVELES.items():
+        codigos, unicos = pd.factorize(_pack(df, columnas), sort=True)
+        renglones.append(codigos + inicio)
+        # Primera fila de cada grupo: sus llaves (y nombre, si el nivel lo tiene)
+        primera = np.full(len(unicos), len(df))
+        np.minimum.at(primera, codigos, secciones)
+        etiquetas = columnas + ([NOMBRES[nivel]] if NOMBRES.get(nivel) in df.columns else [])
+        grupos[nivel] = (slice(inicio, inicio + len(unicos)), df[etiquetas].iloc[primera].reset_index(drop=True))
+        inicio += len(unicos)
+    return (np.vstack(renglones), inicio), grupos
+
+
+def rollup(df, medidas=None, jerarquia=None):
+    """Sumas de las medidas en todos los niveles con un producto H · x por medida"""
+    medidas = [c for c in (medidas or MEDIDAS) if c in df.columns]
+    (renglones, n_grupos), grupos = jerarquia or build_hierarchy(df)
+    valores = df[medidas].to_numpy(np.int64)
+    sumas = np.zeros((n_grupos, len(medidas)), np.int64)
+    for j in range(len(medidas)):
+        pesos = np.tile(valores[:, j], len(renglones))
+        sumas[:, j] = np.bincount(renglones.ravel(), weights=pesos, minlength=n_grupos)
+    return {
+        nivel: pd.concat([etiquetas, pd.DataFrame(sumas[filas], columns=medidas)], axis=1)
+        for nivel, (filas, etiquetas) in grupos.items()
+    }
+
+
+def _source(corte):
+    """Archivo que define un corte: el padrón preparado o el catálogo del almacén"""
+    return PATHS["ine_2025"]["prepared"] if corte == "2025" else SNAPSHOTS_DIR / "catalogo.json"
+
+
+def _signature(corte):
+    st = _source(corte).stat()
+    return (ROLLUP_VERSION, str(corte), st.st_size, st.st_mtime_ns)
+
+
+def _load_cut(corte):
+    if corte == "2025":
+        df = pd.read_csv(PATHS["ine_2025"]["prepared"], encoding="latin1")
+    else:
+        from src.scripts.padron_snapshots import reconstruct
+        df = reconstruct(corte)
+    add_rows(len(df))
+    return df
+
+
+def rollups(corte="2025", df=None):
+    """Agregados por nivel de un corte ('2025' o AAAA-MM), desde la caché si la fuente no cambió
+
+    `df` evita releer el corte si quien llama ya lo tiene en memoria.
+    """
+    corte = str(corte)
+    firma = _signature(corte)
+    if corte in _CACHE and _CACHE[corte][0] == firma:
+        return _CACHE[corte][1]
+
+    path = ROLLUPS_DIR / f"rollups_{corte}.pkl"
+    niveles = None
+    if path.exists():
+        with open(path, "rb") as f:
+            guardado = pickle.load(f)
+        if guardado.get("firma") == firma:
+            niveles = guardado["niveles"]
+            print(f"♻️ Agregados {corte} desde {path.name}")
+    if niveles is None:
+        niveles = rollup(_load_cut(corte) if df is None else df)
+        ROLLUPS_DIR.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: la exploración y el resumen pueden correr a la vez
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"firma": firma, "niveles": niveles}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        print(f"🧮 Agregados {corte} calculados y guardados en {path.name}")
+    _CACHE[corte] = (firma, niveles)
+    return niveles
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Agregados del padrón por municipio, distrito y entidad"
+    )
+    parser.add_argument(
+        "--corte",
+        default="2025",
+        help="2025 (padrón preparado) o AAAA-MM del almacén de cortes"
+    )
+    args = parser.parse_args()
+
+    ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    for nivel, tabla in rollups(args.corte).items():
+        salida = ABSTRACT_DIR / f"agregados_{nivel}_{args.corte}.csv"
+        tabla.to_csv(salida, index=False)
+        print(f"✔️ {len(tabla)} filas por {nivel} en {salida.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Artefactos de modelos de proyección memoizados por hash de entrada
+
+import hashlib
+import json
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.config.settings import MODELS_DIR
+
+# Versión del formato del artefacto (forma parte de la llave)
+ARTIFACT_VERSION = 1
+
+# Contadores de uso de la caché
+CACHE_STATS = {"hits": 0, "misses": 0}
+
+
+def hash_inputs(hist_df, metrics, id_col, config):
+    """Llave SHA-256 de las series de entrada y la configuración del modelo"""
+    data = hist_df[[id_col, "AÑO", *metrics]].sort_values([id_col, "AÑO"])
+    h = hashlib.sha256()
+    h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    h.update(json.dumps({**config, "version": ARTIFACT_VERSION}, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def fit_linear(hist_df, metrics, id_col="REGIÓN"):
+    """Ajusta por mínimos cuadrados una recta por serie, sólo sobre sus años observados
+
+    Las series con el mismo patrón de huecos comparten una pseudoinversa; una
+    serie con menos de dos años observados queda sin recta (NaN).
+    """
+    wide = hist_df.pivot(index="AÑO", columns=id_col, values=metrics)
+    series = wide[metrics[0]].columns
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([metrics, series]))
+    years = wide.index.to_numpy(dtype=float)
+    Y = wide.astype("Float64").to_numpy(dtype=float, na_value=np.nan)  # (años, métrica·serie)
+
+    X = np.column_stack([np.ones_like(years), years])
+    beta = np.full((2, Y.shape[1]), np.nan)
+    mse, r2, resid_std = (np.full(Y.shape[1], np.nan) for _ in range(3))
+    patrones, grupo = np.unique(~np.isnan(Y).T, axis=0, return_inverse=True)
+    for k, filas in enumerate(patrones):
+        cols = np.flatnonzero(grupo.ravel() == k)
+        n = int(filas.sum())
+        if n < 2:
+            continue
+        Xk, Yk = X[filas], Y[np.ix_(filas, cols)]
+        beta[:, cols] = np.linalg.pinv(Xk) @ Yk
+        resid = Yk - Xk @ beta[:, cols]
+        mse[cols] = (resid ** 2).mean(axis=0)
+        ss_tot = ((Yk - Yk.mean(axis=0)) ** 2).sum(axis=0)
+        r2[cols] = np.where(ss_tot > 0, 1 - (resid ** 2).sum(axis=0) / np.where(ss_tot > 0, ss_tot, 1), 1.0)
+        resid_std[cols] = resid.std(axis=0, ddof=min(2, n - 1))
+
+    shape = (len(metrics), len(series))
+    return {
+        "series": [str(s) for s in series],
+        "metrics": list(metrics),
+        "intercept": beta[0].reshape(shape).tolist(),
+        "slope": beta[1].reshape(shape).tolist(),
+        "r2": r2.reshape(shape).tolist(),
+        "mse": mse.reshape(shape).tolist(),
+        "resid_std": resid_std.reshape(shape).tolist(),
+        "n_obs": int(len(years)),
+        "years": [int(years.min()), int(years.max())],
+    }
+
+
+def load_or_fit(hist_df, metrics, id_col="REGIÓN", config=None):
+    """Carga el artefacto si la llave ya existe; si no, ajusta y lo persiste"""
+    config = config or {"modelo": "lineal", "x": "AÑO"}
+    key = hash_inputs(hist_df, metrics, id_col, config)
+    path = MODELS_DIR / f"{config['modelo']}_{key[:16]}.json"
+
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            artifact = json.load(f)
+        if artifact.get("key") == key:
+            CACHE_STATS["hits"] += 1
+            return artifact
+
+    CACHE_STATS["misses"] += 1
+    artifact = fit_linear(hist_df, metrics, id_col)
+    artifact.update({
+        "key": key,
+        "id_col": id_col,
+        "config": config,
+        "version": ARTIFACT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+    })
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+    return artifact
+
+
+def score(artifact, years):
+    """Evalúa los coeficientes guardados en nuevos años, sin reajustar"""
+    years = np.asarray(years)
+    intercept = np.asarray(artifact["intercept"])   # (métrica, serie)
+    slope = np.asarray(artifact["slope"])
+    pred = intercept[:, :, None] + slope[:, :, None] * years[None, None, :]
+
+    n_series = len(artifact["series"])
+    out = pd.DataFrame({
+        "AÑO": np.tile(years, n_series),
+        artifact["id_col"]: np.repeat(artifact["series"], len(years)),
+    })
+    for i, m in enumerate(artifact["metrics"]):
+        # Series con huecos en el histórico no tienen recta: NA en vez de un entero inválido
+        out[m] = pd.Series(np.round(pred[i].ravel())).astype("Int64")
+    return out
+
+
+def cache_summary():
+    """Línea de resumen con los contadores de la caché"""
+    return f"🗃️ Caché de modelos: {CACHE_STATS['hits']} aciertos, {CACHE_STATS['misses']} fallos"
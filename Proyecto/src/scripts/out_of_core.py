@@ -0,0 +1,173 @@
+# Procesamiento fuera de memoria (limpieza → exploración → resumen del padrón)
+#
+# Con un presupuesto de memoria (`--memory-budget 512MB` o la variable
+# POBLACION_MEMORY_BUDGET, que heredan los procesos hijos) el padrón 2025 se
+# lee por particiones del tamaño que cabe en el presupuesto. Cada partición
+# produce agregados parciales (sumas y conteos enteros) que se derraman a
+# disco y al final se combinan sumándolos, por lo que los conteos coinciden
+# exactamente con el camino en memoria. EIGE 2015 e INE 2020 son tablas por
+# distrito (≈300 filas nacionales) y siguen en memoria.
+
+import os
+import re
+import tempfile
+from pathlib import Path
+import pandas as pd
+from src.scripts.profiling import add_rows
+
+MEMORY_BUDGET_ENV = "POBLACION_MEMORY_BUDGET"
+
+# Copias simultáneas de una partición durante su procesamiento (lectura,
+# normalización de textos, filtros), usado para dimensionar las particiones
+FACTOR_MEMORIA = 4
+FILAS_MINIMAS = 1_000
+
+_UNIDADES = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024**2, "MB": 1024**2, "G": 1024**3, "GB": 1024**3}
+
+
+def parse_budget(texto):
+    """Convierte '512MB', '2G' o '800000' en bytes"""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*", str(texto).upper())
+    if not m:
+        raise ValueError(f"❌ Presupuesto de memoria inválido: {texto} (use p.ej. 512MB o 2GB)")
+    return int(float(m.group(1)) * _UNIDADES[m.group(2)])
+
+
+def set_memory_budget(texto):
+    """Activa el modo por particiones en este proceso y sus hijos (None no cambia nada)"""
+    if texto:
+        os.environ[MEMORY_BUDGET_ENV] = str(parse_budget(texto))
+
+
+def memory_budget():
+    """Presupuesto activo en bytes, o None para procesar todo en memoria"""
+    texto = os.environ.get(MEMORY_BUDGET_ENV)
+    return parse_budget(texto) if texto else None
+
+
+def partition_rows(path, budget, encoding="utf-8", muestra=5_000):
+    """Filas por partición que caben en el presupuesto, estimadas con una muestra"""
+    sample = pd.read_csv(path, nrows=muestra, encoding=encoding)
+    por_fila = sample.memory_usage(deep=True).sum() / max(len(sample), 1)
+    return max(FILAS_MINIMAS, int(budget // (por_fila * FACTOR_MEMORIA)))
+
+
+def read_partitions(path, budget, encoding="utf-8"):
+    """Itera el CSV en particiones dimensionadas al presupuesto"""
+    filas = partition_rows(path, budget, encoding)
+    print(f"🧩 {Path(path).name}: particiones de {filas:,} filas (presupuesto {budget / 1024**2:,.0f} MB)")
+    for chunk in pd.read_csv(path, encoding=encoding, chunksize=filas):
+        add_rows(len(chunk))
+        yield chunk
+
+
+def spill(parcial, directorio, nombre, i):
+    """Derrama un agregado parcial a disco (pickle conserva tipos exactos)"""
+    parcial.to_pickle(Path(directorio) / f"{nombre}_{i:06d}.pkl")
+
+
+def merge_spilled(directorio, nombre, sort=True):
+    """Suma exacta de los agregados parciales `nombre`, indexados por su llave
+
+    Se combinan de uno en uno para que la memoria dependa del número de
+    llaves y no del número de particiones.
+    """
+    total = None
+    for path in sorted(Path(directorio).glob(f"{nombre}_*.pkl")):
+        parte = pd.read_pickle(path)
+        if total is None:
+            total = parte
+        else:
+            niveles = list(range(parte.index.nlevels))
+            total = pd.concat([total, parte]).groupby(level=niveles, sort=sort).sum()
+    return total
+
+
+# ========================================================================
+# ETAPAS POR PARTICIONES (mismas salidas que el camino en memoria)
+# ========================================================================
+
+def clean_ine_2025_partitioned(raw_path, prepared_path, budget):
+    """Limpia el padrón nacional partición por partición, escribiendo al vuelo"""
+    from src.scripts.cleaner import normalize_ine_2025
+    from src.scripts.constraints import check, combine, enforce, quality_mode
+    from src.scripts.store import connect, create_indexes, store_enabled, write_table
+
+    guardar = store_enabled()
+    revisar = quality_mode() != "omitir"
+    resultados, filas = [], 0
+    with open(prepared_path, "w", encoding="latin1", newline="") as f:
+        for i, chunk in enumerate(read_partitions(raw_path, budget, encoding="latin1")):
+            chunk = normalize_ine_2025(chunk)
+            if revisar:
+                resultados.append(check(chunk, "ine_2025", inicio=filas))
+                filas += len(chunk)
+            chunk.to_csv(f, index=False, header=(i == 0))
+            if guardar:
+                write_table(chunk, "ine_2025", reemplazar=(i == 0), indexar=False)
+    if resultados:
+        # El archivo ya se escribió por partes: en modo estricto se retira si falla
+        try:
+            enforce(combine(resultados), "ine_2025")
+        except ValueError:
+            prepared_path.unlink(missing_ok=True)
+            raise
+    if guardar:
+        # Índices al final: más rápido que mantenerlos en cada inserción
+        with connect() as con:
+            create_indexes(con, "ine_2025", prepared_path)
+        print("🗄️ Tabla ine_2025 guardada en la base embebida")
+
+
+def explorer_2025_partitioned(budget):
+    """explorer_2025 con agregados parciales derramados a disco"""
+    from src.scripts.explorer_analysis import (
+        ADULTOS_2025,
+        DISTRIBUCIONES_2025,
+        PATHS,
+        REQUIRED_2025,
+        add_distrito_name,
+        group_by_distrito_name,
+        save_metadata,
+        validate_columns,
+        write_adultos_2025,
+        write_distribution,
+    )
+
+    path = PATHS["ine_2025"]["prepared"]
+    columnas = adultos = list(ADULTOS_2025)
+    total = 0
+    with tempfile.TemporaryDirectory(prefix="derrame_explorer_2025_") as directorio:
+        for i, df in enumerate(read_partitions(path, budget, encoding="latin1")):
+            if i == 0:
+                validate_columns(df, REQUIRED_2025, "ine_2025")
+            total += len(df)
+            df = add_distrito_name(df, code_col="clave_distrito")
+            df = group_by_distrito_name(df, code_col="clave_distrito")
+            columnas = df.columns
+
+            spill(df.groupby("distrito_nombre")[adultos].sum(), directorio, "distrito", i)
+            spill(df.groupby(["clave_municipio", "nombre_municipio"])[adultos].sum(), directorio, "municipio", i)
+            for column in DISTRIBUCIONES_2025:
+                spill(df[column].value_counts(), directorio, column, i)
+
+        print(f"🔍 Datos 2025 procesados por particiones ({total} filas)")
+        write_adultos_2025(
+            merge_spilled(directorio, "distrito").reset_index(),
+            merge_spilled(directorio, "municipio").reset_index(),
+        )
+        for column, output_name in DISTRIBUCIONES_2025.items():
+            write_distribution(merge_spilled(directorio, column), column, output_name)
+
+    save_metadata(pd.DataFrame(columns=columnas), "ine2025", filas=total)
+
+
+def sumas_region_2025_partitioned(budget):
+    """Padrón por región sumando partición por partición"""
+    from src.scripts.abstract import PATHS, sumas_region_2025
+
+    with tempfile.TemporaryDirectory(prefix="derrame_resumen_2025_") as directorio:
+        for i, df in enumerate(read_partitions(PATHS["ine_2025"]["prepared"], budget, encoding="latin1")):
+            spill(sumas_region_2025(df), directorio, "regiones", i)
+        # Conserva el orden de las regiones
+        return merge_spilled(directorio, "regiones", sort=False)
@@ -0,0 +1,176 @@
+# Cambios por sección entre dos cortes del padrón (formato ine_2025)
+#
+# Une ambos cortes por (clave_entidad, clave_distrito, clave_municipio,
+# seccion) con un sort-merge sobre la llave empacada en int64 y calcula las
+# diferencias de todos los conteos padron_*/lista_* de una sola vez con
+# numpy. Produce una tabla compacta de cambios (altas, bajas y secciones que
+# cambiaron), las secciones con mayor movimiento por municipio y resúmenes por
+# distrito y municipio.
+#
+#   python -m src.scripts.padron_delta 2024-05 2024-06            # cortes del almacén
+#   python -m src.scripts.padron_delta previo.csv actual.csv --top 5
+
+import argparse
+import re
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config.settings import ABSTRACT_DIR
+from src.scripts.padron_snapshots import pack_keys, reconstruct, unpack_keys
+
+# Conteos que se comparan (los presentes en ambos cortes)
+PREFIJOS = ("padron_", "lista_")
+MEDIDA = "padron_electoral"
+ESTADOS = ["cambio", "alta", "baja"]
+
+
+def load_cut(origen):
+    """Corte desde un CSV o, si es AAAA-MM, desde el almacén de cortes"""
+    if re.fullmatch(r"\d{4}-\d{2}", str(origen)):
+        return reconstruct(origen)
+    return pd.read_csv(origen, encoding="latin1")
+
+
+def _sorted_arrays(df, columnas, nombre):
+    """Llaves empacadas ordenadas y conteos alineados"""
+    keys = pack_keys(df)
+    orden = np.argsort(keys, kind="stable")
+    keys = keys[orden]
+    if len(keys) > 1 and (np.diff(keys) == 0).any():
+        raise ValueError(f"❌ Secciones duplicadas en el corte {nombre}")
+    return keys, df[columnas].to_numpy(dtype=np.int64)[orden]
+
+
+def compare_cuts(previo, actual):
+    """Tabla de cambios por sección: estado, conteo previo/actual de MEDIDA y deltas"""
+    columnas = [c for c in actual.columns if c.startswith(PREFIJOS) and c in previo.columns]
+    if MEDIDA not in columnas:
+        raise ValueError(f"❌ Ambos cortes deben tener {MEDIDA}")
+    medida = columnas.index(MEDIDA)
+
+    kp, vp = _sorted_arrays(previo, columnas, "previo")
+    ka, va = _sorted_arrays(actual, columnas, "actual")
+    # Sort-merge: ambos lados ya están ordenados por llave
+    pos = np.searchsorted(ka, kp).clip(max=len(ka) - 1) if len(ka) else np.zeros(len(kp), np.int64)
+    en_ambos = ka[pos] == kp if len(ka) else np.zeros(len(kp), bool)
+    ip, ia = np.flatnonzero(en_ambos), pos[en_ambos]
+    bajas = np.flatnonzero(~en_ambos)
+    altas = np.ones(len(ka), bool)
+    altas[ia] = False
+    altas = np.flatnonzero(altas)
+
+    delta = va[ia] - vp[ip]
+    cambian = (delta != 0).any(axis=1)
+    ip, ia, delta = ip[cambian], ia[cambian], delta[cambian]
+    n_cambian, n_altas, n_bajas = len(ip), len(altas), len(bajas)
+
+    keys = np.concatenate([kp[ip], ka[altas], kp[bajas]])
+    # La llave empacada ordena igual que LLAVE: basta ordenar el arreglo
+    orden = np.argsort(keys, kind="stable")
+    antes = np.concatenate([vp[ip, medida], np.zeros(n_altas, np.int64), vp[bajas, medida]])
+    despues = np.concatenate([va[ia, medida], va[altas, medida], np.zeros(n_bajas, np.int64)])
+    deltas = np.concatenate([delta, va[altas], -vp[bajas]])[orden]
+    codigos = np.repeat(np.arange(3, dtype=np.int8), [n_cambian, n_altas, n_bajas])[orden]
+
+    cambios = unpack_keys(keys[orden])
+    cambios["estado"] = pd.Categorical.from_codes(codigos, ESTADOS)
+    cambios[f"{MEDIDA}_previo"] = antes[orden]
+    cambios[f"{MEDIDA}_actual"] = despues[orden]
+    for i, col in enumerate(columnas):
+        cambios[f"delta_{col}"] = deltas[:, i]
+    cambios[f"cambio_{MEDIDA}_%"] = (
+        cambios[f"delta_{MEDIDA}"] / cambios[f"{MEDIDA}_previo"].where(cambios[f"{MEDIDA}_previo"] > 0) * 100
+    ).round(2)
+    return cambios
+
+
+def top_movers(cambios, k=10):
+    """Las k secciones con mayor |delta| de MEDIDA en cada municipio"""
+    orden = cambios.assign(_abs=cambios[f"delta_{MEDIDA}"].abs()).sort_values(
+        ["clave_entidad", "clave_municipio", "_abs", "seccion"],
+        ascending=[True, True, False, True], kind="stable"
+    )
+    top = orden.groupby(["clave_entidad", "clave_municipio"], sort=False).head(k).drop(columns="_abs")
+    return top.assign(lugar=top.groupby(["clave_entidad", "clave_municipio"]).cumcount() + 1)
+
+
+def summarize(cambios, previo, actual, nivel):
+    """Resumen por distrito o municipio: totales de ambos cortes, altas, bajas y secciones con cambio"""
+    grupo = ["clave_entidad", "clave_distrito" if nivel == "distrito" else "clave_municipio"]
+    totales = pd.concat({
+        f"{MEDIDA}_previo": previo.groupby(grupo)[MEDIDA].sum(),
+        f"{MEDIDA}_actual": actual.groupby(grupo)[MEDIDA].sum(),
+        "secciones_previo": previo.groupby(grupo).size(),
+        "secciones_actual": actual.groupby(grupo).size(),
+    }, axis=1).fillna(0).astype("int64")
+    conteos = cambios.groupby(grupo)["estado"].value_counts().unstack(fill_value=0)
+    resumen = totales.join(conteos.reindex(columns=["alta", "baja", "cambio"], fill_value=0)).fillna(0)
+    resumen = resumen.rename(columns={"alta": "altas", "baja": "bajas", "cambio": "con_cambio"})
+    resumen[["altas", "bajas", "con_cambio"]] = resumen[["altas", "bajas", "con_cambio"]].astype("int64")
+    resumen[f"delta_{MEDIDA}"] = resumen[f"{MEDIDA}_actual"] - resumen[f"{MEDIDA}_previo"]
+    resumen[f"cambio_{MEDIDA}_%"] = (
+        resumen[f"delta_{MEDIDA}"] / resumen[f"{MEDIDA}_previo"].where(resumen[f"{MEDIDA}_previo"] > 0) * 100
+    ).round(2)
+
+    if nivel == "municipio" and "nombre_municipio" in actual.columns:
+        columnas = grupo + ["nombre_municipio"]
+        nombres = pd.concat([previo[columnas], actual[columnas]]).drop_duplicates(grupo, keep="last")
+        nombres = nombres.set_index(grupo)["nombre_municipio"]
+        resumen.insert(0, "nombre_municipio", nombres.reindex(resumen.index))
+    return resumen.reset_index()
+
+
+def delta_report(origen_previo, origen_actual, k=10, destino=None):
+    """Compara dos cortes y guarda cambios, mayores movimientos y resúmenes en destino"""
+    destino = Path(destino or ABSTRACT_DIR)
+    destino.mkdir(parents=True, exist_ok=True)
+    etiqueta = f"{Path(str(origen_previo)).stem}_{Path(str(origen_actual)).stem}".replace("padron_", "")
+
+    inicio = time.perf_counter()
+    previo, actual = load_cut(origen_previo), load_cut(origen_actual)
+    lectura = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    cambios = compare_cuts(previo, actual)
+    salidas = {
+        "cambios_secciones": cambios,
+        "mayores_movimientos_municipio": top_movers(cambios, k),
+        "resumen_cambios_distrito": summarize(cambios, previo, actual, "distrito"),
+        "resumen_cambios_municipio": summarize(cambios, previo, actual, "municipio"),
+    }
+    calculo = time.perf_counter() - inicio
+
+    for nombre, df in salidas.items():
+        df.to_csv(destino / f"{nombre}_{etiqueta}.csv", index=False, encoding="utf-8")
+    estados = cambios["estado"].value_counts()
+    print(f"🔀 {len(previo):,} → {len(actual):,} secciones: "
+          f"{estados.get('alta', 0)} altas, {estados.get('baja', 0)} bajas, {estados.get('cambio', 0)} con cambio")
+    print(f"⏱️ Lectura {lectura:.2f} s, comparación {calculo:.2f} s")
+    print(f"✅ Cambios guardados en {destino} (*_{etiqueta}.csv)")
+    return salidas
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cambios por sección entre dos cortes del padrón"
+    )
+    parser.add_argument("previo", help="CSV del corte previo o AAAA-MM del almacén de cortes")
+    parser.add_argument("actual", help="CSV del corte actual o AAAA-MM del almacén de cortes")
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Secciones con mayor movimiento por municipio"
+    )
+    parser.add_argument(
+        "--destino",
+        type=Path,
+        default=None,
+        help="Directorio de salida (por defecto output/abstract)"
+    )
+    args = parser.parse_args()
+    delta_report(args.previo, args.actual, args.top, args.destino)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# Almacén de cortes del padrón por fecha de corte, con deltas por sección
+#
+# Cada corte (padron_AAAA-MM.csv en PADRON_CUTS_DIR, formato ine_2025) se
+# guarda como la diferencia contra el corte anterior: secciones dadas de baja,
+# secciones nuevas con sus valores y, para las demás, el cambio de cada conteo
+# en el entero más pequeño que lo contiene. Como la mayoría de las secciones
+# cambia en unos cuantos electores, decenas de cortes ocupan poco más que uno.
+# Cada `CADA_BASE` cortes se guarda un corte completo para acotar la cadena de
+# deltas al reconstruir. Los nombres (entidad, cabecera, municipio) se guardan
+# una sola vez por sección en `secciones.csv`.
+
+import argparse
+import json
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config.settings import PADRON_CUTS_DIR, SNAPSHOTS_DIR
+
+# Llave de una sección y bits con que se empaca en un int64
+LLAVE = ["clave_entidad", "clave_distrito", "clave_municipio", "seccion"]
+BITS = {"clave_entidad": 7, "clave_distrito": 14, "clave_municipio": 16, "seccion": 26}
+
+# Un corte completo cada tantos cortes
+CADA_BASE = 12
+
+CATALOGO = "catalogo.json"
+DIMENSION = "secciones.csv"
+
+
+# ========================================================================
+# LLAVES Y TIPOS
+# ========================================================================
+
+def pack_keys(df):
+    """Empaca la llave de cada sección en un int64 que ordena igual que la tupla"""
+    packed = np.zeros(len(df), dtype=np.int64)
+    for col in LLAVE:
+        valores = df[col].to_numpy(dtype=np.int64)
+        if len(valores) and (valores.min() < 0 or valores.max() >= 1 << BITS[col]):
+            raise ValueError(f"❌ {col} fuera de rango para la llave empacada ({BITS[col]} bits)")
+        packed = (packed << BITS[col]) | valores
+    return packed
+
+
+def unpack_keys(packed):
+    """Columnas de llave a partir de los int64 empacados"""
+    columnas = {}
+    for col in reversed(LLAVE):
+        columnas[col] = packed & ((1 << BITS[col]) - 1)
+        packed = packed >> BITS[col]
+    return pd.DataFrame({col: columnas[col] for col in LLAVE})
+
+
+def _compact(valores):
+    """El entero con signo más pequeño que contiene todos los valores"""
+    if valores.size == 0:
+        return valores.astype(np.int8)
+    maximo = int(np.abs(valores).max())
+    for dtype in (np.int8, np.int16, np.int32):
+        if maximo <= np.iinfo(dtype).max:
+            return valores.astype(dtype)
+    return valores.astype(np.int64)
+
+
+def _period(texto):
+    return str(pd.Period(texto, freq="M"))
+
+
+# ========================================================================
+# CATÁLOGO
+# ========================================================================
+
+def load_catalog(directorio=None):
+    """Cortes guardados y columnas de conteo (vacío si aún no hay almacén)"""
+    path = Path(directorio or SNAPSHOTS_DIR) / CATALOGO
+    if not path.exists():
+        return {"cortes": [], "columnas": None, "cada_base": CADA_BASE}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_catalog(catalogo, directorio):
+    with open(Path(directorio) / CATALOGO, "w", encoding="utf-8") as f:
+        json.dump(catalogo, f, indent=1)
+
+
+def _read_cut(path, columnas=None):
+    """Lee un corte: llaves empacadas ordenadas, conteos (n × columnas) y nombres"""
+    df = pd.read_csv(path, encoding="latin1")
+    if columnas is None:
+        columnas = [c for c in df.columns if c not in LLAVE and pd.api.types.is_integer_dtype(df[c])]
+    faltantes = set(LLAVE + columnas) - set(df.columns)
+    if faltantes:
+        raise ValueError(f"❌ Columnas faltantes en {Path(path).name}: {sorted(faltantes)}")
+
+    keys = pack_keys(df)
+    orden = np.argsort(keys, kind="stable")
+    keys = keys[orden]
+    if len(keys) > 1 and (np.diff(keys) == 0).any():
+        raise ValueError(f"❌ Secciones duplicadas en {Path(path).name}")
+    valores = df[columnas].to_numpy(dtype=np.int64)[orden]
+    textos = [c for c in df.columns if c not in LLAVE and c not in columnas]
+    nombres = df[textos].iloc[orden].reset_index(drop=True).assign(llave=keys)
+    return keys, valores, nombres, columnas
+
+
+# ========================================================================
+# INGESTA
+# ========================================================================
+
+def ingest(archivos=None, directorio=None, cada_base=CADA_BASE):
+    """Agrega al almacén los cortes nuevos (posteriores al último guardado)"""
+    directorio = Path(directorio or SNAPSHOTS_DIR)
+    directorio.mkdir(parents=True, exist_ok=True)
+    if archivos is None:
+        archivos = sorted(PADRON_CUTS_DIR.glob("padron_*.csv"))
+    archivos = sorted(archivos, key=lambda p: _period(Path(p).stem.replace("padron_", "")))
+
+    catalogo = load_catalog(directorio)
+    guardados = [c["corte"] for c in catalogo["cortes"]]
+    previo = reconstruct_arrays(guardados[-1], directorio) if guardados else None
+    dimension_path = directorio / DIMENSION
+    dimension = pd.read_csv(dimension_path, encoding="utf-8") if dimension_path.exists() else None
+
+    nuevos = []
+    for path in archivos:
+        corte = _period(Path(path).stem.replace("padron_", ""))
+        if corte in guardados:
+            continue
+        if guardados and corte < guardados[-1]:
+            raise ValueError(f"❌ El corte {corte} es anterior al último guardado ({guardados[-1]})")
+
+        keys, valores, nombres, columnas = _read_cut(path, catalogo["columnas"])
+        catalogo["columnas"] = columnas
+        catalogo.setdefault("orden", list(pd.read_csv(path, nrows=0, encoding="latin1").columns))
+        es_base = previo is None or len(guardados) % cada_base == 0
+        if es_base:
+            datos = {"keys": keys, "valores": _compact(valores)}
+        else:
+            keys_prev, valores_prev = previo
+            comunes, idx_prev, idx_cur = np.intersect1d(keys_prev, keys, assume_unique=True, return_indices=True)
+            altas = np.setdiff1d(np.arange(len(keys)), idx_cur, assume_unique=True)
+            datos = {
+                "bajas": np.setdiff1d(keys_prev, comunes, assume_unique=True),
+                "altas_keys": keys[altas],
+                "altas_valores": _compact(valores[altas]),
+                "delta": _compact(valores[idx_cur] - valores_prev[idx_prev]),
+            }
+        np.savez_compressed(directorio / f"corte_{corte}.npz", **datos)
+
+        # Nombres: se conservan los más recientes de cada sección
+        dimension = nombres if dimension is None else pd.concat([dimension, nombres])
+        dimension = dimension.drop_duplicates("llave", keep="last")
+
+        catalogo["cortes"].append({"corte": corte, "base": es_base, "filas": int(len(keys))})
+        guardados.append(corte)
+        previo = (keys, valores)
+        nuevos.append(corte)
+
+    if nuevos:
+        dimension.sort_values("llave").to_csv(dimension_path, index=False, encoding="utf-8")
+        catalogo["cada_base"] = cada_base
+        _save_catalog(catalogo, directorio)
+    print(f"✅ {len(nuevos)} corte(s) nuevo(s); {len(guardados)} en {directorio}")
+    return nuevos
+
+
+# ========================================================================
+# RECONSTRUCCIÓN
+# ========================================================================
+
+def _apply_delta(keys_prev, valores_prev, datos):
+    """Corte siguiente a partir del anterior y su delta"""
+    siguen = ~np.isin(keys_prev, datos["bajas"], assume_unique=True)
+    keys = np.concatenate([keys_prev[siguen], datos["altas_keys"]])
+    valores = np.concatenate([
+        valores_prev[siguen] + datos["delta"].astype(np.int64),
+        datos["altas_valores"].astype(np.int64).reshape(-1, valores_prev.shape[1]),
+    ])
+    orden = np.argsort(keys, kind="stable")
+    return keys[orden], valores[orden]
+
+
+def _chain(corte, directorio):
+    """Cortes a leer para reconstruir `corte`: la base previa más cercana y sus deltas"""
+    cortes = load_catalog(directorio)["cortes"]
+    posiciones = {c["corte"]: i for i, c in enumerate(cortes)}
+    corte = _period(corte)
+    if corte not in posiciones:
+        raise KeyError(f"❌ No existe el corte {corte} en el almacén")
+    fin = posiciones[corte]
+    inicio = max(i for i in range(fin + 1) if cortes[i]["base"])
+    return [c["corte"] for c in cortes[inicio:fin + 1]]
+
+
+def reconstruct_arrays(corte, directorio=None):
+    """(llaves empacadas ordenadas, conteos int64) de un corte"""
+    directorio = Path(directorio or SNAPSHOTS_DIR)
+    keys = valores = None
+    for c in _chain(corte, directorio):
+        with np.load(directorio / f"corte_{c}.npz") as datos:
+            if "keys" in datos:
+                keys, valores = datos["keys"], datos["valores"].astype(np.int64)
+            else:
+                keys, valores = _apply_delta(keys, valores, datos)
+    return keys, valores
+
+
+def reconstruct(corte, directorio=None):
+    """Corte completo en formato ine_2025, ordenado por sección"""
+    directorio = Path(directorio or SNAPSHOTS_DIR)
+    catalogo = load_catalog(directorio)
+    keys, valores = reconstruct_arrays(corte, directorio)
+    dimension = pd.read_csv(directorio / DIMENSION, encoding="utf-8").set_index("llave")
+
+    df = pd.concat([
+        unpack_keys(keys),
+        dimension.reindex(keys).reset_index(drop=True),
+        pd.DataFrame(valores, columns=catalogo["columnas"]),
+    ], axis=1)
+    return df[catalogo["orden"]]
+
+
+def series(secciones, columnas=None, directorio=None):
+    """Serie por corte de una o varias secciones
+
+    `secciones` es un DataFrame con las columnas de LLAVE (o una tupla). Sólo
+    se siguen los valores de esas secciones; las llaves de cada corte se
+    recorren completas, pero son enteros y se procesan vectorizados.
+    """
+    directorio = Path(directorio or SNAPSHOTS_DIR)
+    catalogo = load_catalog(directorio)
+    if isinstance(secciones, tuple):
+        secciones = pd.DataFrame([secciones], columns=LLAVE)
+    buscadas = pack_keys(secciones)
+    todas = catalogo["columnas"]
+    columnas = columnas or todas
+    sel = [todas.index(c) for c in columnas]
+
+    rows = []
+    keys = valores = None
+    for entrada in catalogo["cortes"]:
+        with np.load(directorio / f"corte_{entrada['corte']}.npz") as datos:
+            if "keys" in datos:
+                keys = datos["keys"]
+                pos = np.searchsorted(keys, buscadas).clip(max=len(keys) - 1)
+                presentes = keys[pos] == buscadas
+                valores = np.zeros((len(buscadas), len(todas)), dtype=np.int64)
+                valores[presentes] = datos["valores"][pos[presentes]]
+            else:
+                siguen = ~np.isin(keys, datos["bajas"], assume_unique=True)
+                comunes = keys[siguen]
+                # Delta de las secciones buscadas que siguen; valores de las que son altas
+                pos = np.searchsorted(comunes, buscadas).clip(max=max(len(comunes) - 1, 0))
+                en_comunes = presentes & (comunes[pos] == buscadas) if len(comunes) else presentes & False
+                nuevos = np.zeros_like(valores)
+                nuevos[en_comunes] = valores[en_comunes] + datos["delta"][pos[en_comunes]]
+                altas = datos["altas_keys"]
+                if len(altas):
+                    pos_a = np.searchsorted(altas, buscadas).clip(max=len(altas) - 1)
+                    es_alta = altas[pos_a] == buscadas
+                    nuevos[es_alta] = datos["altas_valores"][pos_a[es_alta]]
+                else:
+                    es_alta = np.zeros(len(buscadas), dtype=bool)
+                keys = np.sort(np.concatenate([comunes, altas]))
+                valores, presentes = nuevos, en_comunes | es_alta
+
+        # Enteros con nulos donde la sección no existe en ese corte
+        tabla = pd.DataFrame(valores[:, sel], columns=columnas).astype("Int64")
+        tabla.loc[~presentes, :] = pd.NA
+        rows.append(pd.concat([secciones[LLAVE].reset_index(drop=True), tabla], axis=1).assign(corte=entrada["corte"]))
+    return pd.concat(rows, ignore_index=True)[["corte", *LLAVE, *columnas]]
+
+
+def storage_summary(directorio=None):
+    """Tamaño en disco del almacén por corte"""
+    directorio = Path(directorio or SNAPSHOTS_DIR)
+    catalogo = load_catalog(directorio)
+    return pd.DataFrame([
+        {**c, "kb": round((directorio / f"corte_{c['corte']}.npz").stat().st_size / 1024, 1)}
+        for c in catalogo["cortes"]
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Almacén de cortes del padrón con deltas por sección"
+    )
+    parser.add_argument(
+        "--ingestar",
+        action="store_true",
+        help="Agrega los cortes nuevos de PADRON_CUTS_DIR (padron_AAAA-MM.csv)"
+    )
+    parser.add_argument(
+        "--reconstruir",
+        metavar="AAAA-MM",
+        help="Reconstruye un corte completo"
+    )
+    parser.add_argument(
+        "--serie",
+        nargs=4,
+        type=int,
+        metavar=("ENTIDAD", "DISTRITO", "MUNICIPIO", "SECCION"),
+        help="Serie de una sección en todos los cortes"
+    )
+    parser.add_argument(
+        "--salida",
+        type=Path,
+        default=None,
+        help="CSV donde guardar el corte reconstruido o la serie"
+    )
+    args = parser.parse_args()
+
+    if args.ingestar:
+        ingest()
+    if args.reconstruir:
+        inicio = time.perf_counter()
+        result = reconstruct(args.reconstruir)
+        print(f"🧩 Corte {args.reconstruir}: {len(result):,} secciones en {time.perf_counter() - inicio:.2f} s")
+    elif args.serie:
+        result = series(tuple(args.serie))
+    else:
+        result = storage_summary()
+        print(result.to_string(index=False))
+        print(f"💾 Total: {result['kb'].sum() / 1024:.2f} MB en {len(result)} cortes" if len(result) else "(almacén vacío)")
+        return
+    if args.salida:
+        result.to_csv(args.salida, index=False, encoding="latin1")
+        print(f"✅ Guardado en {args.salida}")
+    else:
+        print(result.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
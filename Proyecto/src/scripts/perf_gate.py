@@ -0,0 +1,259 @@
+# Compuerta de regresiones de rendimiento
+#
+# Corre un perfil fijo (datos sintéticos a escala 1, semilla fija) del
+# pipeline: limpiadores, exploradores, resumen y render de gráficos, varias
+# veces, y compara la mediana de cada etapa contra una línea base versionada
+# en src/config/perf_baseline.json. Antes verifica que los caminos
+# alternativos del padrón (Polars, particiones, SQLite) reproduzcan byte a
+# byte las salidas de pandas. Termina con código 1 si algún camino difiere o
+# si alguna etapa supera su tolerancia. No requiere red; cada repetición
+# tarda ~10-15 s.
+
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.scripts.benchmark import _synthetic_base, compare_paths, profile_pipeline
+
+BASELINE_PATH = Path(__file__).resolve().parents[1] / "config" / "perf_baseline.json"
+
+# Perfil fijo: cambiarlo invalida la línea base
+PERFIL = {"escala": 1, "seed": 42, "cortes": 0}
+
+# Tolerancia relativa por defecto y piso absoluto (s) para etapas muy cortas
+TOLERANCIA = 0.30
+PISO_S = 0.05
+
+# Caminos de exploración y resumen del padrón que deben dar las mismas salidas que pandas
+CAMINOS = {
+    "pandas": (),
+    "polars": ("--backend", "polars"),
+    "particiones": ("--memory-budget", "16MB"),
+    "sqlite": ("--store",),
+}
+ETAPAS_CAMINOS = ["explorer_2025", "abstract"]
+
+
+def calibrate(repeticiones=9):
+    """Mediana (s) de una carga fija de pandas/numpy para normalizar entre máquinas
+
+    La primera corrida sólo calienta cachés; con pocas repeticiones la mediana
+    variaba lo suficiente para marcar regresiones falsas.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "clave": rng.integers(0, 2_000, 400_000),
+        "valor": rng.integers(0, 1_000, 400_000),
+    })
+    tiempos = []
+    for _ in range(repeticiones + 1):
+        inicio = time.perf_counter()
+        df.groupby("clave")["valor"].sum().sort_values()
+        df.sort_values(["clave", "valor"]).to_csv(None, index=False)
+        tiempos.append(time.perf_counter() - inicio)
+    return float(np.median(tiempos[1:]))
+
+
+def check_paths(base):
+    """Caminos alternativos cuyas salidas difieren de las de pandas: {camino: [archivos]}"""
+    modos = dict(CAMINOS)
+    if importlib.util.find_spec("polars") is None:
+        print("⚠️ Polars no está instalado: no se verifica su equivalencia")
+        del modos["polars"]
+    tabla, diferencias, n_archivos = compare_paths(base, ETAPAS_CAMINOS, modos)
+    for camino, archivos in diferencias.items():
+        estado = f"❌ {len(archivos)} salidas distintas: {', '.join(archivos)}" if archivos else "✅ idéntico"
+        print(f"🔁 {camino} vs pandas ({n_archivos} salidas): {estado}")
+    return {camino: archivos for camino, archivos in diferencias.items() if archivos}
+
+
+def measure(repeticiones=5, objetivos=(), verificar=True):
+    """Mediana de tiempo de pared, CPU y memoria pico por etapa, y caminos que no equivalen a pandas"""
+    with _synthetic_base("perf_gate", **PERFIL) as (base, _):
+        distintos = check_paths(base) if verificar else {}
+        corridas = []
+        for i in range(repeticiones):
+            resumen = profile_pipeline(base, objetivos)
+            resumen = resumen[resumen["categoria"] == "pipeline"].assign(corrida=i)
+            corridas.append(resumen)
+            print(f"⏱️ Corrida {i + 1}/{repeticiones}: {resumen['wall_s'].sum():.2f} s")
+
+    medianas = (
+        pd.concat(corridas)
+        .groupby("etapa")[["wall_s", "cpu_s", "memoria_pico_mb"]]
+        .median()
+        .round(4)
+    )
+    return medianas, distintos
+
+
+def pipeline_stages():
+    """Nombres de todas las etapas del pipeline: cada una necesita entrada en la línea base"""
+    from src.scripts.pipeline import build_stages
+    return [s["name"] for s in build_stages()]
+
+
+def compare(actual, linea_base, tolerancia=TOLERANCIA, por_etapa=None, piso=PISO_S, factor=1.0, etapas=()):
+    """Tabla de diferencias etapa por etapa contra la línea base
+
+    La línea base se escala por `factor` (máquina actual / máquina de la base).
+    Una etapa regresa si su mediana supera base·(1 + tolerancia) y además la
+    diferencia absoluta es mayor que `piso`. Una etapa de `etapas`, o medida,
+    sin entrada en la línea base falla igual que una regresión, lo mismo que
+    una etapa de la base que no se midió.
+    """
+    por_etapa = por_etapa or {}
+    base = pd.Series({k: v["wall_s"] for k, v in linea_base["etapas"].items()}, dtype=float) * factor
+    etapas = sorted(set(base.index) | set(actual.index) | set(etapas))
+    tabla = pd.DataFrame(index=pd.Index(etapas, name="etapa"))
+    tabla["base_s"] = base.reindex(etapas)
+    tabla["actual_s"] = actual["wall_s"].reindex(etapas)
+    tabla["cambio_pct"] = ((tabla["actual_s"] / tabla["base_s"] - 1) * 100).round(1)
+    tabla["tolerancia_pct"] = [round(por_etapa.get(e, tolerancia) * 100, 1) for e in etapas]
+
+    limite = tabla["base_s"] * (1 + tabla["tolerancia_pct"] / 100)
+    regresion = (tabla["actual_s"] > limite) & (tabla["actual_s"] - tabla["base_s"] > piso)
+    mejora = (tabla["actual_s"] < tabla["base_s"] / (1 + tabla["tolerancia_pct"] / 100)) & \
+             (tabla["base_s"] - tabla["actual_s"] > piso)
+    tabla["estado"] = np.select(
+        [tabla["base_s"].isna(), tabla["actual_s"].isna(), regresion, mejora],
+        ["❌ sin línea base", "❌ sin medir", "❌ regresión", "🚀 mejora"],
+        default="✅ ok",
+    )
+    return tabla.reset_index()
+
+
+def save_baseline(actual, calibracion, path=BASELINE_PATH):
+    """Escribe la línea base a partir de las medianas actuales"""
+    datos = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "perfil": PERFIL,
+        "calibracion_s": round(calibracion, 4),
+        "etapas": actual.to_dict("index"),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"✅ Línea base guardada en {path}")
+
+
+def _tolerancias(valores):
+    """Convierte ['graph_2015=0.5', ...] en {'graph_2015': 0.5}"""
+    por_etapa = {}
+    for valor in valores:
+        etapa, _, tol = valor.partition("=")
+        if not tol:
+            raise argparse.ArgumentTypeError(f"Tolerancia inválida: {valor} (use etapa=0.5)")
+        por_etapa[etapa] = float(tol)
+    return por_etapa
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el rendimiento del pipeline contra la línea base versionada"
+    )
+    parser.add_argument(
+        "--repeticiones",
+        type=int,
+        default=5,
+        help="Corridas del pipeline por medición (se usa la mediana)"
+    )
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=TOLERANCIA,
+        help="Aumento relativo permitido (0.30 = 30%%)"
+    )
+    parser.add_argument(
+        "--tolerancia-etapa",
+        nargs="*",
+        default=[],
+        metavar="ETAPA=TOL",
+        help="Tolerancias por etapa, p.ej. graph_2015=0.5"
+    )
+    parser.add_argument(
+        "--piso",
+        type=float,
+        default=PISO_S,
+        help="Diferencia absoluta mínima (s) para contar como regresión"
+    )
+    parser.add_argument(
+        "--linea-base",
+        type=Path,
+        default=BASELINE_PATH,
+        help="Archivo JSON de la línea base"
+    )
+    parser.add_argument(
+        "--sin-calibrar",
+        action="store_true",
+        help="No normalizar la línea base por la velocidad de esta máquina"
+    )
+    parser.add_argument(
+        "--sin-equivalencias",
+        action="store_true",
+        help="No verifica que Polars, particiones y SQLite den las mismas salidas que pandas"
+    )
+    parser.add_argument(
+        "--actualizar",
+        action="store_true",
+        help="Reescribe la línea base con la medición actual"
+    )
+    args = parser.parse_args()
+    por_etapa = _tolerancias(args.tolerancia_etapa)
+
+    calibracion = calibrate()
+    actual, distintos = measure(args.repeticiones, verificar=not args.sin_equivalencias)
+    if distintos:
+        print(f"\n❌ Caminos con salidas distintas a pandas: {', '.join(distintos)}")
+        sys.exit(1)
+
+    etapas = pipeline_stages()
+    if args.actualizar:
+        faltantes = sorted(set(etapas) - set(actual.index))
+        if faltantes:
+            print(f"❌ Etapas sin medición, no se actualiza la línea base: {', '.join(faltantes)}")
+            sys.exit(1)
+        save_baseline(actual, calibracion, args.linea_base)
+        print(actual.to_string())
+        return
+
+    if not args.linea_base.exists():
+        print(f"❌ No existe la línea base {args.linea_base}; genérela con --actualizar")
+        sys.exit(2)
+    with open(args.linea_base, encoding="utf-8") as f:
+        linea_base = json.load(f)
+    if linea_base.get("perfil") != PERFIL:
+        print(f"⚠️ La línea base se midió con otro perfil ({linea_base.get('perfil')}); regenérela")
+
+    factor = 1.0 if args.sin_calibrar else calibracion / linea_base["calibracion_s"]
+    print(f"🧮 Factor de máquina: {factor:.2f}× (calibración {calibracion:.3f} s)")
+
+    tabla = compare(actual, linea_base, args.tolerancia, por_etapa, args.piso, factor, etapas)
+    print("\n📊 Mediana por etapa vs línea base:")
+    print(tabla.round(3).to_string(index=False))
+
+    regresiones = tabla[tabla["estado"] == "❌ regresión"]
+    if not regresiones.empty:
+        print(f"\n❌ {len(regresiones)} etapa(s) más lentas que la línea base:")
+        for row in regresiones.itertuples():
+            print(f"   {row.etapa}: {row.base_s:.3f} s → {row.actual_s:.3f} s "
+                  f"(+{row.cambio_pct:.1f}%, tolerancia {row.tolerancia_pct:.0f}%)")
+    sin_base = tabla[tabla["estado"].isin(["❌ sin línea base", "❌ sin medir"])]
+    if not sin_base.empty:
+        print(f"\n❌ {len(sin_base)} etapa(s) sin comparar: {', '.join(sin_base['etapa'])}; "
+              "regenere la línea base con --actualizar en el mismo commit que cambia el pipeline")
+    if not regresiones.empty or not sin_base.empty:
+        sys.exit(1)
+    print("\n✅ Sin regresiones de rendimiento")
+
+if __name__ == "__main__":
+    main()
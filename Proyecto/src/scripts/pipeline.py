@@ -0,0 +1,522 @@
+# Ejecutor del pipeline como grafo de dependencias (DAG)
+#
+# Cada etapa declara sus archivos de entrada y de salida; las dependencias
+# entre etapas se deducen de ellos. Una etapa se reconstruye sólo si falta
+# alguna de sus salidas, si cambió el contenido de alguna entrada o si cambió
+# su código. Las etapas sin dependencias pendientes corren en paralelo.
+
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from src.config.settings import (
+    ABSTRACT_DIR,
+    CROSSWALK_DIR,
+    INTERACTIVE_DIR,
+    OUTPUT_DIR,
+    PATHS,
+    STATIC_DIR
+)
+from src.scripts.backend import BACKENDS, incompatible_flags, set_backend
+from src.scripts.constraints import MODOS, quality_mode, set_quality_mode
+from src.scripts.out_of_core import set_memory_budget
+from src.scripts.profiling import enable_profiling, export_trace, profiled
+from src.scripts.store import enable_store, store_enabled
+
+# Firma de cada etapa en la última ejecución exitosa
+STATE_PATH = OUTPUT_DIR / "pipeline_state.json"
+
+# Eventos, trace y volcados de cProfile de `--profile`
+PROFILE_DIR = OUTPUT_DIR / "profiles"
+
+# Salidas de cada explorador (ver explorer_analysis.py)
+EXPLORER_OUTPUTS = {
+    "2015": [
+        "poblacion_adulta_2015.csv", "distribucion_edad_absoluta_jalisco_2015.csv",
+        "resumen_eige2015.csv", "distribucion_distrito_eige2015.csv",
+        "distribucion_edad_eige2015.csv", "correlacion_eige2015.csv", "eige2015_meta.json",
+    ],
+    "2020": [
+        "poblacion_adulta_2020.csv", "resumen_jalisco_2020.csv",
+        "sexo_ine_2020.csv", "sexo_ine_2020_mujeres.csv",
+        "edad_0a17_ine_2020.csv", "edad_18ymas_ine_2020.csv", "ine2020_meta.json",
+    ],
+    "2025": [
+        "poblacion_adulta_distrito_2025.csv", "poblacion_adulta_municipio_2025.csv",
+        "conteo_general_ine_2025.csv", "lista_general_ine_2025.csv",
+        "lista_hombres_ine_2025.csv", "lista_mujeres_ine_2025.csv",
+        "padron_hombres_ine_2025.csv", "padron_mujeres_ine_2025.csv", "ine2025_meta.json",
+    ],
+}
+
+# Datos que lee cada graph_<año> y gráficos que siempre produce (ver graph_analysis.py;
+# adultos_sexo_gdl_2025 es condicional y no se declara)
+GRAPH_INPUTS = {
+    "2015": ["poblacion_adulta_2015.csv", "distribucion_edad_absoluta_jalisco_2015.csv"],
+    "2020": ["poblacion_adulta_2020.csv", "resumen_jalisco_2020.csv"],
+    "2025": ["poblacion_adulta_distrito_2025.csv", "poblacion_adulta_municipio_2025.csv"],
+}
+GRAPH_OUTPUTS = {
+    "2015": ["adultos_sexo_distrito_2015", "distribucion_edad_jalisco_2015", "top_distritos_2015"],
+    "2020": ["adultos_sexo_distrito_2020", "adultos_sexo_jalisco_2020"],
+    "2025": ["adultos_sexo_distrito_2025", "adultos_sexo_zmg_2025"],
+}
+
+
+def stage(name, func, inputs, outputs, *args, code=(), config=None, sin_fuente=None, al_dia=None):
+    """Describe una etapa: función, argumentos, archivos que lee y escribe y módulos de los que depende
+
+    `config` mapea nombres a funciones sin argumentos con opciones que
+    cambian las salidas (p.ej. el modo de calidad); su valor entra en la
+    firma. `sin_fuente` se ejecuta en lugar de `func` cuando faltan las
+    entradas pero las salidas existen (p.ej. cargar en la base el CSV
+    preparado); `al_dia`, cuando la etapa está al día (p.ej. la misma carga
+    si se pidió --store después de limpiar sin la base).
+    """
+    return {"name": name, "func": func, "args": args, "inputs": list(inputs),
+            "outputs": list(outputs), "code": list(code), "config": dict(config or {}),
+            "sin_fuente": sin_fuente, "al_dia": al_dia}
+
+
+# ========================================================================
+# ETAPAS
+# Funciones de módulo (no lambdas) para poder ejecutarse en otro proceso
+# ========================================================================
+
+def run_cleaner(dataset):
+    from src.scripts import cleaner
+
+    paths = PATHS[dataset]
+    paths["prepared"].parent.mkdir(parents=True, exist_ok=True)
+    getattr(cleaner, f"clean_{dataset}")(paths["raw"], paths["prepared"])
+
+
+def run_store_prepared(dataset):
+    """Carga el CSV preparado existente en la base, si está activa y desactualizada
+
+    Para limpiadores que no se ejecutan: sin datos crudos o ya al día.
+    """
+    import pandas as pd
+    from src.scripts.store import store_prepared, table_ready
+
+    path = PATHS[dataset]["prepared"]
+    if table_ready(dataset):
+        return
+    df = pd.read_csv(path, encoding="latin1" if dataset == "ine_2025" else "utf-8")
+    store_prepared(df, dataset, path)
+
+
+def run_explorer(year):
+    from src.scripts import explorer_analysis
+
+    ABSTRACT_DIR.mkdir(parents=True, exist_ok=True)
+    getattr(explorer_analysis, f"explorer_{year}")()
+
+
+def run_abstract():
+    from src.scripts import abstract
+
+    abstract.generar_resumen_final()
+
+
+def run_anomalies():
+    from src.scripts import anomalies
+
+    anomalies.anomalies_report()
+
+
+def run_graph(year):
+    from src.scripts import graph_analysis
+    from src.scripts.render import render_jobs
+
+    STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    INTERACTIVE_DIR.mkdir(parents=True, exist_ok=True)
+    # Un solo proceso por etapa: el paralelismo lo da el DAG
+    render_jobs(getattr(graph_analysis, f"graph_{year}")(), graph_analysis.MODOS, workers=1)
+
+
+def build_stages():
+    """Etapas del pipeline completo: limpieza → exploración/resumen → gráficos"""
+    years = {"2015": "eige_2015", "2020": "ine_2020", "2025": "ine_2025"}
+    stages = []
+    for year, dataset in years.items():
+        stages.append(stage(
+            f"clean_{year}", run_cleaner,
+            [PATHS[dataset]["raw"]], [PATHS[dataset]["prepared"]], dataset,
+            code=["src.scripts.cleaner", "src.scripts.constraints"],
+            # En modo estricto un limpiador puede fallar donde en modo avisar pasó
+            config={"calidad": quality_mode},
+            # Con --store, sin datos crudos o ya al día, el CSV preparado existente se carga en la base
+            sin_fuente=run_store_prepared if store_enabled() else None,
+            al_dia=run_store_prepared if store_enabled() else None
+        ))
+        stages.append(stage(
+            f"explorer_{year}", run_explorer,
+            [PATHS[dataset]["prepared"]], [ABSTRACT_DIR / f for f in EXPLORER_OUTPUTS[year]], year,
+            code=["src.scripts.explorer_analysis", "src.scripts.hierarchy"]
+        ))
+        stages.append(stage(
+            f"graph_{year}", run_graph,
+            [ABSTRACT_DIR / f for f in GRAPH_INPUTS[year]],
+            [d / f"{nombre}{ext}" for nombre in GRAPH_OUTPUTS[year]
+             for d, ext in ((STATIC_DIR, ".png"), (INTERACTIVE_DIR, ".html"))],
+            year,
+            code=["src.scripts.graph_analysis", "src.scripts.render", "src.config.style"]
+        ))
+    stages.append(stage(
+        "anomalies_2025", run_anomalies,
+        [PATHS["ine_2025"]["prepared"]], [ABSTRACT_DIR / "anomalias_secciones_2025.csv"],
+        code=["src.scripts.anomalies", "src.scripts.padron_delta", "src.scripts.padron_snapshots"]
+    ))
+    stages.append(stage(
+        "abstract", run_abstract,
+        # Las asignaciones de secciones son opcionales: sólo cuentan las que existen
+        [PATHS[dataset]["prepared"] for dataset in years.values()] + sorted(CROSSWALK_DIR.glob("secciones_*.csv")),
+        [ABSTRACT_DIR / "resumen_final.csv", ABSTRACT_DIR / "informe_analitico.txt"],
+        code=["src.scripts.abstract", "src.scripts.crosswalk", "src.scripts.hierarchy"]
+    ))
+    return stages
+
+
+# ========================================================================
+# GRAFO
+# ========================================================================
+
+def build_dag(stages):
+    """Dependencias entre etapas: A → B si B lee algún archivo que A escribe"""
+    productor = {}
+    for s in stages:
+        for path in s["outputs"]:
+            if path in productor:
+                raise ValueError(f"❌ {path} lo producen {productor[path]} y {s['name']}")
+            productor[path] = s["name"]
+    return {
+        s["name"]: sorted({productor[p] for p in s["inputs"] if p in productor} - {s["name"]})
+        for s in stages
+    }
+
+
+def topological_order(deps):
+    """Orden topológico estable (Kahn); falla si hay ciclos"""
+    pendientes = {n: set(d) for n, d in deps.items()}
+    orden = []
+    while pendientes:
+        listos = sorted(n for n, d in pendientes.items() if not d)
+        if not listos:
+            raise ValueError(f"❌ Ciclo de dependencias entre: {sorted(pendientes)}")
+        for n in listos:
+            orden.append(n)
+            del pendientes[n]
+        for d in pendientes.values():
+            d.difference_update(listos)
+    return orden
+
+
+def ancestors(deps, targets):
+    """Etapas objetivo y todas las que necesitan"""
+    visitadas, pila = set(), list(targets)
+    while pila:
+        n = pila.pop()
+        if n not in visitadas:
+            visitadas.add(n)
+            pila.extend(deps[n])
+    return visitadas
+
+
+# ========================================================================
+# FIRMAS (reconstrucción incremental)
+# ========================================================================
+
+def file_digest(path, memo):
+    """SHA-256 del archivo; se reutiliza si su tamaño y mtime no cambiaron"""
+    st = path.stat()
+    previo = memo.get(str(path))
+    if previo and previo["size"] == st.st_size and previo["mtime_ns"] == st.st_mtime_ns:
+        return previo["sha256"]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    memo[str(path)] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": h.hexdigest()}
+    return memo[str(path)]["sha256"]
+
+
+def stage_signature(s, memo):
+    """Firma de una etapa: contenido de sus entradas, código de su función y módulos y su configuración"""
+    h = hashlib.sha256()
+    for path in s["inputs"]:
+        h.update(str(path).encode())
+        h.update(file_digest(path, memo).encode() if path.exists() else b"<ausente>")
+    h.update(inspect.getsource(s["func"]).encode())
+    for module in s["code"]:
+        # Se lee el archivo fuente sin importar el módulo
+        h.update(file_digest(Path(importlib.util.find_spec(module).origin), memo).encode())
+    h.update(json.dumps(s["args"], default=str).encode())
+    if s["config"]:
+        h.update(json.dumps({k: f() for k, f in s["config"].items()}, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def load_state():
+    """Lee el estado del último run (vacío si no existe o está corrupto)"""
+    try:
+        with open(STATE_PATH, encoding="utf-8") as f:
+            state = json.load(f)
+        return {"etapas": state.get("etapas", {}), "archivos": state.get("archivos", {})}
+    except (OSError, ValueError):
+        return {"etapas": {}, "archivos": {}}
+
+
+def save_state(state):
+    """Escribe el estado del pipeline"""
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+
+
+def without_source(s):
+    """True si faltan entradas de la etapa pero sus salidas existen (p.ej. datos crudos no versionados)
+
+    No se puede reconstruir ni verificar: se conservan las salidas y, si la
+    etapa declara `sin_fuente`, se ejecuta eso en su lugar.
+    """
+    return any(not p.exists() for p in s["inputs"]) and all(p.exists() for p in s["outputs"])
+
+
+def stage_status(s, state, forzar=False):
+    """Motivo por el que una etapa debe ejecutarse (o no puede verificarse), o None si está al día"""
+    faltantes = [p for p in s["inputs"] if not p.exists()]
+    if faltantes:
+        return f"faltan entradas: {', '.join(p.name for p in faltantes)}"
+    if forzar:
+        return "forzada"
+    if not all(p.exists() for p in s["outputs"]):
+        return "faltan salidas"
+    if state["etapas"].get(s["name"]) != stage_signature(s, state["archivos"]):
+        return "entradas o código cambiaron"
+    return None
+
+
+# ========================================================================
+# EJECUCIÓN
+# ========================================================================
+
+def _run_stage(s, alternativa=None):
+    """Ejecuta una etapa (o su alternativa 'sin_fuente'/'al_dia') y devuelve (nombre, segundos, error)"""
+    inicio = time.perf_counter()
+    try:
+        with profiled(s["name"], "pipeline"):
+            (s[alternativa] if alternativa else s["func"])(*s["args"])
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return s["name"], time.perf_counter() - inicio, error
+
+
+def plan(stages, deps, state, objetivos=None, forzar=False):
+    """Etapas seleccionadas en orden topológico con su motivo de ejecución
+
+    Un motivo 'aguas arriba' significa que la etapa se revisará de nuevo tras
+    ejecutar sus dependencias: si sus entradas no cambiaron, se omite.
+    """
+    por_nombre = {s["name"]: s for s in stages}
+    seleccion = ancestors(deps, objetivos) if objetivos else set(por_nombre)
+    motivos = {}
+    for nombre in topological_order(deps):
+        if nombre not in seleccion:
+            continue
+        motivo = stage_status(por_nombre[nombre], state, forzar)
+        # Una dependencia sin fuente conserva sus salidas: no obliga a revisar esta etapa
+        if motivo is None and any(motivos.get(d) and not without_source(por_nombre[d]) for d in deps[nombre]):
+            motivo = "aguas arriba"
+        motivos[nombre] = motivo
+    return motivos
+
+
+def run_pipeline(objetivos=None, workers=None, forzar=False, dry_run=False):
+    """Ejecuta el DAG en paralelo reconstruyendo sólo lo necesario"""
+    stages = build_stages()
+    deps = build_dag(stages)
+    desconocidos = set(objetivos or []) - set(deps)
+    if desconocidos:
+        raise ValueError(f"❌ Etapas desconocidas: {sorted(desconocidos)}")
+
+    state = load_state()
+    motivos = plan(stages, deps, state, objetivos, forzar)
+
+    por_nombre = {s["name"]: s for s in stages}
+    conservadas = {n for n in motivos if without_source(por_nombre[n])}
+    # Etapas al día con una acción pendiente (p.ej. cargar su tabla en la base)
+    refrescar = {n for n, m in motivos.items() if m is None and por_nombre[n]["al_dia"]}
+    print("🗺️ Plan de ejecución:")
+    for nombre, motivo in motivos.items():
+        requiere = f" ← {', '.join(deps[nombre])}" if deps[nombre] else ""
+        if nombre in conservadas:
+            motivo += "; se conservan las salidas existentes"
+            icono = "▶" if por_nombre[nombre]["sin_fuente"] else "⚠️"
+        elif nombre in refrescar:
+            motivo, icono = "al día; se revisa su tabla en la base", "✓"
+        else:
+            icono = "▶" if motivo else "✓"
+        print(f"  {icono} {nombre:<14} {motivo or 'al día'}{requiere}")
+    if conservadas:
+        print(f"⚠️ {len(conservadas)} etapa(s) sin entradas no se pueden reconstruir ni verificar: "
+              f"{', '.join(sorted(conservadas))}")
+    if dry_run:
+        return motivos
+
+    # Las etapas sin fuente sólo corren su alternativa `sin_fuente`, si la tienen
+    pendientes = {n for n, m in motivos.items() if m and (n not in conservadas or por_nombre[n]["sin_fuente"])}
+    pendientes |= refrescar
+    hechas = set(motivos) - pendientes
+    fallidas, tiempos = set(), {}
+    workers = workers or min(len(pendientes), os.cpu_count() or 1) or 1
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        en_curso = {}
+        while pendientes or en_curso:
+            # Lanzar todas las etapas cuyas dependencias ya terminaron
+            for nombre in sorted(pendientes):
+                if any(d in fallidas for d in deps[nombre]):
+                    pendientes.discard(nombre)
+                    fallidas.add(nombre)
+                    print(f"⛔ {nombre}: omitida por falla aguas arriba")
+                elif all(d in hechas for d in deps[nombre] if d in motivos):
+                    pendientes.discard(nombre)
+                    s = por_nombre[nombre]
+                    motivo = stage_status(s, state, forzar)
+                    if nombre in conservadas:
+                        print(f"▶ {nombre}: {motivo}; se conservan las salidas existentes")
+                        en_curso[pool.submit(_run_stage, s, "sin_fuente")] = nombre
+                        continue
+                    if nombre in refrescar:
+                        if motivo is None:
+                            en_curso[pool.submit(_run_stage, s, "al_dia")] = nombre
+                            continue
+                        refrescar.discard(nombre)
+                    if motivo is None:
+                        # Dependencias reconstruidas sin cambiar las entradas de esta etapa
+                        print(f"✓ {nombre}: entradas sin cambios, se omite")
+                        hechas.add(nombre)
+                        continue
+                    print(f"▶ {nombre}: {motivo}")
+                    en_curso[pool.submit(_run_stage, s)] = nombre
+            if not en_curso:
+                continue
+
+            listos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                nombre, segundos, error = futuro.result()
+                del en_curso[futuro]
+                tiempos[nombre] = segundos
+                s = por_nombre[nombre]
+                if error is None and nombre in conservadas:
+                    # Sin entradas no hay firma que guardar
+                    hechas.add(nombre)
+                    print(f"✅ {nombre} (sin fuente) terminada en {segundos:.1f} s")
+                elif error is None and nombre in refrescar:
+                    # La firma no cambia: sus salidas ya estaban al día
+                    hechas.add(nombre)
+                    print(f"✅ {nombre} (al día) revisada en {segundos:.1f} s")
+                elif error is None and all(p.exists() for p in s["outputs"]):
+                    state["etapas"][nombre] = stage_signature(s, state["archivos"])
+                    hechas.add(nombre)
+                    print(f"✅ {nombre} terminada en {segundos:.1f} s")
+                else:
+                    fallidas.add(nombre)
+                    state["etapas"].pop(nombre, None)
+                    faltan = [p.name for p in s["outputs"] if not p.exists()]
+                    print(f"❌ {nombre} falló: {error or 'faltan salidas ' + ', '.join(faltan)}")
+            save_state(state)
+
+    print(f"⏱️ {len(tiempos)} etapas ejecutadas en {time.perf_counter() - inicio:.1f} s "
+          f"con {workers} proceso(s)")
+    if fallidas:
+        print(f"❌ Etapas con error: {', '.join(sorted(fallidas))}")
+    return {"tiempos": tiempos, "fallidas": sorted(fallidas)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ejecuta el pipeline como DAG con etapas en paralelo y reconstrucción incremental"
+    )
+    parser.add_argument(
+        "objetivos",
+        nargs="*",
+        help="Etapas a construir junto con sus dependencias (por defecto, todas)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Sólo imprime el plan de ejecución"
+    )
+    parser.add_argument(
+        "--forzar",
+        action="store_true",
+        help="Reconstruye las etapas seleccionadas aunque estén al día"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Etapas en paralelo (por defecto, núcleos disponibles)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Mide tiempo, CPU, memoria pico y filas por etapa y exporta un trace de Chrome/Perfetto"
+    )
+    parser.add_argument(
+        "--profile-etapa",
+        default=None,
+        help="Además guarda un volcado de cProfile de esta etapa o función (p.ej. explorer_2025)"
+    )
+    parser.add_argument(
+        "--memory-budget",
+        default=None,
+        help="Memoria máxima por partición para limpieza, exploración y resumen del padrón (p.ej. 512MB)"
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Los limpiadores guardan también una base SQLite indexada y los agregados del padrón se calculan ahí"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="Motor de tablas para exploración y resumen del padrón (pandas o polars)"
+    )
+    parser.add_argument(
+        "--calidad",
+        choices=MODOS,
+        default=None,
+        help="Reglas de calidad en los limpiadores: avisar (por defecto), estricto u omitir"
+    )
+    args = parser.parse_args()
+    error = incompatible_flags(args.backend, args.store, args.memory_budget)
+    if error:
+        parser.error(error)
+
+    set_memory_budget(args.memory_budget)
+    enable_store(args.store)
+    set_backend(args.backend)
+    set_quality_mode(args.calidad)
+    if args.profile or args.profile_etapa:
+        enable_profiling(PROFILE_DIR, args.profile_etapa)
+    resultado = run_pipeline(args.objetivos, workers=args.workers, forzar=args.forzar, dry_run=args.dry_run)
+    if (args.profile or args.profile_etapa) and not args.dry_run:
+        export_trace(PROFILE_DIR)
+    if not args.dry_run and resultado["fallidas"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
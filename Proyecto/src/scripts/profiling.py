@@ -0,0 +1,236 @@
+# Instrumentación por etapa: tiempo, CPU, memoria pico y filas procesadas
+#
+# `profiled` funciona como decorador y como context manager. Sin perfilado
+# activo sólo cuesta una consulta a os.environ. Con perfilado activo
+# (POBLACION_PROFILE_DIR), cada proceso —incluidos los workers de render y
+# del DAG— agrega sus eventos a `eventos_<pid>.jsonl` en ese directorio;
+# `export_trace` los une en un trace de Chrome/Perfetto y una tabla resumen.
+
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from pathlib import Path
+import pandas as pd
+
+# Variables de entorno que heredan los procesos hijos
+PROFILE_DIR_ENV = "POBLACION_PROFILE_DIR"
+CPROFILE_STAGE_ENV = "POBLACION_PROFILE_CPROFILE"
+
+# Etapas abiertas en este proceso (para memoria pico y filas anidadas)
+_STACK = []
+
+
+def _rss_kb():
+    """(RSS actual, RSS pico) del proceso en KB, leídos de /proc (None fuera de Linux)"""
+    try:
+        with open("/proc/self/status") as f:
+            campos = dict(line.split(":", 1) for line in f)
+        return int(campos["VmRSS"].split()[0]), int(campos["VmHWM"].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def _reset_peak_rss():
+    """Reinicia el pico de RSS del proceso (Linux ≥ 4.0); tracemalloc sería 10× más lento"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def enable_profiling(directory, cprofile_stage=None):
+    """Activa el perfilado en este proceso y sus hijos, descartando eventos anteriores"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for old in [*directory.glob("eventos_*.jsonl"), *directory.glob("*.prof")]:
+        old.unlink()
+    os.environ[PROFILE_DIR_ENV] = str(directory)
+    if cprofile_stage:
+        os.environ[CPROFILE_STAGE_ENV] = cprofile_stage
+    else:
+        os.environ.pop(CPROFILE_STAGE_ENV, None)
+    return directory
+
+
+def add_rows(n):
+    """Suma filas procesadas a la etapa abierta más interna"""
+    if _STACK:
+        _STACK[-1]["rows"] += int(n)
+
+
+class profiled(ContextDecorator):
+    """Mide una etapa: `with profiled("explorer_2025"):` o `@profiled()`
+
+    Las filas se toman de `add_rows`; si la etapa no las reporta, del primer
+    DataFrame recibido o, en su defecto, del DataFrame devuelto.
+    """
+
+    def __init__(self, name=None, category="etapa"):
+        self.name = name
+        self.category = category
+
+    def __call__(self, func):
+        name = self.name or func.__name__
+        category = func.__module__.rsplit(".", 1)[-1] if self.category == "etapa" else self.category
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if PROFILE_DIR_ENV not in os.environ:
+                return func(*args, **kwargs)
+            with profiled(name, category) as frame:
+                result = func(*args, **kwargs)
+                if frame["rows"] == 0:
+                    df = next((a for a in args if isinstance(a, pd.DataFrame)), result)
+                    if isinstance(df, pd.DataFrame):
+                        frame["rows"] = len(df)
+                return result
+        return wrapper
+
+    def __enter__(self):
+        if PROFILE_DIR_ENV not in os.environ:
+            self._frame = {"rows": 0, "activo": False}
+            return self._frame
+
+        current, pico_previo = _rss_kb()
+        _reset_peak_rss()
+
+        perfil = None
+        if os.environ.get(CPROFILE_STAGE_ENV) == self.name and not any(f["cprofile"] for f in _STACK):
+            import cProfile
+            perfil = cProfile.Profile()
+
+        self._frame = {
+            "activo": True, "rows": 0, "cprofile": perfil,
+            "memoria_inicial": current, "pico_previo": pico_previo, "pico_hijos": 0,
+            "ts_ns": time.time_ns(), "wall": time.perf_counter(), "cpu": time.process_time(),
+        }
+        _STACK.append(self._frame)
+        if perfil is not None:
+            perfil.enable()
+        return self._frame
+
+    def __exit__(self, exc_type, exc, tb):
+        frame = self._frame
+        if not frame["activo"]:
+            return False
+        wall = time.perf_counter() - frame["wall"]
+        cpu = time.process_time() - frame["cpu"]
+        if frame["cprofile"] is not None:
+            frame["cprofile"].disable()
+        _STACK.pop()
+
+        pico = _rss_kb()[1]
+        if pico is not None:
+            pico = max(pico, frame["pico_hijos"])
+            if _STACK:
+                # La etapa externa conserva el máximo que se observó antes y durante ésta
+                _STACK[-1]["pico_hijos"] = max(_STACK[-1]["pico_hijos"], frame["pico_previo"], pico)
+        if _STACK and frame["rows"]:
+            _STACK[-1]["rows_hijos"] = _STACK[-1].get("rows_hijos", 0) + frame["rows"]
+
+        directory = Path(os.environ[PROFILE_DIR_ENV])
+        if frame["cprofile"] is not None:
+            frame["cprofile"].dump_stats(directory / f"{self.name}_{os.getpid()}.prof")
+
+        evento = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": frame["ts_ns"] / 1000,
+            "dur": wall * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident() % 2**31,
+            "args": {
+                "cpu_ms": round(cpu * 1000, 3),
+                # Crecimiento del RSS pico sobre el RSS al iniciar la etapa
+                "memoria_pico_mb": None if pico is None else round(max(pico - frame["memoria_inicial"], 0) / 1024, 2),
+                "filas": frame["rows"] or frame.get("rows_hijos", 0),
+                "error": exc_type.__name__ if exc_type else None,
+            },
+        }
+        with open(directory / f"eventos_{os.getpid()}.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(evento) + "\n")
+        return False
+
+
+def load_events(directory):
+    """Eventos de todos los procesos, ordenados por inicio"""
+    eventos = []
+    for path in Path(directory).glob("eventos_*.jsonl"):
+        with open(path, encoding="utf-8") as f:
+            eventos.extend(json.loads(line) for line in f if line.strip())
+    return sorted(eventos, key=lambda e: e["ts"])
+
+
+def summary_table(eventos):
+    """Tiempo de pared, CPU, memoria pico y filas por etapa"""
+    columnas = ["etapa", "categoria", "llamadas", "wall_s", "cpu_s", "memoria_pico_mb", "filas", "filas_por_s"]
+    if not eventos:
+        return pd.DataFrame(columns=columnas)
+    df = pd.DataFrame({
+        "etapa": [e["name"] for e in eventos],
+        "categoria": [e["cat"] for e in eventos],
+        "wall_s": [e["dur"] / 1e6 for e in eventos],
+        "cpu_s": [e["args"]["cpu_ms"] / 1000 for e in eventos],
+        "memoria_pico_mb": [e["args"]["memoria_pico_mb"] for e in eventos],
+        "filas": [e["args"]["filas"] for e in eventos],
+    })
+    resumen = df.groupby(["etapa", "categoria"], as_index=False).agg(
+        llamadas=("wall_s", "size"), wall_s=("wall_s", "sum"), cpu_s=("cpu_s", "sum"),
+        memoria_pico_mb=("memoria_pico_mb", "max"), filas=("filas", "sum"),
+    )
+    resumen["filas_por_s"] = (resumen["filas"] / resumen["wall_s"].where(resumen["wall_s"] > 0)).round(0)
+    return resumen[columnas].round(3).sort_values("wall_s", ascending=False)
+
+
+def export_trace(directory):
+    """Escribe trace.json (chrome://tracing, ui.perfetto.dev) y resumen_perfil.csv"""
+    directory = Path(directory)
+    eventos = load_events(directory)
+    if eventos:
+        # Tiempos relativos al primer evento; un nombre legible por proceso
+        t0 = eventos[0]["ts"]
+        for e in eventos:
+            e["ts"] = round(e["ts"] - t0, 3)
+            e["dur"] = round(e["dur"], 3)
+    procesos = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"pid {pid}"}}
+        for pid in sorted({e["pid"] for e in eventos})
+    ]
+    trace_path = directory / "trace.json"
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": procesos + eventos, "displayTimeUnit": "ms"}, f)
+
+    resumen = summary_table(eventos)
+    resumen.to_csv(directory / "resumen_perfil.csv", index=False)
+    print("\n⏱️ Perfil por etapa:")
+    print(resumen.to_string(index=False) if not resumen.empty else "(sin eventos)")
+    print(f"🧭 Trace guardado: {trace_path} (abrir en ui.perfetto.dev o chrome://tracing)")
+    for prof in sorted(directory.glob("*.prof")):
+        print(f"🔬 cProfile: {prof} (p.ej. python -m pstats {prof})")
+    return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Une los eventos de perfilado en un trace de Chrome/Perfetto y una tabla resumen"
+    )
+    parser.add_argument(
+        "directorio",
+        nargs="?",
+        default=os.environ.get(PROFILE_DIR_ENV),
+        help="Directorio con los eventos_<pid>.jsonl"
+    )
+    args = parser.parse_args()
+    if not args.directorio:
+        parser.error("indique el directorio de eventos")
+    export_trace(args.directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# Planificador de render de gráficos en paralelo
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import islice
+import pandas as pd
+from src.config.settings import (
+    INTERACTIVE_DIR,
+    STATIC_DIR,
+    VISUALIZATIONS_DIR
+)
+from src.config.style import RENDER_PROFILES, style_fingerprint
+
+# Índice de la caché de render: ruta de salida → llave del gráfico
+CACHE_INDEX = VISUALIZATIONS_DIR / "render_cache.json"
+
+# Figuras libres por tamaño, reutilizadas dentro de cada proceso
+_FIGURE_POOL = {}
+
+
+def chart_job(func, df, filename, **kwargs):
+    """Describe un gráfico pendiente: función de graficado, datos y parámetros"""
+    return {"func": func, "df": df, "filename": filename, "kwargs": kwargs}
+
+
+@contextmanager
+def pooled_figure(figsize, nrows=1, ncols=1):
+    """Presta una figura (fig, ax) del pool y la limpia y devuelve siempre, aun con error
+
+    Las figuras no se registran en pyplot, así que renderizar cientos de
+    gráficos no acumula memoria. Con nrows/ncols > 1, ax es la matriz de ejes.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    libres = _FIGURE_POOL.setdefault(tuple(figsize), [])
+    if libres:
+        fig = libres.pop()
+    else:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+    try:
+        yield fig, fig.subplots(nrows, ncols)
+    finally:
+        fig.clf()
+        libres.append(fig)
+
+
+def job_outputs(job, modos):
+    """Rutas de salida de un gráfico por modo de render"""
+    salidas = {}
+    if "estatico" in modos:
+        salidas["estatico"] = STATIC_DIR / job["filename"]
+    if "interactivo" in modos:
+        salidas["interactivo"] = INTERACTIVE_DIR / job["filename"].replace('.png', '.html')
+    return salidas
+
+
+def _code_names(code):
+    """Nombres globales que usa un objeto de código, incluidas lambdas y comprensiones"""
+    nombres = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            nombres |= _code_names(const)
+    return nombres
+
+
+@lru_cache(maxsize=None)
+def source_digest(func):
+    """SHA-256 del código de func y de las funciones del proyecto que usa, transitivamente
+
+    Sigue los nombres globales de cada función (también dentro de dicts como
+    FIGURE_BUILDERS), así que cambiar un constructor de figura o
+    apply_advanced_styling invalida los gráficos que dependen de ellos.
+    """
+    pendientes, fuentes = [func], {}
+    while pendientes:
+        f = inspect.unwrap(pendientes.pop())
+        nombre = f"{f.__module__}.{f.__qualname__}"
+        if nombre in fuentes:
+            continue
+        try:
+            fuentes[nombre] = inspect.getsource(f)
+        except (OSError, TypeError):
+            fuentes[nombre] = nombre
+        for global_ in _code_names(f.__code__):
+            valor = f.__globals__.get(global_)
+            for candidato in (valor.values() if isinstance(valor, dict) else [valor]):
+                if inspect.isfunction(candidato) and candidato.__module__.startswith("src."):
+                    pendientes.append(candidato)
+    h = hashlib.sha256()
+    for nombre in sorted(fuentes):
+        h.update(fuentes[nombre].encode())
+    return h.hexdigest()
+
+
+def job_key(job, modo, perfil="publicacion"):
+    """Llave SHA-256 de datos, código, parámetros, perfil y estilo de un gráfico"""
+    h = hashlib.sha256()
+    df = job["df"]
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+    h.update(source_digest(job["func"]).encode())
+    h.update(json.dumps(
+        {"kwargs": job["kwargs"], "filename": job["filename"], "modo": modo, "perfil": perfil,
+         "config_perfil": RENDER_PROFILES.get(perfil), "estilo": style_fingerprint()},
+        sort_keys=True, default=str
+    ).encode())
+    return h.hexdigest()
+
+
+def load_cache_index():
+    """Lee el índice de la caché (vacío si no existe o está corrupto)"""
+    try:
+        with open(CACHE_INDEX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache_index(index):
+    """Escribe el índice de la caché de render"""
+    VISUALIZATIONS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_INDEX, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1, sort_keys=True)
+
+
+def _init_worker():
+    """Cada proceso usa su propio backend Agg (sin interfaz gráfica)"""
+    if "matplotlib" in sys.modules:
+        sys.modules["matplotlib"].use("Agg")
+    else:
+        # Se aplica cuando el backend estático se importe por primera vez
+        os.environ["MPLBACKEND"] = "Agg"
+
+
+def _mtime(path):
+    """mtime (ns) de una salida, o None si no existe"""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _run_job(job, modos, perfil="publicacion"):
+    """Ejecuta un gráfico y devuelve su tiempo de render"""
+    inicio = time.perf_counter()
+    estado = "ok"
+    try:
+        job["func"](job["df"], filename=job["filename"], modos=modos, perfil=perfil, **job["kwargs"])
+    except Exception as e:
+        estado = f"error: {e}"
+    return {
+        "grafico": job["filename"],
+        "funcion": job["func"].__name__,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        "pid": os.getpid(),
+        "estado": estado,
+    }
+
+
+def render_jobs(jobs, modos, workers=None, usar_cache=True, perfil="publicacion", pool=None, detalle=True):
+    """Renderiza los gráficos en un pool de procesos y resume el tiempo por gráfico
+
+    Con workers=1 todo se ejecuta en el proceso actual. Sólo se renderizan
+    los modos cuya salida no existe o cuya llave cambió desde el último run.
+    Si se recibe `pool`, se reutiliza en lugar de crear uno nuevo.
+    """
+    nombres = [job["filename"] for job in jobs]
+    duplicados = {n for n in nombres if nombres.count(n) > 1}
+    if duplicados:
+        raise ValueError(f"❌ Rutas de salida duplicadas: {sorted(duplicados)}")
+
+    # Separar aciertos y fallos de caché por modo
+    index = load_cache_index() if usar_cache else {}
+    pendientes, llaves, resultados = [], [], []
+    for job in jobs:
+        salidas = job_outputs(job, modos)
+        keys = {modo: job_key(job, modo, perfil) for modo in salidas}
+        modos_job = tuple(
+            modo for modo, path in salidas.items()
+            if not (path.exists() and index.get(path.name) == keys[modo])
+        )
+        if modos_job:
+            pendientes.append((job, modos_job))
+            llaves.append({modo: (salidas[modo], keys[modo]) for modo in modos_job})
+        else:
+            resultados.append({
+                "grafico": job["filename"], "funcion": job["func"].__name__,
+                "segundos": 0.0, "pid": os.getpid(), "estado": "en caché",
+            })
+    print(f"🗃️ Caché de render: {len(resultados)} aciertos, {len(pendientes)} fallos")
+
+    # Los plot_* reportan sus propios errores sin lanzarlos: sólo cuenta lo que se reescribió
+    previas = [{modo: _mtime(path) for modo, (path, _) in keys.items()} for keys in llaves]
+
+    workers = workers or min(len(pendientes), os.cpu_count() or 1)
+    inicio = time.perf_counter()
+    if workers <= 1 or len(pendientes) <= 1:
+        _init_worker()
+        nuevos = [_run_job(job, modos_job, perfil) for job, modos_job in pendientes]
+    else:
+        contexto = nullcontext(pool) if pool is not None else ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker)
+        with contexto as executor:
+            jobs_p, modos_p = zip(*pendientes)
+            nuevos = list(executor.map(_run_job, jobs_p, modos_p, [perfil] * len(pendientes)))
+    total = time.perf_counter() - inicio
+    resultados.extend(nuevos)
+
+    # Registrar sólo salidas escritas en esta corrida (un archivo viejo no prueba nada)
+    for resultado, keys, previa in zip(nuevos, llaves, previas):
+        sin_escribir = []
+        for modo, (path, key) in keys.items():
+            mtime = _mtime(path)
+            if mtime is not None and mtime != previa[modo]:
+                index[path.name] = key
+            else:
+                index.pop(path.name, None)
+                sin_escribir.append(path.name)
+        if sin_escribir and resultado["estado"] == "ok":
+            resultado["estado"] = f"error: sin escribir {', '.join(sin_escribir)}"
+    if pendientes:
+        save_cache_index(index)
+
+    resumen = pd.DataFrame(resultados, columns=["grafico", "funcion", "segundos", "pid", "estado"])
+    if detalle and not resumen.empty:
+        print("\n⏱️ Tiempo de render por gráfico:")
+        print(resumen.sort_values("segundos", ascending=False).to_string(index=False))
+    print(f"⏱️ {len(pendientes)} gráficos renderizados en {total:.1f} s con {max(workers, 1)} proceso(s)")
+    fallidos = [r["grafico"] for r in nuevos if r["estado"] != "ok"]
+    if fallidos:
+        print(f"⚠️ {len(fallidos)} gráficos con error (se reintentan en la próxima corrida): {', '.join(fallidos)}")
+    return resumen
+
+
+def render_batches(jobs, modos, lote=48, workers=None, **kwargs):
+    """Renderiza un iterable (p.ej. un generador de páginas) por lotes con un solo pool
+
+    Los gráficos de cada lote se construyen y liberan antes del siguiente, así
+    que la memoria no crece con el número total de páginas.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = iter(jobs)
+    resumenes = []
+    inicio = time.perf_counter()
+    contexto = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 1 else nullcontext()
+    with contexto as pool:
+        while lote_jobs := list(islice(jobs, lote)):
+            print(f"\n📦 Lote {len(resumenes) + 1}: {len(lote_jobs)} gráficos")
+            resumenes.append(render_jobs(lote_jobs, modos, workers=workers, pool=pool, detalle=False, **kwargs))
+
+    resumen = pd.concat(resumenes, ignore_index=True) if resumenes else pd.DataFrame(
+        columns=["grafico", "funcion", "segundos", "pid", "estado"])
+    if not resumen.empty:
+        print("\n⏱️ Gráficos más lentos:")
+        print(resumen.sort_values("segundos", ascending=False).head(10).to_string(index=False))
+    print(f"⏱️ {len(resumen)} gráficos en {len(resumenes)} lotes, {time.perf_counter() - inicio:.1f} s")
+    return resumen
@@ -0,0 +1,223 @@
+# Base embebida (SQLite) con las tablas preparadas
+#
+# Con `--store` (o POBLACION_STORE=1, que heredan los procesos hijos) los
+# limpiadores escriben, además del CSV preparado, una tabla por dataset en
+# data/prepared/poblacion.sqlite con índices por llave geográfica. Con la
+# base activa, explorer_2025 y el resumen 2025 delegan sus groupbys a SQLite
+# en lugar de leer el CSV completo. Cada tabla recuerda el tamaño y mtime del
+# CSV del que salió; si el CSV cambió después, se vuelve a leer el CSV.
+#
+#   python -m src.scripts.store "SELECT seccion, padron_electoral FROM ine_2025 WHERE clave_municipio = ?" 39
+
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+from src.config.settings import PATHS, STORE_PATH
+from src.scripts.profiling import add_rows
+
+STORE_ENV = "POBLACION_STORE"
+
+# Índices por llave geográfica de cada tabla. El padrón lleva además uno por
+# municipio: un municipio cruza varios distritos y el índice geográfico sólo
+# le sirve hasta clave_entidad
+INDEXES = {
+    "eige_2015": {"geo": ["entidad", "distrito_cod"]},
+    "ine_2020": {"geo": ["entidad", "distrito_cod"]},
+    "ine_2025": {
+        "geo": ["clave_entidad", "clave_distrito", "clave_municipio", "seccion"],
+        "municipio": ["clave_entidad", "clave_municipio", "seccion"],
+    },
+}
+
+
+def enable_store(activo=True):
+    """Activa la base embebida en este proceso y sus hijos"""
+    if activo:
+        os.environ[STORE_ENV] = "1"
+
+
+def store_enabled():
+    return os.environ.get(STORE_ENV, "") not in ("", "0")
+
+
+def _q(nombre):
+    """Identificador SQL entre comillas (hay columnas como hombres_18+)"""
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+@contextmanager
+def connect(path=None):
+    """Conexión a la base (transacción confirmada al salir); espera si otro limpiador escribe"""
+    path = path or STORE_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path, timeout=120)
+    try:
+        con.execute("PRAGMA journal_mode=WAL")
+        with con:
+            yield con
+    finally:
+        con.close()
+
+
+def write_table(df, dataset, fuente=None, path=None, reemplazar=True, indexar=True):
+    """Escribe (o agrega) la tabla del dataset y, al final, sus índices y la fuente"""
+    with connect(path) as con:
+        df.to_sql(dataset, con, if_exists="replace" if reemplazar else "append", index=False, chunksize=50_000)
+        if indexar:
+            create_indexes(con, dataset, fuente)
+
+
+def store_prepared(df, dataset, prepared_path):
+    """Si la base está activa, guarda la tabla preparada junto al CSV"""
+    if store_enabled():
+        write_table(df, dataset, fuente=prepared_path)
+        print(f"🗄️ Tabla {dataset} guardada en {STORE_PATH.name}")
+
+
+def create_indexes(con, dataset, fuente=None):
+    """Índices por llave geográfica y registro del CSV de origen"""
+    for nombre, columnas in INDEXES[dataset].items():
+        columnas = ", ".join(_q(c) for c in columnas)
+        con.execute(f"CREATE INDEX IF NOT EXISTS {_q(f'idx_{dataset}_{nombre}')} ON {_q(dataset)} ({columnas})")
+    con.execute("ANALYZE")
+    con.execute("CREATE TABLE IF NOT EXISTS _fuentes (dataset TEXT PRIMARY KEY, archivo TEXT, size INTEGER, mtime_ns INTEGER)")
+    if fuente is not None:
+        st = fuente.stat()
+        con.execute(
+            "INSERT OR REPLACE INTO _fuentes VALUES (?, ?, ?, ?)",
+            (dataset, str(fuente), st.st_size, st.st_mtime_ns)
+        )
+
+
+def table_ready(dataset, path=None):
+    """True si la base está activa y su tabla corresponde al CSV preparado actual"""
+    path = path or STORE_PATH
+    if not store_enabled() or not path.exists():
+        return False
+    with connect(path) as con:
+        try:
+            row = con.execute("SELECT size, mtime_ns FROM _fuentes WHERE dataset = ?", (dataset,)).fetchone()
+        except sqlite3.OperationalError:
+            return False
+    if row is None:
+        return False
+    st = PATHS[dataset]["prepared"].stat()
+    if row != (st.st_size, st.st_mtime_ns):
+        print(f"⚠️ La tabla {dataset} no corresponde al CSV preparado; se usa el CSV")
+        return False
+    return True
+
+
+def query(sql, params=(), path=None):
+    """Resultado de una consulta como DataFrame"""
+    with connect(path) as con:
+        return pd.read_sql_query(sql, con, params=params)
+
+
+def _where(filtros):
+    """Cláusula WHERE para filtros {columna: valor | [valores] | None} (como aplicar_filtros)"""
+    condiciones, params = [], []
+    for col, val in (filtros or {}).items():
+        if val is None:
+            continue
+        if isinstance(val, (list, tuple)):
+            condiciones.append(f"{_q(col)} IN ({', '.join('?' * len(val))})")
+            params.extend(val)
+        else:
+            condiciones.append(f"{_q(col)} = ?")
+            params.append(val)
+    return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), params
+
+
+def groupby_sum(dataset, keys, columnas, filtros=None, path=None):
+    """SUM de `columnas` por `keys` resuelto en SQLite, ordenado por llave como pandas"""
+    where, params = _where(filtros)
+    sumas = ", ".join(f"COALESCE(SUM({_q(c)}), 0) AS {_q(c)}" for c in columnas)
+    grupos = ", ".join(_q(k) for k in keys)
+    if keys:
+        sql = (f"SELECT {grupos}, {sumas} FROM {_q(dataset)}{where} "
+               f"GROUP BY {grupos} ORDER BY {grupos}")
+    else:
+        sql = f"SELECT {sumas} FROM {_q(dataset)}{where}"
+    return query(sql, params, path)
+
+
+def value_counts(dataset, column, path=None):
+    """Conteo de filas por valor de `column` (sin nulos)"""
+    c = _q(column)
+    df = query(f"SELECT {c}, COUNT(*) AS n FROM {_q(dataset)} WHERE {c} IS NOT NULL GROUP BY {c}", path=path)
+    return df.set_index(column)["n"]
+
+
+def count_rows(dataset, path=None):
+    return int(query(f"SELECT COUNT(*) AS n FROM {_q(dataset)}", path=path)["n"].iloc[0])
+
+
+def table_columns(dataset, path=None):
+    return query(f"PRAGMA table_info({_q(dataset)})", path=path)["name"].tolist()
+
+
+# ========================================================================
+# ETAPAS CON GROUPBYS EN SQLITE (mismas salidas que el camino con CSV)
+# ========================================================================
+
+def explorer_2025_store():
+    """explorer_2025 con los agregados calculados en la base"""
+    from src.scripts.explorer_analysis import (
+        ADULTOS_2025,
+        DISTRIBUCIONES_2025,
+        REQUIRED_2025,
+        group_by_distrito_name,
+        save_metadata,
+        validate_columns,
+        write_adultos_2025,
+        write_distribution,
+    )
+
+    columnas = table_columns("ine_2025")
+    validate_columns(pd.DataFrame(columns=columnas), REQUIRED_2025, "ine_2025")
+    filas = count_rows("ine_2025")
+    add_rows(filas)
+    print(f"🔍 Datos 2025 desde {STORE_PATH.name} ({filas} filas)")
+
+    adultos = list(ADULTOS_2025)
+    # Por clave de distrito en SQLite; la agrupación por nombre se hace sobre ≤300 filas
+    por_clave = group_by_distrito_name(groupby_sum("ine_2025", ["clave_distrito"], adultos), code_col="clave_distrito")
+    distrito_data = por_clave.groupby("distrito_nombre", as_index=False)[adultos].sum()
+    municipio_data = groupby_sum("ine_2025", ["clave_municipio", "nombre_municipio"], adultos)
+    write_adultos_2025(distrito_data, municipio_data)
+
+    for column, output_name in DISTRIBUCIONES_2025.items():
+        write_distribution(value_counts("ine_2025", column), column, output_name)
+
+    save_metadata(pd.DataFrame(columns=columnas + ["distrito_nombre"]), "ine2025", filas=filas)
+
+
+def sumas_region_2025_store():
+    """Padrón por región con una consulta agregada por región"""
+    from src.scripts.abstract import REGION_CONFIG_2025
+
+    sumas = {
+        region: groupby_sum("ine_2025", [], ["padron_hombres", "padron_mujeres"], filtros).iloc[0]
+        for region, filtros in REGION_CONFIG_2025.items()
+    }
+    return pd.DataFrame(sumas).T.astype("int64")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Consulta la base embebida de datos preparados"
+    )
+    parser.add_argument("sql", help="Consulta SQL (tablas: eige_2015, ine_2020, ine_2025)")
+    parser.add_argument("params", nargs="*", help="Valores para los ? de la consulta")
+    args = parser.parse_args()
+    if not STORE_PATH.exists():
+        parser.error(f"No existe {STORE_PATH}; ejecute los limpiadores con --store")
+    params = [int(p) if p.lstrip("-").isdigit() else p for p in args.params]
+    print(query(args.sql, params).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
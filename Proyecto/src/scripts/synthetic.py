@@ -0,0 +1,284 @@
+# Generador de datos crudos sintéticos a escala nacional
+#
+# Escribe eige_2015.csv, ine_2020.csv e ine_2025.csv con los esquemas que
+# esperan clean_eige_2015, clean_ine_2020 y clean_ine_2025, más cortes
+# mensuales del padrón (formato de ine_2025 preparado, como los lee backtest).
+# Escala 1 ≈ país: 32 entidades, 300 distritos y 70 mil secciones; la escala
+# multiplica distritos y secciones. Jalisco (entidad 14) conserva los códigos
+# de distrito 1..20·escala y 125 municipios para que el resto del pipeline
+# tenga datos con qué trabajar.
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from src.config.settings import PATHS
+
+# Tamaño nacional a escala 1
+ENTIDADES = 32
+DISTRITOS = 300
+SECCIONES = 70_000
+JALISCO = 14
+DISTRITOS_JALISCO = 20
+MUNICIPIOS_JALISCO = 125
+
+# Estructura por edad promedio (EIGE 2015, % de población por grupo)
+EDADES_2015 = {
+    "IND_818": 20.3, "IND_819": 19.9, "IND_820": 15.3, "IND_821": 13.3,
+    "IND_822": 11.5, "IND_823": 8.2, "IND_824": 11.3, "IND_825": 0.04,
+}
+
+# Columnas de ine_2025 crudo (el limpiador las normaliza a minúsculas con "_")
+COLUMNAS_2025 = [
+    "CLAVE ENTIDAD", "NOMBRE ENTIDAD", "CLAVE DISTRITO", "CABECERA DISTRITAL",
+    "CLAVE MUNICIPIO", "NOMBRE MUNICIPIO", "SECCION",
+    "PADRON HOMBRES", "PADRON MUJERES", "PADRON NOBINARIO", "PADRON ELECTORAL",
+    "LISTA HOMBRES", "LISTA MUJERES", "LISTA NOBINARIO", "LISTA NOMINAL",
+]
+
+
+def _raw_header(dataset, required):
+    """Encabezado del archivo crudo incluido en el repo (para igualar su ancho), o sólo las columnas requeridas"""
+    path = PATHS[dataset]["raw"]
+    if path.exists():
+        return list(pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns)
+    return list(required)
+
+
+def distritos_por_entidad(escala, rng):
+    """(entidad, distrito) de todo el país; Jalisco con 20·escala distritos"""
+    n_jalisco = DISTRITOS_JALISCO * escala
+    otras = [e for e in range(1, ENTIDADES + 1) if e != JALISCO]
+    # Al menos un distrito por entidad; el resto, proporcional a un peso aleatorio
+    resto = DISTRITOS * escala - n_jalisco - len(otras)
+    conteos = 1 + rng.multinomial(resto, rng.dirichlet(np.full(len(otras), 2.0)))
+    n = dict(zip(otras, conteos))
+    n[JALISCO] = n_jalisco
+    entidad = np.repeat(np.arange(1, ENTIDADES + 1), [n[e] for e in range(1, ENTIDADES + 1)])
+    distrito = np.concatenate([np.arange(1, n[e] + 1) for e in range(1, ENTIDADES + 1)])
+    return entidad, distrito
+
+
+def _fill(header, known, n, rng):
+    """DataFrame con las columnas del encabezado: conocidas o de relleno aleatorio"""
+    data = {}
+    for col in header:
+        if col in known:
+            data[col] = known[col]
+        else:
+            data[col] = np.round(rng.random(n) * 100, 4)
+    return pd.DataFrame(data, columns=header)
+
+
+def synthetic_eige_2015(entidad, distrito, rng):
+    """Indicadores EIGE 2015 por distrito, con filas de total por entidad (distrito 0)"""
+    n = len(entidad)
+    adultos = rng.normal(180_000, 25_000, n).clip(60_000).round().astype("int64")
+    hombres = np.round(adultos * rng.normal(0.48, 0.01, n)).astype("int64")
+    edades = rng.dirichlet(np.array(list(EDADES_2015.values())) * 300 + 0.5, n) * 100
+    distritos = {
+        "CVE_ENT": entidad, "CVE_DISTRITO": distrito,
+        "Indigena": np.where(rng.random(n) < 0.1, "SI", "NO"),
+        "Complejidad": rng.choice(["Dispersos 1", "Concentrados 1", "Concentrados 2"], n),
+        "IND_806": adultos, "IND_807": rng.normal(66.0, 3.0, n).round(4),
+        "IND_808": hombres, "IND_810": adultos - hombres,
+        **{col: edades[:, i].round(6) for i, col in enumerate(EDADES_2015)},
+    }
+    df = pd.DataFrame(distritos)
+
+    # Totales por entidad (el limpiador los descarta con distrito_cod != 0)
+    totales = df.groupby("CVE_ENT", as_index=False).agg(
+        {"IND_806": "sum", "IND_807": "mean", "IND_808": "sum", "IND_810": "sum",
+         **{col: "mean" for col in EDADES_2015}}
+    ).assign(CVE_DISTRITO=0)
+    df = pd.concat([totales, df], ignore_index=True).sort_values(["CVE_ENT", "CVE_DISTRITO"], kind="stable")
+
+    header = _raw_header("eige_2015", ["CVE_ENT", "CVE_DISTRITO", "MI", "Indigena", "Complejidad",
+                                       "IND_806", "IND_807", "IND_808", "IND_810", *EDADES_2015])
+    known = {c: df[c].to_numpy() for c in df.columns}
+    known["MI"] = np.full(len(df), "")
+    return _fill(header, known, len(df), rng)
+
+
+def synthetic_ine_2020(entidad, distrito, rng):
+    """Indicadores del censo 2020 por distrito electoral"""
+    n = len(entidad)
+    p18 = rng.normal(290_000, 40_000, n).clip(80_000).round().astype("int64")
+    p18_m = np.round(p18 * rng.normal(0.485, 0.01, n)).astype("int64")
+    known = {
+        "ENTIDAD": entidad, "NOM_ENT": np.char.add("ENTIDAD ", entidad.astype(str)), "DISTRITO": distrito,
+        "INDIGENA": np.where(rng.random(n) < 0.1, "SI", "NO"),
+        "COMPLEJIDA": rng.choice(["Disperso 1", "Concentrado 1", "Concentrado 2"], n),
+        "P_0A17": rng.normal(127_000, 30_000, n).clip(20_000).round().astype("int64"),
+        "P_18YMAS": p18, "P_18YMAS_M": p18_m, "P_18YMAS_F": p18 - p18_m,
+        "P15YM_AN": rng.gamma(1.5, 10_000, n).round().astype("int64"),
+        "P15YM_SE": rng.gamma(2.0, 8_000, n).round().astype("int64"),
+    }
+    header = _raw_header("ine_2020", list(known))
+    data = {col: known[col] if col in known else rng.integers(0, 300_000, n) for col in header}
+    return pd.DataFrame(data, columns=header)
+
+
+def synthetic_secciones(entidad, distrito, escala, rng):
+    """Secciones del padrón 2025 (esquema de ine_2025 preparado, en minúsculas)"""
+    n_dist = len(entidad)
+    # Secciones proporcionales al número de distritos, ~233 por distrito
+    por_distrito = rng.multinomial(SECCIONES * escala, np.full(n_dist, 1 / n_dist))
+    ent = np.repeat(entidad, por_distrito)
+    dist = np.repeat(distrito, por_distrito)
+    n = len(ent)
+
+    # Sección numerada dentro de cada entidad
+    inicio_entidad = np.r_[0, np.flatnonzero(ent[1:] != ent[:-1]) + 1]
+    seccion = np.arange(n) - np.repeat(inicio_entidad, np.diff(np.r_[inicio_entidad, n])) + 1
+
+    # Municipios: 125 en Jalisco, 5 a 200 en las demás; contiguos dentro del distrito
+    n_mun = {e: MUNICIPIOS_JALISCO if e == JALISCO else int(rng.integers(5, 200))
+             for e in range(1, ENTIDADES + 1)}
+    municipio = np.empty(n, dtype="int64")
+    for e in range(1, ENTIDADES + 1):
+        mask = ent == e
+        municipio[mask] = np.sort(rng.integers(1, n_mun[e] + 1, mask.sum()))
+
+    padron = rng.lognormal(7.2, 0.7, n).round().astype("int64").clip(15)
+    hombres = rng.binomial(padron, 0.485)
+    nobinario = rng.binomial(padron - hombres, 1e-5)
+    mujeres = padron - hombres - nobinario
+    return pd.DataFrame({
+        "clave_entidad": ent,
+        "nombre_entidad": np.where(ent == JALISCO, "JALISCO", np.char.add("ENTIDAD ", ent.astype(str))),
+        "clave_distrito": dist,
+        "cabecera_distrital": np.char.add("CABECERA ", dist.astype(str)),
+        "clave_municipio": municipio,
+        "nombre_municipio": np.char.add("MUNICIPIO ", municipio.astype(str)),
+        "seccion": seccion,
+        "padron_hombres": hombres,
+        "padron_mujeres": mujeres,
+        "padron_nobinario": nobinario,
+        "padron_electoral": padron,
+    })
+
+
+def _with_lista(df, rng, cobertura=0.99):
+    """Agrega la lista nominal como fracción binomial del padrón por sexo"""
+    df = df.copy()
+    for sexo in ("hombres", "mujeres", "nobinario"):
+        df[f"lista_{sexo}"] = rng.binomial(df[f"padron_{sexo}"].to_numpy(), cobertura)
+    df["lista_nominal"] = df["lista_hombres"] + df["lista_mujeres"] + df["lista_nobinario"]
+    return df
+
+
+def synthetic_ine_2025(secciones, rng):
+    """ine_2025 crudo: encabezados en mayúsculas con espacios y texto con espacios extra"""
+    df = _with_lista(secciones, rng)
+    # Residentes en el extranjero: una fila por entidad con distrito, municipio y sección 0
+    conteos = [c for c in df.columns if c.startswith(("padron_", "lista_"))]
+    extranjero = df.groupby("clave_entidad")[conteos].sum().floordiv(40).reset_index()
+    # Los totales se recalculan para que sigan siendo la suma por sexo
+    extranjero["padron_electoral"] = extranjero[["padron_hombres", "padron_mujeres", "padron_nobinario"]].sum(axis=1)
+    extranjero["lista_nominal"] = extranjero[["lista_hombres", "lista_mujeres", "lista_nobinario"]].sum(axis=1)
+    extranjero = extranjero.assign(
+        nombre_entidad="RESIDENTES EXTRANJERO",
+        clave_distrito=0, cabecera_distrital="0", clave_municipio=0, nombre_municipio="0", seccion=0,
+    )
+    df = pd.concat([extranjero[df.columns], df], ignore_index=True)
+    df["cabecera_distrital"] = df["cabecera_distrital"].str.replace(" ", "  ", regex=False)
+    df["nombre_municipio"] = " " + df["nombre_municipio"]
+    df.columns = COLUMNAS_2025
+    return df
+
+
+def synthetic_cortes(secciones, n_cortes, rng, inicio="2023-01", altas=5e-4, bajas=2e-4):
+    """Cortes mensuales: crecimiento y ruido por sección, con altas y bajas de secciones"""
+    base = secciones
+    siguiente = base.groupby("clave_entidad")["seccion"].max().to_dict()
+    periodos = pd.period_range(inicio, periods=n_cortes, freq="M")
+    for periodo in periodos:
+        # Bajas y altas de secciones
+        base = base[rng.random(len(base)) >= bajas]
+        nuevas = base.sample(n=rng.binomial(len(base), altas), random_state=int(rng.integers(2**31)))
+        if len(nuevas):
+            nuevas = nuevas.copy()
+            for e, idx in nuevas.groupby("clave_entidad").groups.items():
+                nuevas.loc[idx, "seccion"] = siguiente[e] + np.arange(1, len(idx) + 1)
+                siguiente[e] += len(idx)
+            base = pd.concat([base, nuevas], ignore_index=True)
+
+        # Crecimiento mensual ~0.1% con ruido por sección
+        factor = rng.lognormal(0.001, 0.004, len(base))
+        base = base.copy()
+        base["padron_hombres"] = np.round(base["padron_hombres"] * factor).astype("int64")
+        base["padron_mujeres"] = np.round(base["padron_mujeres"] * factor).astype("int64")
+        base["padron_electoral"] = base["padron_hombres"] + base["padron_mujeres"] + base["padron_nobinario"]
+        yield periodo, _with_lista(base, rng)
+
+
+def generate(destino, escala=1, seed=42, cortes=0):
+    """Escribe los datos crudos sintéticos en destino/raw y devuelve tamaños y tiempos"""
+    rng = np.random.default_rng(seed)
+    raw = Path(destino) / "raw"
+    raw.mkdir(parents=True, exist_ok=True)
+    entidad, distrito = distritos_por_entidad(escala, rng)
+
+    resumen = []
+
+    def escribir(df, path, **kwargs):
+        inicio = time.perf_counter()
+        df.to_csv(path, index=False, **kwargs)
+        resumen.append({
+            "archivo": path.name, "filas": len(df), "columnas": df.shape[1],
+            "mb": round(path.stat().st_size / 2**20, 2),
+            "segundos": round(time.perf_counter() - inicio, 3),
+        })
+
+    escribir(synthetic_eige_2015(entidad, distrito, rng), raw / "eige_2015.csv", float_format="%.6f")
+    escribir(synthetic_ine_2020(entidad, distrito, rng), raw / "ine_2020.csv")
+    secciones = synthetic_secciones(entidad, distrito, escala, rng)
+    escribir(synthetic_ine_2025(secciones, rng), raw / "ine_2025.csv", encoding="latin1")
+
+    if cortes:
+        cortes_dir = raw / "padron_cortes"
+        cortes_dir.mkdir(exist_ok=True)
+        for periodo, df in synthetic_cortes(secciones, cortes, rng):
+            escribir(df, cortes_dir / f"padron_{periodo}.csv", encoding="latin1")
+
+    return pd.DataFrame(resumen)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Genera datos crudos sintéticos con los esquemas de los limpiadores"
+    )
+    parser.add_argument(
+        "--destino",
+        required=True,
+        help="Directorio de datos (se escribe en <destino>/raw; usar con POBLACION_DATA_DIR)"
+    )
+    parser.add_argument(
+        "--escala",
+        type=int,
+        default=1,
+        help="Multiplicador sobre el tamaño nacional (300 distritos, 70 mil secciones)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Semilla del generador aleatorio"
+    )
+    parser.add_argument(
+        "--cortes",
+        type=int,
+        default=0,
+        help="Cortes mensuales del padrón a generar en raw/padron_cortes"
+    )
+    args = parser.parse_args()
+
+    resumen = generate(args.destino, args.escala, args.seed, args.cortes)
+    print(resumen.to_string(index=False))
+    print(f"✅ Datos sintéticos (escala {args.escala}×, semilla {args.seed}) en {Path(args.destino) / 'raw'}")
+
+
+if __name__ == "__main__":
+    main()